@@ -3,9 +3,11 @@ Analysis API Endpoints
 Handles generating comprehensive recommendations
 """
 
-from fastapi import APIRouter, HTTPException, Body
+from fastapi import APIRouter, HTTPException, Body, Query, Response
 from models.schemas import RecommendationsResponse
-from services import gemini_service
+from services import gemini_service, session_store
+from services.gemini_service import GeminiUnavailableError
+from api.common import RESULT_ID_HEADER, resolve_result, unavailable
 from typing import Dict, Any
 
 router = APIRouter()
@@ -13,35 +15,58 @@ router = APIRouter()
 
 @router.post("/recommendations", response_model=RecommendationsResponse)
 async def generate_recommendations(
+    response: Response,
     job_role: str = Body(...),
     company_name: str = Body(...),
-    analysis: Dict[str, Any] = Body(...),
-    ats_score: Dict[str, Any] = Body(...),
-    company_research: Dict[str, Any] = Body(...)
+    analysis: Dict[str, Any] = Body(None),
+    ats_score: Dict[str, Any] = Body(None),
+    company_research: Dict[str, Any] = Body(None),
+    analysis_id: str = Body(None),
+    ats_score_id: str = Body(None),
+    company_research_id: str = Body(None),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
 ):
     """
     Generate personalized recommendations based on all analyses
     
+    Each prior result may be sent inline or referenced by the ID returned
+    in its endpoint's X-Result-ID header. The stored recommendations' ID
+    is returned in the same header.
+    
     Args:
+        response: Outgoing response, used to set the result ID header
         job_role: Target job role
         company_name: Company name
         analysis: Resume analysis data
         ats_score: ATS score data
         company_research: Company research data
+        analysis_id: Stored resume analysis ID, instead of analysis
+        ats_score_id: Stored ATS score ID, instead of ats_score
+        company_research_id: Stored company research ID, instead of company_research
+        use_cache: Serve repeated requests from the response cache
         
     Returns:
         Comprehensive personalized recommendations
     """
+    analysis = resolve_result(analysis, analysis_id, "analysis")
+    ats_score = resolve_result(ats_score, ats_score_id, "ats_score")
+    company_research = resolve_result(company_research, company_research_id, "company_research")
+    
     try:
         recommendations = await gemini_service.generate_recommendations(
             job_role=job_role,
             company_name=company_name,
             analysis=analysis,
             ats_score=ats_score,
-            company_research=company_research
+            company_research=company_research,
+            use_cache=use_cache
         )
         
-        return RecommendationsResponse(**recommendations)
+        result = RecommendationsResponse(**recommendations)
+        response.headers[RESULT_ID_HEADER] = session_store.put_result("recommendations", result.model_dump())
+        return result
         
+    except GeminiUnavailableError as e:
+        raise unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating recommendations: {str(e)}")
@@ -0,0 +1,78 @@
+"""
+Shared helpers for API endpoints
+Resolves resume and stage-result IDs from the session store
+"""
+
+from fastapi import HTTPException
+from services import session_store
+from services.gemini_service import GeminiUnavailableError
+from typing import Any, Dict, Optional
+
+
+RESULT_ID_HEADER = "X-Result-ID"
+
+
+def resolve_resume_text(resume_text: Optional[str], resume_id: Optional[str]) -> str:
+    """
+    Get resume text from the request, or from the session store by ID
+
+    Args:
+        resume_text: Resume text sent with the request
+        resume_id: Resume ID returned by the upload endpoint
+
+    Returns:
+        Resume text
+    """
+    if resume_text:
+        return resume_text
+    if not resume_id:
+        raise HTTPException(status_code=400, detail="Either resume_text or resume_id is required")
+
+    stored = session_store.get_resume_text(resume_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Resume not found or expired; please upload it again")
+    return stored
+
+
+def resolve_result(
+    data: Optional[Dict[str, Any]],
+    result_id: Optional[str],
+    stage: str
+) -> Dict[str, Any]:
+    """
+    Get a prior stage result from the request, or from the session store by ID
+
+    Args:
+        data: Stage result sent with the request
+        result_id: Result ID returned by the stage's endpoint
+        stage: Stage name
+
+    Returns:
+        Stage result
+    """
+    if data is not None:
+        return data
+    if not result_id:
+        raise HTTPException(status_code=400, detail=f"Either {stage} or {stage}_id is required")
+
+    stored = session_store.get_result(result_id, stage)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"{stage} result not found or expired")
+    return stored
+
+
+def unavailable(error: GeminiUnavailableError) -> HTTPException:
+    """
+    Build the 503 response for a Gemini outage, telling the client when to retry
+
+    Args:
+        error: Error raised by gemini_service
+
+    Returns:
+        HTTPException with a Retry-After header
+    """
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
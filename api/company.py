@@ -3,28 +3,42 @@ Company Research API Endpoints
 Handles company information research
 """
 
-from fastapi import APIRouter, HTTPException, Form
+from fastapi import APIRouter, HTTPException, Form, Query, Response
 from models.schemas import CompanyResearchResponse
-from services import gemini_service
+from services import gemini_service, session_store
+from services.gemini_service import GeminiUnavailableError
+from api.common import RESULT_ID_HEADER, unavailable
 
 router = APIRouter()
 
 
 @router.post("/research", response_model=CompanyResearchResponse)
-async def research_company(company_name: str = Form(...)):
+async def research_company(
+    response: Response,
+    company_name: str = Form(...),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
+):
     """
     Research company information
     
+    The stored result's ID is returned in the X-Result-ID header.
+    
     Args:
+        response: Outgoing response, used to set the result ID header
         company_name: Name of the company to research
+        use_cache: Serve repeated requests from the response cache
         
     Returns:
         Comprehensive company research data
     """
     try:
-        research_data = await gemini_service.research_company(company_name)
+        research_data = await gemini_service.research_company(company_name, use_cache=use_cache)
         
-        return CompanyResearchResponse(**research_data)
+        result = CompanyResearchResponse(**research_data)
+        response.headers[RESULT_ID_HEADER] = session_store.put_result("company_research", result.model_dump())
+        return result
         
+    except GeminiUnavailableError as e:
+        raise unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error researching company: {str(e)}")
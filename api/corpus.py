@@ -0,0 +1,189 @@
+"""
+Corpus API Endpoints
+Ranks stored resumes against job descriptions and vice versa
+"""
+
+from fastapi import APIRouter, HTTPException, Form, Query
+from models.schemas import CorpusRankResponse, ResumeAnalysisResponse
+from services import gemini_service, corpus_index
+from services.corpus_index import job_id_for
+from services.gemini_service import GeminiUnavailableError
+from core.config import settings
+from api.common import resolve_resume_text, unavailable
+from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
+
+router = APIRouter()
+
+
+async def _analyze_top(
+    matches: List[Dict[str, Any]],
+    analyze_top: int,
+    analyze: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+):
+    """
+    Attach a full LLM analysis to the best matches, concurrently
+
+    Args:
+        matches: Ranked matches, updated in place
+        analyze_top: Number of leading matches to analyze
+        analyze: Coroutine function returning the analysis of one match
+
+    Raises:
+        GeminiUnavailableError: Gemini refused or failed an analysis as unavailable
+    """
+    shortlist = matches[:analyze_top]
+    results = await asyncio.gather(*[analyze(match) for match in shortlist], return_exceptions=True)
+    for result in results:
+        # An unavailable Gemini fails the request (503) rather than each match
+        if isinstance(result, GeminiUnavailableError):
+            raise result
+    for match, result in zip(shortlist, results):
+        if isinstance(result, Exception):
+            match["error"] = str(result)
+        else:
+            match["analysis"] = ResumeAnalysisResponse(**result)
+
+
+@router.post("/jobs")
+async def add_job(
+    job_description: str = Form(...),
+    job_role: str = Form(None),
+    title: str = Form(None)
+):
+    """
+    Save a job description to the corpus so resumes can be ranked against it
+
+    Args:
+        job_description: Job description text
+        job_role: Job role/title used when analyzing matches
+        title: Display name (defaults to the job role)
+
+    Returns:
+        Job ID and whether it was newly added
+    """
+    try:
+        job_id = job_id_for(job_description)
+        added = await corpus_index.add(
+            "job", job_id, job_description,
+            label=title or job_role or "",
+            metadata={"job_role": job_role}
+        )
+        return {"success": True, "job_id": job_id, "added": added}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error saving job description: {str(e)}")
+
+
+@router.post("/rank/resumes", response_model=CorpusRankResponse)
+async def rank_resumes(
+    job_description: str = Form(None),
+    job_id: str = Form(None),
+    job_role: str = Form(None),
+    top_k: int = Query(10, ge=1, le=500, description="Number of resumes to return"),
+    analyze_top: int = Query(0, ge=0, le=settings.CORPUS_MAX_ANALYZE, description="Run the LLM analysis on this many top matches"),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
+):
+    """
+    Rank every uploaded resume against a job description
+
+    Ranking is a vectorized similarity search over the memory-mapped
+    corpus index; only the analyze_top best matches are sent to the LLM.
+    A job description sent as text is saved to the corpus.
+
+    Args:
+        job_description: Job description text
+        job_id: ID of a saved job description, instead of job_description
+        job_role: Job role/title used when analyzing matches
+        top_k: Number of resumes to return
+        analyze_top: Number of top matches to analyze with the LLM
+        use_cache: Serve repeated requests from the response cache
+
+    Returns:
+        Resumes ranked by similarity, the shortlist with full analyses
+    """
+    if not job_description:
+        if not job_id:
+            raise HTTPException(status_code=400, detail="Either job_description or job_id is required")
+        job = await corpus_index.get("job", job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job description not found")
+        job_description = job["text"]
+        job_role = job_role or job.get("job_role") or job["label"]
+
+    try:
+        job_id = job_id_for(job_description)
+        await corpus_index.add("job", job_id, job_description, label=job_role or "", metadata={"job_role": job_role})
+
+        matches = await corpus_index.rank("resume", job_description, top_k=top_k)
+
+        async def analyze(match: Dict[str, Any]) -> Dict[str, Any]:
+            resume = await corpus_index.get("resume", match["id"])
+            return await gemini_service.analyze_resume(
+                resume_text=resume["text"],
+                job_role=job_role or "the role in the job description",
+                job_description=job_description,
+                use_cache=use_cache
+            )
+
+        await _analyze_top(matches, analyze_top, analyze)
+
+        return CorpusRankResponse(
+            query_id=job_id,
+            total_documents=await corpus_index.count("resume"),
+            matches=matches
+        )
+
+    except GeminiUnavailableError as e:
+        raise unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error ranking resumes: {str(e)}")
+
+
+@router.post("/rank/jobs", response_model=CorpusRankResponse)
+async def rank_jobs(
+    resume_text: str = Form(None),
+    resume_id: str = Form(None),
+    top_k: int = Query(10, ge=1, le=500, description="Number of job descriptions to return"),
+    analyze_top: int = Query(0, ge=0, le=settings.CORPUS_MAX_ANALYZE, description="Run the LLM analysis on this many top matches"),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
+):
+    """
+    Rank every saved job description against a resume
+
+    Args:
+        resume_text: Full text of the resume
+        resume_id: Resume ID from the upload endpoint, instead of resume_text
+        top_k: Number of job descriptions to return
+        analyze_top: Number of top matches to analyze with the LLM
+        use_cache: Serve repeated requests from the response cache
+
+    Returns:
+        Job descriptions ranked by similarity, the shortlist with full analyses
+    """
+    resume_text = resolve_resume_text(resume_text, resume_id)
+
+    try:
+        matches = await corpus_index.rank("job", resume_text, top_k=top_k)
+
+        async def analyze(match: Dict[str, Any]) -> Dict[str, Any]:
+            job = await corpus_index.get("job", match["id"])
+            return await gemini_service.analyze_resume(
+                resume_text=resume_text,
+                job_role=job.get("job_role") or job["label"] or "the role in the job description",
+                job_description=job["text"],
+                use_cache=use_cache
+            )
+
+        await _analyze_top(matches, analyze_top, analyze)
+
+        return CorpusRankResponse(
+            query_id=resume_id,
+            total_documents=await corpus_index.count("job"),
+            matches=matches
+        )
+
+    except GeminiUnavailableError as e:
+        raise unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error ranking job descriptions: {str(e)}")
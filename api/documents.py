@@ -3,28 +3,35 @@ Document Generation API Endpoints
 Handles creating optimized resume and cover letter
 """
 
-from fastapi import APIRouter, HTTPException, Body
-from fastapi.responses import FileResponse
-from models.schemas import DocumentGenerationResponse
-from services import gemini_service, document_service
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Body, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from models.schemas import DocumentGenerationResponse, JobAcceptedResponse
+from services import gemini_service, document_service, job_queue
+from services.job_queue import JOB_QUEUED
+from services.gemini_service import GeminiUnavailableError
+from api.common import resolve_resume_text, resolve_result, unavailable
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any
+import asyncio
+import json
 import os
 
 router = APIRouter()
 
+GENERATE_DOCUMENTS_JOB = "generate_documents"
 
-@router.post("/generate", response_model=DocumentGenerationResponse)
-async def generate_documents(
-    resume_text: str = Body(...),
-    job_role: str = Body(...),
-    company_name: str = Body(...),
-    analysis: Dict[str, Any] = Body(...),
-    ats_score: Dict[str, Any] = Body(...),
-    company_research: Dict[str, Any] = Body(...),
-    recommendations: Dict[str, Any] = Body(...)
-):
+
+async def build_documents(
+    resume_text: str,
+    job_role: str,
+    company_name: str,
+    analysis: Dict[str, Any],
+    ats_score: Dict[str, Any],
+    company_research: Dict[str, Any],
+    recommendations: Dict[str, Any],
+    use_cache: bool = True
+) -> Dict[str, Any]:
     """
-    Generate optimized resume and cover letter
+    Generate and render the optimized resume and cover letter
     
     Args:
         resume_text: Original resume text
@@ -34,50 +41,283 @@ async def generate_documents(
         ats_score: ATS score data
         company_research: Company research data
         recommendations: Recommendations data
+        use_cache: Serve from and store into the response cache
         
     Returns:
-        Generated documents with file paths
+        Dictionary matching DocumentGenerationResponse
     """
-    try:
-        # Generate optimized resume
-        optimized_resume = await gemini_service.generate_optimized_resume(
+    async def build_resume():
+        content = await gemini_service.generate_optimized_resume(
             resume_text=resume_text,
             job_role=job_role,
             company_name=company_name,
             analysis=analysis,
-            ats_score=ats_score
+            ats_score=ats_score,
+            use_cache=use_cache
         )
-        
-        # Generate cover letter
-        cover_letter = await gemini_service.generate_cover_letter(
+        file_path = await document_service.render_resume_docx(
+            content=content,
+            company_name=company_name
+        )
+        return content, file_path
+    
+    async def build_cover_letter():
+        content = await gemini_service.generate_cover_letter(
             job_role=job_role,
             company_name=company_name,
             company_research=company_research,
-            recommendations=recommendations
+            recommendations=recommendations,
+            use_cache=use_cache
         )
-        
-        # Create Word documents
-        resume_file_path = document_service.create_resume_docx(
-            content=optimized_resume,
+        file_path = await document_service.render_cover_letter_docx(
+            content=content,
             company_name=company_name
         )
+        return content, file_path
+    
+    # Both documents are independent: generate and render them concurrently
+    (optimized_resume, resume_file_path), (cover_letter, cover_letter_file_path) = await asyncio.gather(
+        build_resume(),
+        build_cover_letter()
+    )
+    
+    return {
+        "optimized_resume": optimized_resume,
+        "cover_letter": cover_letter,
+        "resume_file_path": resume_file_path,
+        "cover_letter_file_path": cover_letter_file_path,
+    }
+
+
+async def _run_generation_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler: inputs are resolved when the job is enqueued"""
+    documents = await build_documents(**payload)
+    return DocumentGenerationResponse(**documents).model_dump()
+
+
+job_queue.register(GENERATE_DOCUMENTS_JOB, _run_generation_job)
+
+
+@router.post(
+    "/generate",
+    response_model=DocumentGenerationResponse,
+    responses={202: {"model": JobAcceptedResponse, "description": "Job queued (async=true)"}}
+)
+async def generate_documents(
+    job_role: str = Body(...),
+    company_name: str = Body(...),
+    resume_text: str = Body(None),
+    analysis: Dict[str, Any] = Body(None),
+    ats_score: Dict[str, Any] = Body(None),
+    company_research: Dict[str, Any] = Body(None),
+    recommendations: Dict[str, Any] = Body(None),
+    resume_id: str = Body(None),
+    analysis_id: str = Body(None),
+    ats_score_id: str = Body(None),
+    company_research_id: str = Body(None),
+    recommendations_id: str = Body(None),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache"),
+    run_async: bool = Query(False, alias="async", description="Queue the work and return 202 with a job ID")
+):
+    """
+    Generate optimized resume and cover letter
+    
+    The resume and each prior result may be sent inline or referenced by ID.
+    With async=true the generation runs on the background job queue; poll
+    /api/jobs/{job_id} and fetch /api/jobs/{job_id}/result when it succeeds.
+    
+    Args:
+        job_role: Target job role
+        company_name: Company name
+        resume_text: Original resume text
+        analysis: Resume analysis data
+        ats_score: ATS score data
+        company_research: Company research data
+        recommendations: Recommendations data
+        resume_id: Stored resume ID, instead of resume_text
+        analysis_id: Stored resume analysis ID, instead of analysis
+        ats_score_id: Stored ATS score ID, instead of ats_score
+        company_research_id: Stored company research ID, instead of company_research
+        recommendations_id: Stored recommendations ID, instead of recommendations
+        use_cache: Serve repeated requests from the response cache
+        run_async: Queue the work and return 202 with a job ID
         
-        cover_letter_file_path = document_service.create_cover_letter_docx(
-            content=cover_letter,
-            company_name=company_name
-        )
+    Returns:
+        Generated documents with file paths, or the queued job
+    """
+    inputs = {
+        "resume_text": resolve_resume_text(resume_text, resume_id),
+        "job_role": job_role,
+        "company_name": company_name,
+        "analysis": resolve_result(analysis, analysis_id, "analysis"),
+        "ats_score": resolve_result(ats_score, ats_score_id, "ats_score"),
+        "company_research": resolve_result(company_research, company_research_id, "company_research"),
+        "recommendations": resolve_result(recommendations, recommendations_id, "recommendations"),
+        "use_cache": use_cache,
+    }
+    
+    try:
+        if run_async:
+            # Session IDs expire, so the job stores the resolved inputs themselves
+            job_id = await job_queue.enqueue(GENERATE_DOCUMENTS_JOB, inputs)
+            accepted = JobAcceptedResponse(
+                job_id=job_id,
+                status=JOB_QUEUED,
+                status_url=f"/api/jobs/{job_id}",
+                result_url=f"/api/jobs/{job_id}/result"
+            )
+            return JSONResponse(status_code=202, content=accepted.model_dump())
         
-        return DocumentGenerationResponse(
-            optimized_resume=optimized_resume,
-            cover_letter=cover_letter,
-            resume_file_path=resume_file_path,
-            cover_letter_file_path=cover_letter_file_path
-        )
+        return DocumentGenerationResponse(**await build_documents(**inputs))
         
+    except GeminiUnavailableError as e:
+        raise unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating documents: {str(e)}")
 
 
+def _stream_document(
+    request: Request,
+    chunks: AsyncIterator[str],
+    render: Callable[[str], Awaitable[str]]
+) -> StreamingResponse:
+    """
+    Relay generated text as Server-Sent Events, then build the DOCX
+
+    Emits a "delta" event per text chunk, followed by a "done" event with
+    the full content and file path, or an "error" event.
+
+    Args:
+        request: Incoming request, used to detect client disconnects
+        chunks: Generated text chunks
+        render: Coroutine function creating the Word document from the final text
+
+    Returns:
+        text/event-stream response
+    """
+    async def event_stream():
+        parts = []
+        try:
+            async for chunk in chunks:
+                if await request.is_disconnected():
+                    return
+                parts.append(chunk)
+                yield f"event: delta\ndata: {json.dumps({'text': chunk})}\n\n"
+
+            content = "".join(parts)
+            file_path = await render(content)
+            yield f"event: done\ndata: {json.dumps({'content': content, 'file_path': file_path})}\n\n"
+
+        except GeminiUnavailableError as e:
+            yield f"event: error\ndata: {json.dumps({'message': str(e), 'retry_after': e.retry_after})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+        finally:
+            await chunks.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/generate/resume/stream")
+async def stream_optimized_resume(
+    request: Request,
+    job_role: str = Body(...),
+    company_name: str = Body(...),
+    resume_text: str = Body(None),
+    analysis: Dict[str, Any] = Body(None),
+    ats_score: Dict[str, Any] = Body(None),
+    resume_id: str = Body(None),
+    analysis_id: str = Body(None),
+    ats_score_id: str = Body(None),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
+):
+    """
+    Stream the optimized resume as it is generated
+    
+    Args:
+        request: Incoming request
+        job_role: Target job role
+        company_name: Company name
+        resume_text: Original resume text
+        analysis: Resume analysis data
+        ats_score: ATS score data
+        resume_id: Stored resume ID, instead of resume_text
+        analysis_id: Stored resume analysis ID, instead of analysis
+        ats_score_id: Stored ATS score ID, instead of ats_score
+        use_cache: Serve repeated requests from the response cache
+        
+    Returns:
+        Server-Sent Events with text deltas and the final document path
+    """
+    resume_text = resolve_resume_text(resume_text, resume_id)
+    analysis = resolve_result(analysis, analysis_id, "analysis")
+    ats_score = resolve_result(ats_score, ats_score_id, "ats_score")
+    
+    chunks = gemini_service.stream_optimized_resume(
+        resume_text=resume_text,
+        job_role=job_role,
+        company_name=company_name,
+        analysis=analysis,
+        ats_score=ats_score,
+        use_cache=use_cache
+    )
+    
+    return _stream_document(
+        request,
+        chunks,
+        lambda content: document_service.render_resume_docx(content=content, company_name=company_name)
+    )
+
+
+@router.post("/generate/cover-letter/stream")
+async def stream_cover_letter(
+    request: Request,
+    job_role: str = Body(...),
+    company_name: str = Body(...),
+    company_research: Dict[str, Any] = Body(None),
+    recommendations: Dict[str, Any] = Body(None),
+    company_research_id: str = Body(None),
+    recommendations_id: str = Body(None),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
+):
+    """
+    Stream the cover letter as it is generated
+    
+    Args:
+        request: Incoming request
+        job_role: Target job role
+        company_name: Company name
+        company_research: Company research data
+        recommendations: Recommendations data
+        company_research_id: Stored company research ID, instead of company_research
+        recommendations_id: Stored recommendations ID, instead of recommendations
+        use_cache: Serve repeated requests from the response cache
+        
+    Returns:
+        Server-Sent Events with text deltas and the final document path
+    """
+    company_research = resolve_result(company_research, company_research_id, "company_research")
+    recommendations = resolve_result(recommendations, recommendations_id, "recommendations")
+    
+    chunks = gemini_service.stream_cover_letter(
+        job_role=job_role,
+        company_name=company_name,
+        company_research=company_research,
+        recommendations=recommendations,
+        use_cache=use_cache
+    )
+    
+    return _stream_document(
+        request,
+        chunks,
+        lambda content: document_service.render_cover_letter_docx(content=content, company_name=company_name)
+    )
+
+
 @router.get("/download/{filename}")
 async def download_document(filename: str):
     """
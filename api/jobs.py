@@ -0,0 +1,55 @@
+"""
+Background Jobs API Endpoints
+Status and results of queued long-running work
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from models.schemas import JobStatusResponse
+from services import job_queue
+from services.job_queue import JOB_FAILED, JOB_SUCCEEDED
+
+router = APIRouter()
+
+
+async def _get_job_or_404(job_id: str):
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """
+    Get a background job's status
+
+    Args:
+        job_id: Background job ID
+
+    Returns:
+        Job status
+    """
+    return JobStatusResponse(**await _get_job_or_404(job_id))
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    Get a background job's result
+
+    Returns 202 with the job status while the job is queued or running,
+    and 500 with the job's error if it failed.
+
+    Args:
+        job_id: Background job ID
+
+    Returns:
+        The job's result, shaped like the synchronous endpoint's response
+    """
+    job = await _get_job_or_404(job_id)
+    if job["status"] == JOB_FAILED:
+        raise HTTPException(status_code=500, detail=f"Job failed: {job['error']}")
+    if job["status"] != JOB_SUCCEEDED:
+        return JSONResponse(status_code=202, content=JobStatusResponse(**job).model_dump())
+    return job["result"]
@@ -0,0 +1,231 @@
+"""
+Pipeline API Endpoints
+Runs the complete analysis flow in a single request
+"""
+
+from fastapi import APIRouter, HTTPException, Form, Query, Request
+from fastapi.responses import StreamingResponse
+from models.schemas import PipelineResponse, BatchAnalysisRequest, BatchAnalysisResponse
+from services import pipeline_service, session_store
+from services.pipeline_service import STAGE_MODELS
+from services.gemini_service import GeminiUnavailableError
+from core.config import settings
+from api.common import resolve_resume_text, unavailable
+from typing import Any, Dict
+import json
+
+router = APIRouter()
+
+
+@router.post("/run", response_model=PipelineResponse)
+async def run_pipeline(
+    resume_text: str = Form(None),
+    resume_id: str = Form(None),
+    job_role: str = Form(...),
+    company_name: str = Form(...),
+    job_description: str = Form(None),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
+):
+    """
+    Run resume analysis, ATS check, company research and recommendations
+
+    Each stage result is also stored server-side; its ID is returned in
+    result_ids for use with the documents endpoints.
+
+    Args:
+        resume_text: Full text of the resume
+        resume_id: Resume ID from the upload endpoint, instead of resume_text
+        job_role: Target job role/title
+        company_name: Company name
+        job_description: Optional job description
+        use_cache: Serve repeated requests from the response cache
+
+    Returns:
+        Combined results of every analysis stage
+    """
+    resume_text = resolve_resume_text(resume_text, resume_id)
+
+    try:
+        result = await pipeline_service.run(
+            resume_text=resume_text,
+            job_role=job_role,
+            company_name=company_name,
+            job_description=job_description,
+            use_cache=use_cache
+        )
+
+        result["result_ids"] = {
+            stage: session_store.put_result(stage, result[stage]) for stage in STAGE_MODELS
+        }
+        return PipelineResponse(**result)
+
+    except GeminiUnavailableError as e:
+        raise unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error running analysis pipeline: {str(e)}")
+
+
+@router.post("/stream")
+async def stream_pipeline(
+    request: Request,
+    resume_text: str = Form(None),
+    resume_id: str = Form(None),
+    job_role: str = Form(...),
+    company_name: str = Form(...),
+    job_description: str = Form(None),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
+):
+    """
+    Stream each analysis stage as Server-Sent Events as soon as it completes
+
+    Every event is named after its stage (analysis, ats_score,
+    company_research, recommendations, done) and carries the elapsed time
+    plus the stage result (with its stored result_id) or error. Remaining
+    work is cancelled when the client disconnects.
+
+    Args:
+        request: Incoming request, used to detect client disconnects
+        resume_text: Full text of the resume
+        resume_id: Resume ID from the upload endpoint, instead of resume_text
+        job_role: Target job role/title
+        company_name: Company name
+        job_description: Optional job description
+        use_cache: Serve repeated requests from the response cache
+
+    Returns:
+        text/event-stream response
+    """
+    resume_text = resolve_resume_text(resume_text, resume_id)
+
+    async def event_stream():
+        events = pipeline_service.stream(
+            resume_text=resume_text,
+            job_role=job_role,
+            company_name=company_name,
+            job_description=job_description,
+            use_cache=use_cache
+        )
+        try:
+            async for event in events:
+                if await request.is_disconnected():
+                    break
+                if event["data"] is not None:
+                    event["result_id"] = session_store.put_result(event["stage"], event["data"])
+                yield f"event: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _validate_batch(request: BatchAnalysisRequest) -> str:
+    """Check the batch size and resolve the resume text"""
+    if len(request.targets) > settings.BATCH_MAX_TARGETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch can contain at most {settings.BATCH_MAX_TARGETS} targets"
+        )
+    return resolve_resume_text(request.resume_text, request.resume_id)
+
+
+def _store_target_results(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Store each stage result of a batch target and record its result ID"""
+    result["result_ids"] = {
+        stage: session_store.put_result(stage, result[stage]) for stage in STAGE_MODELS if stage in result
+    }
+    return result
+
+
+@router.post("/batch", response_model=BatchAnalysisResponse)
+async def run_batch(
+    batch: BatchAnalysisRequest,
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
+):
+    """
+    Analyze one resume against many job postings
+
+    Each target gets a resume analysis, an ATS check and, when a company
+    name is given, company research. Targets run with bounded concurrency
+    (BATCH_CONCURRENCY) and share the resume's extracted features and the
+    cached research of each company. A failed stage is reported in the
+    target's errors without failing the batch, except while Gemini is
+    unavailable, which returns 503 with Retry-After.
+
+    Args:
+        batch: Resume (text or ID) and the list of targets
+        use_cache: Serve repeated requests from the response cache
+
+    Returns:
+        Per-target results in request order
+    """
+    resume_text = _validate_batch(batch)
+
+    try:
+        result = await pipeline_service.run_batch(
+            resume_text=resume_text,
+            targets=[target.model_dump() for target in batch.targets],
+            use_cache=use_cache
+        )
+
+        for target_result in result["results"]:
+            _store_target_results(target_result)
+        return BatchAnalysisResponse(**result)
+
+    except GeminiUnavailableError as e:
+        raise unavailable(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error running batch analysis: {str(e)}")
+
+
+@router.post("/batch/stream")
+async def stream_batch(
+    request: Request,
+    batch: BatchAnalysisRequest,
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
+):
+    """
+    Stream batch results as Server-Sent Events, one "target" event per finished target
+
+    Targets arrive in completion order; each carries its index in the
+    request. A final "done" event reports the total count. Remaining work is
+    cancelled when the client disconnects.
+
+    Args:
+        request: Incoming request, used to detect client disconnects
+        batch: Resume (text or ID) and the list of targets
+        use_cache: Serve repeated requests from the response cache
+
+    Returns:
+        text/event-stream response
+    """
+    resume_text = _validate_batch(batch)
+
+    async def event_stream():
+        results = pipeline_service.stream_batch(
+            resume_text=resume_text,
+            targets=[target.model_dump() for target in batch.targets],
+            use_cache=use_cache
+        )
+        completed = 0
+        try:
+            async for result in results:
+                if await request.is_disconnected():
+                    break
+                completed += 1
+                yield f"event: target\ndata: {json.dumps(_store_target_results(result))}\n\n"
+            else:
+                yield f"event: done\ndata: {json.dumps({'completed': completed})}\n\n"
+        except GeminiUnavailableError as e:
+            yield f"event: error\ndata: {json.dumps({'message': str(e), 'retry_after': e.retry_after})}\n\n"
+        finally:
+            await results.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
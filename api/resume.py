@@ -3,103 +3,231 @@ Resume API Endpoints
 Handles resume upload and analysis
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fastapi import APIRouter, HTTPException, Form, Query, Request, Response
 from models.schemas import ResumeAnalysisResponse, ATSScoreResponse
-from services import gemini_service, pdf_service
+from services import gemini_service, pdf_service, session_store, upload_service, text_cache, ats_scorer, corpus_index, text_preprocessor
+from services.pdf_service import PDFServiceBusyError
+from services.gemini_service import GeminiUnavailableError
+from services.upload_service import UploadTooLargeError, InvalidUploadError
+from core.config import settings
+from api.common import RESULT_ID_HEADER, resolve_resume_text, unavailable
 import os
 import aiofiles
 
 router = APIRouter()
 
 
-@router.post("/upload")
-async def upload_resume(file: UploadFile = File(...)):
+# The body is parsed by upload_service, so the file field is described here for the docs
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}}
+                }
+            }
+        }
+    }
+}
+
+
+@router.post("/upload", openapi_extra=UPLOAD_REQUEST_BODY)
+async def upload_resume(
+    request: Request,
+    include_text: bool = Query(True, description="Return the extracted text in the response")
+):
     """
     Upload and extract text from resume PDF
     
+    The extracted text is compacted (whitespace, hyphenation, page numbers
+    and repeated headers/footers) and kept server-side under a
+    content-addressed resume_id that the other endpoints accept instead of
+    resume_text. The response reports the estimated tokens saved.
+    The multipart body is parsed as it arrives: the "file" field is written
+    to disk once, hashed in the same pass and rejected with 413 once it
+    exceeds MAX_UPLOAD_SIZE, with or without a declared Content-Length.
+    Every uploaded resume is added to the corpus index used by /api/corpus
+    ranking.
+    
     Args:
-        file: PDF file upload
+        request: Incoming multipart/form-data request with a PDF in the "file" field
+        include_text: Return the extracted text in the response
         
     Returns:
-        Extracted resume text
+        Resume ID and extracted resume text
     """
+    # Reject oversized uploads before reading the body when the size is declared
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_UPLOAD_SIZE + 64 * 1024:
+        raise HTTPException(status_code=413, detail="File exceeds the maximum upload size")
+    
+    upload = None
     try:
+        # Stream the upload to disk, enforcing the size limit and hashing as we go
+        upload = await upload_service.spool_request(request)
+        filename = upload.filename
+        
         # Validate file type
-        if not file.filename.endswith('.pdf'):
+        if not filename.endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
         
-        # Read file content
-        content = await file.read()
+        resume_id = upload.sha256
         
-        # Extract text from PDF
-        resume_text = pdf_service.extract_text_from_bytes(content)
+        # Reuse text already extracted from an identical PDF
+        resume_text = await text_cache.get(resume_id)
+        if resume_text is None:
+            # Extract text from PDF on the worker process pool
+            resume_text = await pdf_service.extract_text(upload.path)
+            
+            if not resume_text.strip():
+                raise HTTPException(status_code=400, detail="No text could be extracted from the PDF")
+            
+            await text_cache.put(resume_id, resume_text)
         
-        if not resume_text.strip():
-            raise HTTPException(status_code=400, detail="No text could be extracted from the PDF")
+        raw_text = resume_text
+        resume_text = text_preprocessor.compact(raw_text)
         
-        return {
+        session_store.put_resume(resume_id, resume_text, filename)
+        
+        # Make the resume rankable against saved job descriptions; indexing is best effort
+        try:
+            await corpus_index.add("resume", resume_id, resume_text, label=filename)
+        except OSError:
+            pass
+        
+        result = {
             "success": True,
-            "filename": file.filename,
-            "resume_text": resume_text,
-            "text_length": len(resume_text)
+            "resume_id": resume_id,
+            "filename": filename,
+            "text_length": len(resume_text),
+            "compaction": text_preprocessor.report(raw_text, resume_text)
         }
+        if include_text:
+            result["resume_text"] = resume_text
+        return result
         
+    except HTTPException:
+        raise
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PDFServiceBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+    finally:
+        if upload is not None:
+            upload.cleanup()
 
 
 @router.post("/analyze", response_model=ResumeAnalysisResponse)
 async def analyze_resume(
-    resume_text: str = Form(...),
+    response: Response,
+    resume_text: str = Form(None),
+    resume_id: str = Form(None),
     job_role: str = Form(...),
-    job_description: str = Form(None)
+    job_description: str = Form(None),
+    with_ats: bool = Query(False, description="Run the ATS check in the same LLM call, for a following /ats-check"),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
 ):
     """
     Analyze resume for a specific job role
     
+    With with_ats=true the analysis and the ATS check share one LLM call;
+    an /ats-check for the same resume and job description, sent alongside
+    or afterwards, is then served from it. The stored result's ID is
+    returned in the X-Result-ID header.
+    
     Args:
+        response: Outgoing response, used to set the result ID header
         resume_text: Full text of the resume
+        resume_id: Resume ID from the upload endpoint, instead of resume_text
         job_role: Target job role/title
         job_description: Optional job description
+        with_ats: Run the ATS check in the same LLM call
+        use_cache: Serve repeated requests from the response cache
         
     Returns:
         Resume analysis with scores and recommendations
     """
+    resume_text = resolve_resume_text(resume_text, resume_id)
+    
     try:
-        analysis = await gemini_service.analyze_resume(
-            resume_text=resume_text,
-            job_role=job_role,
-            job_description=job_description
-        )
+        if with_ats:
+            combined = await gemini_service.analyze_resume_and_ats(
+                resume_text=resume_text,
+                job_role=job_role,
+                job_description=job_description,
+                use_cache=use_cache
+            )
+            analysis = combined["analysis"]
+        else:
+            analysis = await gemini_service.analyze_resume(
+                resume_text=resume_text,
+                job_role=job_role,
+                job_description=job_description,
+                use_cache=use_cache
+            )
         
-        return ResumeAnalysisResponse(**analysis)
+        result = ResumeAnalysisResponse(**analysis)
+        response.headers[RESULT_ID_HEADER] = session_store.put_result("analysis", result.model_dump())
+        return result
         
+    except GeminiUnavailableError as e:
+        raise unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing resume: {str(e)}")
 
 
 @router.post("/ats-check", response_model=ATSScoreResponse)
 async def check_ats_compatibility(
-    resume_text: str = Form(...),
-    job_description: str = Form(None)
+    response: Response,
+    resume_text: str = Form(None),
+    resume_id: str = Form(None),
+    job_description: str = Form(None),
+    mode: str = Query("full", pattern="^(fast|full)$", description="fast: local scoring only, full: include LLM review"),
+    use_cache: bool = Query(True, description="Serve repeated requests from the response cache")
 ):
     """
     Check ATS (Applicant Tracking System) compatibility
     
+    In fast mode the report is computed locally in milliseconds without
+    calling the LLM. In full mode a recent or in-flight /analyze?with_ats=true
+    for the same resume and job description is reused. The stored result's
+    ID is returned in the X-Result-ID header.
+    
     Args:
+        response: Outgoing response, used to set the result ID header
         resume_text: Full text of the resume
+        resume_id: Resume ID from the upload endpoint, instead of resume_text
         job_description: Optional job description
+        mode: "fast" for local scoring only, "full" to include the LLM review
+        use_cache: Serve repeated requests from the response cache
         
     Returns:
         ATS compatibility score and recommendations
     """
+    resume_text = resolve_resume_text(resume_text, resume_id)
+    
     try:
-        ats_analysis = await gemini_service.analyze_ats_compatibility(
-            resume_text=resume_text,
-            job_description=job_description
-        )
+        if mode == "fast":
+            ats_analysis = ats_scorer.local_report(resume_text, job_description)
+        else:
+            ats_analysis = await gemini_service.analyze_ats_compatibility(
+                resume_text=resume_text,
+                job_description=job_description,
+                use_cache=use_cache
+            )
         
-        return ATSScoreResponse(**ats_analysis)
+        result = ATSScoreResponse(**ats_analysis)
+        response.headers[RESULT_ID_HEADER] = session_store.put_result("ats_score", result.model_dump())
+        return result
         
+    except GeminiUnavailableError as e:
+        raise unavailable(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error checking ATS compatibility: {str(e)}")
@@ -0,0 +1,162 @@
+"""
+Screening API Endpoints
+Bulk screening of many resumes against one job description
+"""
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Query, Request
+from fastapi.responses import StreamingResponse
+from models.schemas import ScreeningJobResponse, ScreeningResultsPage
+from services import screening_service, upload_service
+from services.screening_service import JOB_COMPLETED, JOB_FAILED
+from services.upload_service import UploadTooLargeError
+from core.config import settings
+from typing import List
+import asyncio
+import json
+
+router = APIRouter()
+
+
+async def _get_job_or_404(job_id: str):
+    job = await screening_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Screening job not found")
+    return job
+
+
+@router.post("/jobs", response_model=ScreeningJobResponse, status_code=202)
+async def create_screening_job(
+    files: List[UploadFile] = File(..., description="Resume PDFs and/or zip archives of PDFs"),
+    job_role: str = Form(...),
+    job_description: str = Form(...),
+    shortlist_size: int = Query(settings.SCREENING_SHORTLIST_SIZE, ge=0, le=200, description="Best local scores that get an LLM analysis")
+):
+    """
+    Start screening a batch of resumes against a job description
+
+    Every resume is extracted on the PDF process pool and scored locally;
+    the best shortlist_size are then analyzed by the LLM under a rate
+    limit. Poll the job, or stream its progress, with the returned ID.
+
+    Args:
+        files: Resume PDFs and/or zip archives containing PDFs
+        job_role: Target job role/title
+        job_description: Job description to screen against
+        shortlist_size: Number of top resumes that get an LLM analysis
+
+    Returns:
+        The queued job
+    """
+    spooled = []
+    try:
+        for file in files:
+            name = file.filename or ""
+            if name.lower().endswith(".zip"):
+                max_size = settings.SCREENING_MAX_ARCHIVE_SIZE
+            elif name.lower().endswith(".pdf"):
+                max_size = settings.MAX_UPLOAD_SIZE
+            else:
+                raise HTTPException(status_code=400, detail=f"{name}: only PDF and zip files are supported")
+            spooled.append((name, await upload_service.spool(file, max_size=max_size)))
+
+        job = await screening_service.submit(
+            job_role=job_role,
+            job_description=job_description,
+            uploads=[(name, upload.path) for name, upload in spooled],
+            shortlist_size=shortlist_size
+        )
+        return ScreeningJobResponse(**job)
+
+    except HTTPException:
+        raise
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating screening job: {str(e)}")
+    finally:
+        # Files already moved into the job are gone; this removes the rest
+        for _, upload in spooled:
+            upload.cleanup()
+
+
+@router.get("/jobs/{job_id}", response_model=ScreeningJobResponse)
+async def get_screening_job(job_id: str):
+    """
+    Get a screening job's status and progress
+
+    Args:
+        job_id: Screening job ID
+
+    Returns:
+        Job status with resume counts per state
+    """
+    return ScreeningJobResponse(**await _get_job_or_404(job_id))
+
+
+@router.get("/jobs/{job_id}/results", response_model=ScreeningResultsPage)
+async def get_screening_results(
+    job_id: str,
+    page: int = Query(1, ge=1, description="Page number, starting at 1"),
+    page_size: int = Query(50, ge=1, le=500, description="Results per page")
+):
+    """
+    Get screening results page by page, highest score first
+
+    Results are available while the job runs; scores of shortlisted
+    resumes change once their LLM analysis completes.
+
+    Args:
+        job_id: Screening job ID
+        page: Page number, starting at 1
+        page_size: Results per page
+
+    Returns:
+        Job status and one page of results
+    """
+    job = await _get_job_or_404(job_id)
+    results = await screening_service.get_results(job_id, page, page_size)
+    return ScreeningResultsPage(job=job, page=page, page_size=page_size, results=results)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_screening_progress(
+    request: Request,
+    job_id: str,
+    interval: float = Query(1.0, ge=0.2, le=30.0, description="Seconds between progress checks")
+):
+    """
+    Stream a screening job's progress as Server-Sent Events
+
+    A "progress" event is sent whenever the job's status or counts change,
+    and a final "done" event when it completes or fails.
+
+    Args:
+        request: Incoming request, used to detect client disconnects
+        job_id: Screening job ID
+        interval: Seconds between progress checks
+
+    Returns:
+        text/event-stream response
+    """
+    await _get_job_or_404(job_id)
+
+    async def event_stream():
+        last = None
+        while not await request.is_disconnected():
+            job = ScreeningJobResponse(**await screening_service.get_job(job_id)).model_dump()
+            snapshot = (job["status"], job["counts"])
+            if snapshot != last:
+                last = snapshot
+                yield f"event: progress\ndata: {json.dumps(job)}\n\n"
+            if job["status"] in (JOB_COMPLETED, JOB_FAILED):
+                yield f"event: done\ndata: {json.dumps(job)}\n\n"
+                return
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
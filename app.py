@@ -7,24 +7,41 @@ from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 import uvicorn
 import os
 from pathlib import Path
 
 # Import routers
-from api import resume, company, documents, analysis
+from api import resume, company, documents, analysis, pipeline, corpus, screening, jobs
+from services import gemini_service, document_service, pdf_service, text_cache, corpus_index, screening_service, job_queue, text_preprocessor
 
 # Ensure required directories exist
 Path("uploads").mkdir(exist_ok=True)
 Path("outputs").mkdir(exist_ok=True)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start up and tear down shared service resources"""
+    await screening_service.start()
+    await job_queue.start()
+    yield
+    await job_queue.shutdown()
+    await screening_service.shutdown()
+    gemini_service.shutdown()
+    document_service.shutdown()
+    pdf_service.shutdown()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Job Application Optimizer API",
     description="AI-powered job application optimization with ATS checking and document generation",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -34,6 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Result-ID"],
 )
 
 # Mount static file directories
@@ -48,6 +66,10 @@ app.include_router(resume.router, prefix="/api/resume", tags=["Resume"])
 app.include_router(company.router, prefix="/api/company", tags=["Company"])
 app.include_router(documents.router, prefix="/api/documents", tags=["Documents"])
 app.include_router(analysis.router, prefix="/api/analysis", tags=["Analysis"])
+app.include_router(pipeline.router, prefix="/api/pipeline", tags=["Pipeline"])
+app.include_router(corpus.router, prefix="/api/corpus", tags=["Corpus"])
+app.include_router(screening.router, prefix="/api/screening", tags=["Screening"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
 
 
 @app.get("/")
@@ -66,7 +88,13 @@ async def root():
             "ats_check": "/api/resume/ats-check",
             "company_research": "/api/company/research",
             "generate_documents": "/api/documents/generate",
-            "recommendations": "/api/analysis/recommendations"
+            "recommendations": "/api/analysis/recommendations",
+            "pipeline_run": "/api/pipeline/run",
+            "pipeline_stream": "/api/pipeline/stream",
+            "rank_resumes": "/api/corpus/rank/resumes",
+            "rank_jobs": "/api/corpus/rank/jobs",
+            "screening_jobs": "/api/screening/jobs",
+            "jobs": "/api/jobs/{job_id}"
         }
     }
 
@@ -77,7 +105,14 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "job-optimizer-api",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "gemini": gemini_service.get_stats(),
+        "pdf_extraction": pdf_service.get_stats(),
+        "text_cache": text_cache.get_stats(),
+        "text_compaction": text_preprocessor.get_stats(),
+        "corpus_index": corpus_index.get_stats(),
+        "screening": screening_service.get_stats(),
+        "job_queue": job_queue.get_stats()
     }
 
 
@@ -110,7 +145,8 @@ async def http_exception_handler(request, exc):
             "error": True,
             "message": exc.detail,
             "status_code": exc.status_code
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
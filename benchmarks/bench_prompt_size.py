@@ -0,0 +1,284 @@
+"""
+Prompt Size Benchmark
+Compares prompt sizes of the recommendations and document prompts before and
+after compact context serialization, for representative stage outputs. The
+optimized resume is rewritten one section per call, each call repeating the
+analysis insights, so its size is the sum over the section prompts actually
+sent.
+
+Usage:
+    python benchmarks/bench_prompt_size.py [--check]
+
+With --check the script exits non-zero when a prompt's context exceeds its
+token budget or the prompt grows past the legacy serialization, so it can
+guard against regressions.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from services.gemini_service import GeminiService
+from services.context_builder import context_builder
+from services.text_service import estimate_tokens, text_preprocessor
+
+
+JOB_ROLE = "Senior Backend Engineer"
+COMPANY_NAME = "Acme Analytics"
+
+RESUME_TEXT = """Jane Doe
+jane.doe@example.com | +1 555 010 2000 | github.com/janedoe
+
+SUMMARY
+Backend engineer with 8 years of experience building data-intensive services in Python and Go.
+
+EXPERIENCE
+Staff Engineer, DataCo (2019 - present)
+- Led the migration of a monolith to 14 Kubernetes services, cutting deploy time from 2 hours to 9 minutes
+- Designed an event pipeline on Kafka processing 2B events per day
+- Mentored 6 engineers and ran the backend hiring loop
+Software Engineer, WebShop (2015 - 2019)
+- Built the payments API in Django and PostgreSQL
+- Reduced p99 checkout latency by 40% with query tuning and Redis caching
+
+SKILLS
+Python, Go, PostgreSQL, Redis, Kafka, Kubernetes, Docker, AWS, Terraform
+
+EDUCATION
+BSc Computer Science, State University
+"""
+
+ANALYSIS = {
+    "overall_score": 7.8,
+    "strengths": [
+        "Quantified impact in most experience bullets, such as the 40% latency reduction and 2B events per day",
+        "Clear progression from software engineer to staff engineer with growing scope",
+        "Strong, relevant technical stack for backend and data infrastructure roles",
+        "Leadership evidence through mentoring and owning the hiring loop",
+    ],
+    "skills_to_emphasize": [
+        "Kafka - the role centres on event streaming and the pipeline scale is a differentiator",
+        "Kubernetes - platform migration experience maps directly to the job's infrastructure work",
+        "Python - the primary language of the posting",
+        "PostgreSQL - query tuning results show depth beyond basic usage",
+    ],
+    "keywords_to_add": ["gRPC", "observability", "Prometheus", "distributed systems", "SLOs", "on-call"],
+    "experience_to_highlight": [
+        "Monolith to microservices migration at DataCo, including the deploy-time improvement",
+        "Event pipeline design and its throughput",
+        "Payments API ownership, which shows reliability under strict correctness requirements",
+    ],
+    "gaps_to_address": [
+        "No mention of observability tooling; add monitoring and alerting work if any",
+        "No explicit system design ownership statements; frame the pipeline work as architecture leadership",
+    ],
+    "improvement_areas": [
+        "Add a one-line headline tailored to the senior backend role",
+        "Group skills by category (languages, data, infrastructure) for faster scanning",
+        "Mention team size and stakeholders for the migration project",
+    ],
+}
+
+ATS_SCORE = {
+    "ats_score": 78,
+    "keyword_match": 64,
+    "formatting_issues": [
+        "Contact line uses pipe separators that some parsers merge into one field",
+        "No dates for education; some ATS filters require them",
+    ],
+    "missing_keywords": ["gRPC", "observability", "Prometheus", "distributed systems", "SLOs", "on-call"],
+    "strengths": [
+        "Standard section headings are present",
+        "Single-column layout parses cleanly",
+        "Consistent date format across roles",
+    ],
+    "recommendations": [
+        "Add the missing infrastructure keywords where they are truthful",
+        "Spell out acronyms once, e.g. Service Level Objectives (SLOs)",
+        "Add graduation year to education",
+        "Replace pipe separators in the contact line with line breaks",
+    ],
+}
+
+COMPANY_RESEARCH = {
+    "company_overview": "Acme Analytics builds a real-time analytics platform used by mid-size retailers to track inventory and demand. The company has grown to about 600 employees and serves customers in 30 countries.",
+    "mission_and_values": [
+        "Make real-time data accessible to every retailer",
+        "Customer obsession",
+        "Ownership and bias for action",
+        "Learn and share openly",
+    ],
+    "recent_news": [
+        "Raised a Series C round to expand into the European market",
+        "Launched a streaming SQL product for in-store analytics",
+        "Opened a new engineering hub in Lisbon",
+    ],
+    "industry_position": "A fast-growing challenger to incumbent business intelligence vendors, differentiated by sub-second data freshness and retail-specific models.",
+    "culture": "Engineering-led, remote-friendly culture with small autonomous teams, written design reviews and a strong on-call ownership model.",
+    "key_leadership": ["Maria Lopez, CEO", "Sam Patel, CTO", "Ada Chen, VP Engineering"],
+    "challenges": [
+        "Scaling the streaming platform to larger enterprise customers",
+        "Competing for senior infrastructure talent",
+    ],
+    "opportunities": [
+        "European expansion creates new data residency work",
+        "Streaming SQL launch needs backend engineers with Kafka experience",
+        "Growing platform team after the funding round",
+    ],
+}
+
+RECOMMENDATIONS = {
+    "resume_alignment": ["Lead with the Kafka pipeline", "Add observability work", "Add a tailored headline", "Quantify the migration team"],
+    "cover_letter_talking_points": [
+        "Experience scaling an event pipeline to 2B events per day, relevant to the streaming SQL launch",
+        "Kubernetes migration that cut deploy time from hours to minutes",
+        "Mentoring and hiring experience for a growing platform team",
+        "Interest in data residency challenges of the European expansion",
+        "Customer-focused reliability work on the payments API",
+    ],
+    "cultural_fit": [
+        "Show ownership through the on-call and migration examples",
+        "Reference written design documents you have authored",
+        "Highlight open knowledge sharing through mentoring",
+    ],
+    "interview_questions": ["Describe the Kafka pipeline design", "How did you plan the migration?", "How do you run on-call?", "Tell us about a hiring decision"],
+    "preparation_tips": ["Review streaming SQL concepts", "Prepare a system design story", "Read the Series C announcement", "Prepare questions on team structure"],
+    "next_steps": ["Tailor the resume", "Write the cover letter", "Reach out to an engineer at Acme"],
+}
+
+
+def verbose(data):
+    """A stage output with every list five times longer, as long CVs produce"""
+    return {
+        key: [f"{item} ({round_})" for round_ in range(1, 6) for item in value] if isinstance(value, list) else value
+        for key, value in data.items()
+    }
+
+
+SCENARIOS = {
+    "typical": (ANALYSIS, ATS_SCORE, COMPANY_RESEARCH, RECOMMENDATIONS),
+    "verbose": (verbose(ANALYSIS), verbose(ATS_SCORE), verbose(COMPANY_RESEARCH), verbose(RECOMMENDATIONS)),
+}
+
+
+def resume_sections():
+    """Sections the resume is rewritten in, split as generate_optimized_resume does"""
+    resume_text = text_preprocessor.prepare(RESUME_TEXT, settings.PROMPT_RESUME_TOKEN_BUDGET)
+    sections = text_preprocessor.segments(
+        resume_text, settings.RESUME_SECTION_MIN_TOKENS, settings.RESUME_SECTION_MAX_TOKENS
+    )
+    # A resume without recognizable sections is rewritten in one call
+    return sections if len(sections) >= 2 else []
+
+
+def legacy_prompts(ANALYSIS, ATS_SCORE, COMPANY_RESEARCH, RECOMMENDATIONS):
+    """Prompts as serialized before the context builder"""
+    recommendations = f"""You are a career strategist. Based on the resume analysis and company research, provide personalized recommendations for applying to {COMPANY_NAME} for a {JOB_ROLE} position.
+
+RESUME ANALYSIS:
+{json.dumps(ANALYSIS, indent=2)}
+
+ATS ANALYSIS:
+{json.dumps(ATS_SCORE, indent=2)}
+
+COMPANY RESEARCH:
+{json.dumps(COMPANY_RESEARCH, indent=2)}
+"""
+    insights = f"""ANALYSIS INSIGHTS:
+- Skills to emphasize: {', '.join(ANALYSIS['skills_to_emphasize'])}
+- Keywords to add: {', '.join(ANALYSIS['keywords_to_add'])}
+- ATS recommendations: {', '.join(ATS_SCORE['recommendations'])}
+"""
+    sections = resume_sections()
+    if sections:
+        resume = "".join(
+            f"RESUME SECTION ({part} OF {len(sections)}):\n{section}\n\n{insights}\n"
+            for part, section in enumerate(sections, start=1)
+        )
+    else:
+        resume = f"ORIGINAL RESUME:\n{RESUME_TEXT}\n\n{insights}"
+    cover_letter = f"""KEY INFORMATION:
+- Company values: {', '.join(COMPANY_RESEARCH['mission_and_values'])}
+- Talking points: {', '.join(RECOMMENDATIONS['cover_letter_talking_points'])}
+- Cultural fit: {', '.join(RECOMMENDATIONS['cultural_fit'])}
+"""
+    return {"recommendations": recommendations, "optimized_resume": resume, "cover_letter": cover_letter}
+
+
+def current_prompts(ANALYSIS, ATS_SCORE, COMPANY_RESEARCH, RECOMMENDATIONS):
+    """Prompts as built now, with the same instructions left out for a like-for-like comparison"""
+    recommendations = GeminiService._recommendations_prompt(
+        JOB_ROLE, COMPANY_NAME, ANALYSIS, ATS_SCORE, COMPANY_RESEARCH
+    ).split("Provide actionable recommendations")[0]
+    sections = resume_sections()
+    if sections:
+        insights = context_builder.resume_insights(ANALYSIS, ATS_SCORE)
+        resume = "".join(
+            GeminiService._resume_section_prompt(
+                section, part, len(sections), JOB_ROLE, COMPANY_NAME, insights
+            ).split("Rewrite this section")[0].split("\n\n", 1)[1]
+            for part, section in enumerate(sections, start=1)
+        )
+    else:
+        resume = GeminiService._optimized_resume_prompt(
+            RESUME_TEXT, JOB_ROLE, COMPANY_NAME, ANALYSIS, ATS_SCORE
+        ).split("Create a professional")[0].split("\n\n", 1)[1]
+    cover_letter = GeminiService._cover_letter_prompt(
+        JOB_ROLE, COMPANY_NAME, COMPANY_RESEARCH, RECOMMENDATIONS
+    ).split("Write a professional")[0].split("\n\n", 1)[1]
+    return {"recommendations": recommendations, "optimized_resume": resume, "cover_letter": cover_letter}
+
+
+def context_budgets(ANALYSIS, ATS_SCORE, COMPANY_RESEARCH, RECOMMENDATIONS):
+    """Each prompt's context and the budget it must stay within"""
+    return {
+        "recommendations": (
+            context_builder.recommendations_context(ANALYSIS, ATS_SCORE, COMPANY_RESEARCH),
+            settings.PROMPT_CONTEXT_TOKEN_BUDGET,
+        ),
+        "optimized_resume": (
+            context_builder.resume_insights(ANALYSIS, ATS_SCORE),
+            settings.PROMPT_INSIGHTS_TOKEN_BUDGET,
+        ),
+        "cover_letter": (
+            context_builder.cover_letter_context(COMPANY_RESEARCH, RECOMMENDATIONS),
+            settings.PROMPT_INSIGHTS_TOKEN_BUDGET,
+        ),
+    }
+
+
+def main() -> int:
+    failures = []
+
+    print(f"optimized_resume: sum of {max(len(resume_sections()), 1)} section prompt(s)\n")
+    print(f"{'scenario':<10}{'prompt':<18}{'chars before':>14}{'chars after':>13}{'tokens before':>15}{'tokens after':>14}{'saved':>8}")
+    for scenario, inputs in SCENARIOS.items():
+        before = legacy_prompts(*inputs)
+        after = current_prompts(*inputs)
+        budgets = context_budgets(*inputs)
+        for name in before:
+            tokens_before = estimate_tokens(before[name])
+            tokens_after = estimate_tokens(after[name])
+            saved = 1 - tokens_after / tokens_before
+            print(
+                f"{scenario:<10}{name:<18}{len(before[name]):>14}{len(after[name]):>13}"
+                f"{tokens_before:>15}{tokens_after:>14}{saved:>8.0%}"
+            )
+            context, budget = budgets[name]
+            if estimate_tokens(context) > budget:
+                failures.append(f"{scenario}/{name}: context is {estimate_tokens(context)} tokens, budget {budget}")
+            if tokens_after > tokens_before:
+                failures.append(f"{scenario}/{name}: prompt grew from {tokens_before} to {tokens_after} tokens")
+
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if "--check" in sys.argv[1:]:
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
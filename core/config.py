@@ -25,11 +25,99 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     UPLOAD_DIR: str = "uploads"
     OUTPUT_DIR: str = "outputs"
+    DOCUMENT_RENDER_WORKERS: int = 4  # Threads building and saving DOCX files
+    
+    # PDF extraction settings
+    PDF_POOL_WORKERS: int = 2  # Worker processes running PyPDF2
+    PDF_PAGES_PER_TASK: int = 4  # Pages extracted per worker task
+    PDF_EXTRACTION_TIMEOUT: float = 30.0  # Per-document limit in seconds, from its first running page task
+    PDF_MAX_QUEUE_DEPTH: int = 64  # Documents extracting at once before returning 503
+    
+    # Extracted text cache settings (keyed by PDF content hash)
+    TEXT_CACHE_DIR: str = "cache/text_cache"  # Keep outside the publicly served uploads/ directory
+    TEXT_CACHE_MEMORY_ENTRIES: int = 256
+    TEXT_CACHE_DISK_MAX_BYTES: int = 200 * 1024 * 1024
+    
+    # Prompt input settings (token estimates; 0 disables trimming)
+    PROMPT_RESUME_TOKEN_BUDGET: int = 6000
+    PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET: int = 2000
+    PROMPT_CONTEXT_TOKEN_BUDGET: int = 700  # Earlier stage results in the recommendations prompt
+    PROMPT_INSIGHTS_TOKEN_BUDGET: int = 400  # Analysis insights in the resume and cover letter prompts
+    
+    # Long resume settings (chunked analysis of long CVs)
+    LONG_RESUME_TOKEN_THRESHOLD: int = 5000  # Compacted resumes above this are analyzed in chunks; 0 disables
+    LONG_RESUME_CHUNK_TOKENS: int = 2500
+    LONG_RESUME_MAX_CHUNKS: int = 12  # Text beyond this many chunks is trimmed
+    LONG_RESUME_REDUCE_TOKEN_BUDGET: int = 2000  # Chunk findings in the merge prompt
+    
+    # Optimized resume settings (sections rewritten concurrently)
+    RESUME_SECTION_MIN_TOKENS: int = 40  # Smaller sections are rewritten together with the next one
+    RESUME_SECTION_MAX_TOKENS: int = 1500  # Larger sections are split at line boundaries
+    RESUME_SECTION_ATTEMPTS: int = 2  # Tries per section before the rewrite fails
+    
+    # Skills extraction settings
+    SKILLS_TAXONOMY_PATH: str = "data/skills_taxonomy.txt"  # Relative to the project root
+    
+    # Corpus index settings (resume and job description ranking)
+    CORPUS_INDEX_DIR: str = "cache/corpus"
+    CORPUS_HASH_DIMENSIONS: int = 2 ** 20  # Hashed term feature space size
+    CORPUS_MAX_ANALYZE: int = 10  # Most top matches that may get a full LLM analysis
     
     # Gemini model settings
     GEMINI_MODEL: str = "gemini-flash-latest"  # or "gemini-1.5-flash" for faster/cheaper
     GEMINI_TEMPERATURE: float = 0.7
     GEMINI_MAX_TOKENS: int = 4096
+    GEMINI_STRUCTURED_OUTPUT: bool = True  # Constrain JSON calls with response schemas from models/schemas.py
+    
+    # Gemini concurrency settings
+    GEMINI_MAX_CONCURRENCY: int = 32  # Max Gemini calls in flight per process
+    GEMINI_EXECUTOR_WORKERS: int = 32  # Threads running the blocking client calls
+    GEMINI_REQUEST_TIMEOUT: float = 120.0  # Per-call timeout in seconds
+    
+    # Gemini rate limit and resilience settings
+    GEMINI_RPM_LIMIT: int = 0  # Requests per minute across all worker processes; 0 disables
+    GEMINI_TPM_LIMIT: int = 0  # Estimated prompt tokens per minute across all worker processes; 0 disables
+    GEMINI_RATE_LIMIT_DB_PATH: str = "cache/rate_limit.db"  # Bucket levels shared by worker processes
+    GEMINI_RATE_LIMIT_MAX_WAIT: float = 30.0  # Longest wait for quota before returning 503
+    GEMINI_MAX_RETRIES: int = 3  # Retries of rate-limited (429) and server-side (5xx) errors
+    GEMINI_BACKOFF_BASE: float = 1.0  # Seconds; doubles per retry, with full jitter
+    GEMINI_BACKOFF_MAX: float = 20.0
+    GEMINI_BREAKER_FAILURE_THRESHOLD: int = 5  # Consecutive retryable failures that open the breaker; 0 disables
+    GEMINI_BREAKER_RESET_SECONDS: float = 30.0  # How long the open breaker refuses calls
+    
+    # LLM response cache settings
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 512  # In-memory LRU tier size
+    LLM_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    LLM_CACHE_DB_PATH: str = "cache/llm_cache.db"  # Persistent SQLite tier
+    
+    # Company research store settings
+    COMPANY_CACHE_TTL_SECONDS: int = 24 * 60 * 60  # Refresh after this age
+    COMPANY_CACHE_STALE_TTL_SECONDS: int = 7 * 24 * 60 * 60  # Serve stale while refreshing
+    COMPANY_CACHE_MAX_ENTRIES: int = 2048
+    
+    # Resume session settings
+    SESSION_TTL_SECONDS: int = 2 * 60 * 60  # Idle time before a resume/result expires
+    SESSION_MAX_ENTRIES: int = 1000
+    
+    # Batch analysis settings (one resume against many job postings)
+    BATCH_MAX_TARGETS: int = 50
+    BATCH_CONCURRENCY: int = 4  # Targets analyzed at once per batch
+    
+    # Bulk screening settings (many resumes against one job description)
+    SCREENING_DB_PATH: str = "cache/screening.db"
+    SCREENING_DIR: str = "cache/screening"  # Uploaded PDFs per job; keep outside the served uploads/ directory
+    SCREENING_MAX_FILES: int = 1000  # Resumes per screening job
+    SCREENING_MAX_ARCHIVE_SIZE: int = 500 * 1024 * 1024  # Per uploaded zip
+    SCREENING_SHORTLIST_SIZE: int = 20  # Best local scores that get an LLM analysis
+    SCREENING_LLM_CONCURRENCY: int = 4
+
+    # Background job queue settings (async document generation)
+    JOB_QUEUE_DB_PATH: str = "cache/jobs.db"
+    JOB_QUEUE_WORKERS: int = 2  # Jobs run at once per process
+    JOB_LEASE_SECONDS: float = 60.0  # Claim lifetime; renewed while the job runs
+    JOB_MAX_ATTEMPTS: int = 3  # Claims before an interrupted job is marked failed
+    JOB_POLL_INTERVAL: float = 2.0  # Idle seconds between checks for jobs from other processes
     
     class Config:
         env_file = ".env"
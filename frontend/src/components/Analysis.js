@@ -7,7 +7,7 @@ import {
   Alert,
   LinearProgress,
 } from '@mui/material';
-import { resumeService, companyService, analysisService } from '../services/api';
+import { pipelineService } from '../services/api';
 
 function Analysis({ onNext, onBack, resumeData, jobData, setAnalysisResults }) {
   const [error, setError] = useState(null);
@@ -23,40 +23,51 @@ function Analysis({ onNext, onBack, resumeData, jobData, setAnalysisResults }) {
     setError(null);
 
     try {
-      // Step 1: Analyze Resume
-      setCurrentStep('Analyzing your resume...');
-      setProgress(25);
-      const resumeAnalysis = await resumeService.analyzeResume(
-        resumeData.text,
-        jobData.jobRole,
-        jobData.jobDescription
-      );
+      // Analysis, ATS check and company research run concurrently on the
+      // server, followed by recommendations; each result is streamed back
+      // as soon as its stage completes
+      setCurrentStep('Analyzing resume, ATS compatibility and company...');
+      setProgress(10);
+
+      const stageLabels = {
+        analysis: 'Resume analysis ready',
+        ats_score: 'ATS check ready',
+        company_research: 'Company research ready',
+        recommendations: 'Recommendations ready',
+      };
+      const stageResults = {};
+      const resultIds = {};
+      let completedStages = 0;
+      let stageError = null;
 
-      // Step 2: Check ATS Compatibility
-      setCurrentStep('Checking ATS compatibility...');
-      setProgress(50);
-      const atsScore = await resumeService.checkATS(
-        resumeData.text,
-        jobData.jobDescription
+      await pipelineService.streamPipeline(
+        resumeData.resumeId,
+        jobData.jobRole,
+        jobData.companyName,
+        jobData.jobDescription,
+        (event) => {
+          if (event.error) {
+            stageError = stageError || event.error;
+            return;
+          }
+          if (event.stage in stageLabels) {
+            stageResults[event.stage] = event.data;
+            resultIds[event.stage] = event.result_id;
+            completedStages += 1;
+            setCurrentStep(`${stageLabels[event.stage]}...`);
+            setProgress(10 + completedStages * 22);
+          }
+        }
       );
 
-      // Step 3: Research Company
-      setCurrentStep('Researching company information...');
-      setProgress(75);
-      const companyResearch = await companyService.researchCompany(
-        jobData.companyName
-      );
+      if (stageError) {
+        throw new Error(stageError);
+      }
 
-      // Step 4: Generate Recommendations
-      setCurrentStep('Generating personalized recommendations...');
-      setProgress(90);
-      const recommendations = await analysisService.generateRecommendations({
-        job_role: jobData.jobRole,
-        company_name: jobData.companyName,
-        analysis: resumeAnalysis,
-        ats_score: atsScore,
-        company_research: companyResearch,
-      });
+      const resumeAnalysis = stageResults.analysis;
+      const atsScore = stageResults.ats_score;
+      const companyResearch = stageResults.company_research;
+      const recommendations = stageResults.recommendations;
 
       setProgress(100);
       setCurrentStep('Analysis complete!');
@@ -66,6 +77,7 @@ function Analysis({ onNext, onBack, resumeData, jobData, setAnalysisResults }) {
         atsScore,
         companyResearch,
         recommendations,
+        resultIds,
       };
 
       console.log('Analysis complete - Setting results:', results);
@@ -76,7 +88,7 @@ function Analysis({ onNext, onBack, resumeData, jobData, setAnalysisResults }) {
         onNext();
       }, 1000);
     } catch (err) {
-      setError(err.response?.data?.detail || 'Analysis failed. Please try again.');
+      setError(err.response?.data?.detail || err.message || 'Analysis failed. Please try again.');
     }
   };
 
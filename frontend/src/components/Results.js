@@ -57,14 +57,17 @@ function Results({ onBack, onReset, analysisResults, resumeData, jobData }) {
     setDocError(null);
 
     try {
+      // Reference the server-side resume and stage results by ID rather
+      // than re-sending them
+      const { resultIds } = analysisResults;
       const result = await documentService.generateDocuments({
-        resume_text: resumeData.text,
+        resume_id: resumeData.resumeId,
         job_role: jobData.jobRole,
         company_name: jobData.companyName,
-        analysis: resumeAnalysis,
-        ats_score: atsScore,
-        company_research: companyResearch,
-        recommendations: recommendations,
+        analysis_id: resultIds.analysis,
+        ats_score_id: resultIds.ats_score,
+        company_research_id: resultIds.company_research,
+        recommendations_id: resultIds.recommendations,
       });
       setDocuments(result);
     } catch (err) {
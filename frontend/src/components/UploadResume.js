@@ -28,7 +28,8 @@ function UploadResume({ onNext, setResumeData, resumeData }) {
         const result = await resumeService.uploadResume(uploadedFile);
         setResumeData({
           file: uploadedFile,
-          text: result.resume_text,
+          resumeId: result.resume_id,
+          textLength: result.text_length,
           filename: result.filename,
         });
         setLoading(false);
@@ -9,13 +9,54 @@ const api = axios.create({
   },
 });
 
+// Reads a Server-Sent Events response body, calling onEvent with the
+// parsed JSON data and event name of every frame
+const readEventStream = async (response, onEvent) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const lines = frame.split('\n');
+      const eventLine = lines.find((line) => line.startsWith('event: '));
+      const dataLine = lines.find((line) => line.startsWith('data: '));
+      if (dataLine) {
+        onEvent(JSON.parse(dataLine.slice(6)), eventLine ? eventLine.slice(7) : 'message');
+      }
+      boundary = buffer.indexOf('\n\n');
+    }
+  }
+};
+
+const postEventStream = async (path, data, onEvent, signal) => {
+  const response = await fetch(`${API_BASE_URL}${path}`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(data),
+    signal,
+  });
+  if (!response.ok) {
+    throw new Error(`Request failed with status ${response.status}`);
+  }
+  await readEventStream(response, onEvent);
+};
+
 // Resume Services
 export const resumeService = {
   uploadResume: async (file) => {
     const formData = new FormData();
     formData.append('file', file);
 
-    const response = await api.post('/resume/upload', formData, {
+    // The server keeps the extracted text; later calls reference resume_id
+    const response = await api.post('/resume/upload?include_text=false', formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
       },
@@ -78,6 +119,49 @@ export const analysisService = {
   },
 };
 
+// Pipeline Services
+export const pipelineService = {
+  runPipeline: async (resumeId, jobRole, companyName, jobDescription) => {
+    const formData = new FormData();
+    formData.append('resume_id', resumeId);
+    formData.append('job_role', jobRole);
+    formData.append('company_name', companyName);
+    if (jobDescription) {
+      formData.append('job_description', jobDescription);
+    }
+
+    const response = await api.post('/pipeline/run', formData, {
+      headers: {
+        'Content-Type': 'application/x-www-form-urlencoded',
+      },
+    });
+    return response.data;
+  },
+
+  // Streams stage results (Server-Sent Events) as they complete.
+  // onEvent is called with { stage, elapsed_ms, data, error } for each stage.
+  streamPipeline: async (resumeId, jobRole, companyName, jobDescription, onEvent, signal) => {
+    const formData = new FormData();
+    formData.append('resume_id', resumeId);
+    formData.append('job_role', jobRole);
+    formData.append('company_name', companyName);
+    if (jobDescription) {
+      formData.append('job_description', jobDescription);
+    }
+
+    const response = await fetch(`${API_BASE_URL}/pipeline/stream`, {
+      method: 'POST',
+      body: formData,
+      signal,
+    });
+    if (!response.ok) {
+      throw new Error(`Pipeline request failed with status ${response.status}`);
+    }
+
+    await readEventStream(response, onEvent);
+  },
+};
+
 // Document Services
 export const documentService = {
   generateDocuments: async (data) => {
@@ -85,6 +169,15 @@ export const documentService = {
     return response.data;
   },
 
+  // Stream generated text as it is produced. onEvent receives
+  // (data, eventName): "delta" events carry { text }, the final "done"
+  // event carries { content, file_path }, and "error" carries { message }.
+  streamOptimizedResume: (data, onEvent, signal) =>
+    postEventStream('/documents/generate/resume/stream', data, onEvent, signal),
+
+  streamCoverLetter: (data, onEvent, signal) =>
+    postEventStream('/documents/generate/cover-letter/stream', data, onEvent, signal),
+
   downloadDocument: async (filename) => {
     const response = await api.get(`/documents/download/${filename}`, {
       responseType: 'blob',
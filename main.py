@@ -6,13 +6,30 @@ FastAPI Backend with Google Gemini API Integration
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from api import resume, company, documents, analysis
+from contextlib import asynccontextmanager
+from api import resume, company, documents, analysis, pipeline, corpus, screening, jobs
+from services import gemini_service, document_service, pdf_service, text_cache, corpus_index, screening_service, job_queue, text_preprocessor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start up and tear down shared service resources"""
+    await screening_service.start()
+    await job_queue.start()
+    yield
+    await job_queue.shutdown()
+    await screening_service.shutdown()
+    gemini_service.shutdown()
+    document_service.shutdown()
+    pdf_service.shutdown()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Job Application Optimizer API",
     description="AI-powered job application optimization with ATS checking and document generation",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -22,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Result-ID"],
 )
 
 # Mount static file directories
@@ -32,6 +50,10 @@ app.include_router(resume.router, prefix="/api/resume", tags=["Resume"])
 app.include_router(company.router, prefix="/api/company", tags=["Company"])
 app.include_router(documents.router, prefix="/api/documents", tags=["Documents"])
 app.include_router(analysis.router, prefix="/api/analysis", tags=["Analysis"])
+app.include_router(pipeline.router, prefix="/api/pipeline", tags=["Pipeline"])
+app.include_router(corpus.router, prefix="/api/corpus", tags=["Corpus"])
+app.include_router(screening.router, prefix="/api/screening", tags=["Screening"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
 
 
 @app.get("/")
@@ -48,7 +70,17 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "job-optimizer-api"}
+    return {
+        "status": "healthy",
+        "service": "job-optimizer-api",
+        "gemini": gemini_service.get_stats(),
+        "pdf_extraction": pdf_service.get_stats(),
+        "text_cache": text_cache.get_stats(),
+        "text_compaction": text_preprocessor.get_stats(),
+        "corpus_index": corpus_index.get_stats(),
+        "screening": screening_service.get_stats(),
+        "job_queue": job_queue.get_stats()
+    }
 
 
 if __name__ == "__main__":
@@ -6,7 +6,19 @@ from .schemas import (
     CompanyResearchResponse,
     RecommendationsResponse,
     DocumentGenerationRequest,
-    DocumentGenerationResponse
+    DocumentGenerationResponse,
+    PipelineResponse,
+    CorpusMatch,
+    CorpusRankResponse,
+    BatchTarget,
+    BatchAnalysisRequest,
+    BatchTargetResult,
+    BatchAnalysisResponse,
+    ScreeningJobResponse,
+    ScreeningResult,
+    ScreeningResultsPage,
+    JobAcceptedResponse,
+    JobStatusResponse
 )
 
 __all__ = [
@@ -16,5 +28,17 @@ __all__ = [
     "CompanyResearchResponse",
     "RecommendationsResponse",
     "DocumentGenerationRequest",
-    "DocumentGenerationResponse"
+    "DocumentGenerationResponse",
+    "PipelineResponse",
+    "CorpusMatch",
+    "CorpusRankResponse",
+    "BatchTarget",
+    "BatchAnalysisRequest",
+    "BatchTargetResult",
+    "BatchAnalysisResponse",
+    "ScreeningJobResponse",
+    "ScreeningResult",
+    "ScreeningResultsPage",
+    "JobAcceptedResponse",
+    "JobStatusResponse"
 ]
@@ -3,7 +3,7 @@ Pydantic models for request and response validation
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class ResumeAnalysisRequest(BaseModel):
@@ -72,3 +72,119 @@ class DocumentGenerationResponse(BaseModel):
     cover_letter: str = Field(..., description="Cover letter content")
     resume_file_path: Optional[str] = Field(None, description="Path to resume file")
     cover_letter_file_path: Optional[str] = Field(None, description="Path to cover letter file")
+
+
+class PipelineResponse(BaseModel):
+    """Response model for the combined analysis pipeline"""
+    analysis: ResumeAnalysisResponse = Field(..., description="Resume analysis")
+    ats_score: ATSScoreResponse = Field(..., description="ATS compatibility analysis")
+    company_research: CompanyResearchResponse = Field(..., description="Company research")
+    recommendations: RecommendationsResponse = Field(..., description="Personalized recommendations")
+    timings_ms: Dict[str, float] = Field(default_factory=dict, description="Per-stage durations in milliseconds")
+    result_ids: Dict[str, str] = Field(default_factory=dict, description="Stored result ID of each stage")
+
+
+class CorpusMatch(BaseModel):
+    """A stored resume or job description ranked by similarity"""
+    id: str = Field(..., description="Resume ID or job ID")
+    label: str = Field("", description="Filename or job title")
+    job_role: Optional[str] = Field(None, description="Job role of a stored job description")
+    score: float = Field(..., description="Cosine similarity of term vectors (0-1)")
+    analysis: Optional[ResumeAnalysisResponse] = Field(None, description="LLM analysis, for the shortlisted top matches")
+    error: Optional[str] = Field(None, description="Why the analysis is missing, if it failed")
+
+
+class CorpusRankResponse(BaseModel):
+    """Response model for corpus ranking"""
+    query_id: Optional[str] = Field(None, description="ID of the resume or job description ranked against")
+    total_documents: int = Field(..., description="Documents searched")
+    matches: List[CorpusMatch] = Field(..., description="Best matches first")
+
+
+class BatchTarget(BaseModel):
+    """One job posting in a batch analysis"""
+    job_role: str = Field(..., description="Target job role/title")
+    company_name: Optional[str] = Field(None, description="Company name (enables company research)")
+    job_description: Optional[str] = Field(None, description="Job description (optional)")
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Request model for analyzing one resume against many job postings"""
+    resume_text: Optional[str] = Field(None, description="Full text of the resume")
+    resume_id: Optional[str] = Field(None, description="Resume ID from the upload endpoint, instead of resume_text")
+    targets: List[BatchTarget] = Field(..., min_length=1, description="Job postings to analyze against")
+
+
+class BatchTargetResult(BaseModel):
+    """Results of one batch target"""
+    index: int = Field(..., description="Position of the target in the request")
+    job_role: str = Field(..., description="Target job role/title")
+    company_name: Optional[str] = Field(None, description="Company name")
+    analysis: Optional[ResumeAnalysisResponse] = Field(None, description="Resume analysis")
+    ats_score: Optional[ATSScoreResponse] = Field(None, description="ATS compatibility analysis")
+    company_research: Optional[CompanyResearchResponse] = Field(None, description="Company research")
+    result_ids: Dict[str, str] = Field(default_factory=dict, description="Stored result ID of each stage")
+    errors: Dict[str, str] = Field(default_factory=dict, description="Error message of each failed stage")
+    elapsed_ms: float = Field(..., description="Time to finish this target in milliseconds")
+
+
+class BatchAnalysisResponse(BaseModel):
+    """Response model for batch analysis"""
+    results: List[BatchTargetResult] = Field(..., description="Per-target results in request order")
+    timings_ms: Dict[str, float] = Field(default_factory=dict, description="Batch durations in milliseconds")
+
+
+class ScreeningJobResponse(BaseModel):
+    """Status and progress of a bulk screening job"""
+    id: str = Field(..., description="Screening job ID")
+    job_role: str = Field(..., description="Target job role/title")
+    status: str = Field(..., description="queued, extracting, analyzing, completed or failed")
+    error: Optional[str] = Field(None, description="Why the job failed")
+    total: int = Field(..., description="Resumes in the job")
+    counts: Dict[str, int] = Field(..., description="Resumes per state: pending, scored, analyzed, failed")
+    shortlist_size: int = Field(..., description="Best local scores that get an LLM analysis")
+    created_at: float = Field(..., description="Creation time (Unix seconds)")
+    updated_at: float = Field(..., description="Last status change (Unix seconds)")
+
+
+class ScreeningResult(BaseModel):
+    """Screening result of one resume"""
+    idx: int = Field(..., description="Position of the resume in the upload")
+    filename: str = Field(..., description="Resume filename")
+    status: str = Field(..., description="pending, scored, analyzed or failed")
+    resume_id: Optional[str] = Field(None, description="Content-addressed resume ID")
+    keyword_match: Optional[int] = Field(None, description="Local keyword match percentage")
+    local_score: Optional[float] = Field(None, description="Local ATS score (0-100)")
+    llm_score: Optional[float] = Field(None, description="LLM overall score scaled to 0-100")
+    score: Optional[float] = Field(None, description="Ranking score: local score, averaged with the LLM score when analyzed")
+    analysis: Optional[ResumeAnalysisResponse] = Field(None, description="LLM analysis, for shortlisted resumes")
+    error: Optional[str] = Field(None, description="Extraction or analysis error")
+
+
+class ScreeningResultsPage(BaseModel):
+    """One page of screening results"""
+    job: ScreeningJobResponse = Field(..., description="Job status")
+    page: int = Field(..., description="Page number, starting at 1")
+    page_size: int = Field(..., description="Results per page")
+    results: List[ScreeningResult] = Field(..., description="Results, highest score first")
+
+
+class JobAcceptedResponse(BaseModel):
+    """A background job that was queued"""
+    job_id: str = Field(..., description="Background job ID")
+    status: str = Field(..., description="Job status, queued at submission")
+    status_url: str = Field(..., description="Where to poll the job status")
+    result_url: str = Field(..., description="Where to fetch the result once it has succeeded")
+
+
+class JobStatusResponse(BaseModel):
+    """Status of a background job"""
+    id: str = Field(..., description="Background job ID")
+    kind: str = Field(..., description="Job type, e.g. generate_documents")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    attempts: int = Field(..., description="Times a worker has started the job")
+    error: Optional[str] = Field(None, description="Why the job failed, or why its last attempt was put back")
+    created_at: float = Field(..., description="Submission time (Unix seconds)")
+    started_at: Optional[float] = Field(None, description="Last start time (Unix seconds)")
+    finished_at: Optional[float] = Field(None, description="Completion time (Unix seconds)")
+    run_after: Optional[float] = Field(None, description="Earliest time a put-back job runs again (Unix seconds)")
@@ -0,0 +1,91 @@
+"""
+PDF Extraction Worker
+Runs as a standalone extraction process (python pdf_worker.py). It imports
+nothing from the application, so a fresh worker starts in a fraction of a
+second.
+"""
+
+import io
+import mmap
+import pickle
+import struct
+import sys
+from typing import Any, BinaryIO, List, Optional, Tuple, Union
+
+from PyPDF2 import PdfReader
+
+
+def extract_pages(source: Union[bytes, str], start: int, end: Optional[int]) -> Tuple[int, List[str]]:
+    """
+    Extract text from a range of pages
+
+    Args:
+        source: PDF file as bytes, or a path to a PDF file (memory-mapped)
+        start: First page index
+        end: Page index to stop before, or None for the end of the document
+
+    Returns:
+        Total page count and the text of each page in the range
+    """
+    if isinstance(source, bytes):
+        return _extract_from_stream(io.BytesIO(source), start, end)
+
+    with open(source, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _extract_from_stream(mapped, start, end)
+
+
+def _extract_from_stream(stream, start: int, end: Optional[int]) -> Tuple[int, List[str]]:
+    pdf_reader = PdfReader(stream)
+    page_count = len(pdf_reader.pages)
+    end = page_count if end is None else min(end, page_count)
+    return page_count, [pdf_reader.pages[i].extract_text() for i in range(start, end)]
+
+
+def send_message(stream: BinaryIO, message: Any):
+    """Write one length-prefixed pickled message and flush it"""
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(struct.pack("!I", len(data)) + data)
+    stream.flush()
+
+
+def receive_message(stream: BinaryIO) -> Any:
+    """Read one length-prefixed pickled message; raises EOFError when the other side is gone"""
+    header = stream.read(4)
+    if len(header) < 4:
+        raise EOFError("pipe closed")
+    size = struct.unpack("!I", header)[0]
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError("pipe closed")
+    return pickle.loads(data)
+
+
+def serve(requests: BinaryIO, replies: BinaryIO):
+    """
+    Worker loop: extract page ranges received on one stream, reply on another
+
+    Each request is (source, start, end); the reply is ("ok", result) or
+    ("error", message). The loop ends when the parent closes the pipe.
+
+    Args:
+        requests: Stream the parent writes requests to
+        replies: Stream the parent reads replies from
+    """
+    while True:
+        try:
+            source, start, end = receive_message(requests)
+        except EOFError:
+            return
+        try:
+            reply = ("ok", extract_pages(source, start, end))
+        except Exception as e:
+            reply = ("error", str(e) or type(e).__name__)
+        send_message(replies, reply)
+
+
+if __name__ == "__main__":
+    replies = sys.stdout.buffer
+    # Keep stray prints from corrupting the reply stream
+    sys.stdout = sys.stderr
+    serve(sys.stdin.buffer, replies)
@@ -2,5 +2,37 @@
 from .gemini_service import gemini_service
 from .pdf_service import pdf_service
 from .document_service import document_service
+from .llm_cache import llm_cache
+from .company_research_store import company_research_store
+from .pipeline_service import pipeline_service
+from .session_service import session_store
+from .upload_service import upload_service
+from .text_cache import text_cache
+from .ats_scoring import ats_scorer
+from .skills_service import skills_extractor
+from .corpus_index import corpus_index
+from .screening_service import screening_service
+from .job_queue import job_queue
+from .text_service import text_preprocessor
+from .context_builder import context_builder
+from .resilience import rate_limiter
 
-__all__ = ["gemini_service", "pdf_service", "document_service"]
+__all__ = [
+    "gemini_service",
+    "pdf_service",
+    "document_service",
+    "llm_cache",
+    "company_research_store",
+    "pipeline_service",
+    "session_store",
+    "upload_service",
+    "text_cache",
+    "ats_scorer",
+    "skills_extractor",
+    "corpus_index",
+    "screening_service",
+    "job_queue",
+    "text_preprocessor",
+    "context_builder",
+    "rate_limiter"
+]
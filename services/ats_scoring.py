@@ -0,0 +1,338 @@
+"""
+ATS Keyword Scoring Service
+Local, deterministic keyword matching between a resume and a job description
+"""
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from services.skills_service import skills_extractor
+
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further had
+has have having he her here hers him his how i if in into is it its itself just me more most my no
+nor not now of off on once only or other our ours out over own per same she should so some such than
+that the their theirs them then there these they this those through to too under until up upon us
+very via was we were what when where which while who whom why will with within without would you
+your yours yourself e.g i.e including include includes across along among etc. like well
+""".split())
+
+# Words common to almost every job posting; they carry little signal and are down-weighted
+GENERIC_TERMS = frozenset("""
+ability able candidate candidates company experience experienced environment excellent good great
+help ideal job knowledge looking new opportunity plus preferred position required requirement
+responsibility responsible role skill strong team work working year years must need understanding
+related relevant demonstrated proven familiarity familiar using use used day based join make
+minimum qualification qualifications bonus nice highly successful solid
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-/][a-z0-9+#]+)*")
+
+GENERIC_WEIGHT = 0.25
+BIGRAM_BOOST = 1.5
+TOP_TERMS = 40
+MAX_MISSING_KEYWORDS = 15
+
+
+@lru_cache(maxsize=50000)
+def stem(token: str) -> str:
+    """
+    Reduce a token to a crude stem so inflected forms match
+
+    Tokens containing digits or symbols (python3, c++, node.js) are kept as-is.
+
+    Args:
+        token: Lowercased token
+
+    Returns:
+        Stemmed token
+    """
+    if len(token) <= 3 or not token.isalpha() or token.endswith(("ss", "is", "us")):
+        return token
+    for suffix, replacement in (
+        ("ational", "ate"), ("ization", "ize"), ("ments", ""), ("ment", ""), ("ings", ""),
+        ("ing", ""), ("ies", "y"), ("ied", "y"), ("ers", "er"), ("sses", "ss"), ("ed", ""), ("s", ""),
+    ):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[: len(token) - len(suffix)] + replacement
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercased word tokens
+
+    Args:
+        text: Raw text
+
+    Returns:
+        List of tokens, keeping technical forms such as c++, c# and node.js
+    """
+    return [token.rstrip(".-/") for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+_GENERIC_STEMS = frozenset(stem(term) for term in GENERIC_TERMS)
+
+
+class TextProfile:
+    """Term counts of a text with the most common surface form of each term"""
+
+    def __init__(self, text: str):
+        self.terms: Counter = Counter()
+        surfaces: Dict[str, Counter] = {}
+
+        previous: Optional[Tuple[str, str]] = None
+        for token in tokenize(text):
+            if token in STOPWORDS or token.isdigit() or len(token) < 2:
+                previous = None
+                continue
+            term = stem(token)
+            self.terms[term] += 1
+            surfaces.setdefault(term, Counter())[token] += 1
+            if previous is not None:
+                bigram = f"{previous[0]} {term}"
+                self.terms[bigram] += 1
+                surfaces.setdefault(bigram, Counter())[f"{previous[1]} {token}"] += 1
+            previous = (term, token)
+
+        self.surface = {term: forms.most_common(1)[0][0] for term, forms in surfaces.items()}
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.terms
+
+
+@lru_cache(maxsize=128)
+def text_features(text: str) -> Tuple[Tuple[str, ...], TextProfile]:
+    """
+    Extract the skills and term profile of a text, memoized
+
+    A resume checked against many job descriptions is tokenized once.
+
+    Args:
+        text: Resume or job description text
+
+    Returns:
+        Tuple of (canonical skills in order of mention, term profile of the
+        text with aliases replaced by canonical skill names)
+    """
+    canonical, skills = skills_extractor.canonicalize(text)
+    return tuple(skills), TextProfile(canonical)
+
+
+class ATSScorer:
+    """Scores resumes against job descriptions without calling the LLM"""
+
+    @staticmethod
+    def term_weight(term: str, count: int) -> float:
+        """
+        Weight a job description term, TF-IDF style
+
+        Term frequency is log-scaled; a fixed background model stands in for
+        inverse document frequency by down-weighting generic posting words.
+
+        Args:
+            term: Stemmed unigram or bigram
+            count: Occurrences in the job description
+
+        Returns:
+            Term weight
+        """
+        words = term.split(" ")
+        idf = 1.0
+        for word in words:
+            if word in _GENERIC_STEMS:
+                idf *= GENERIC_WEIGHT
+        if len(words) > 1:
+            idf *= BIGRAM_BOOST
+        return (1.0 + math.log(count)) * idf
+
+    def term_weights(self, text: str) -> Dict[str, float]:
+        """
+        Build a weighted term vector for similarity search
+
+        Args:
+            text: Resume or job description text
+
+        Returns:
+            Mapping of stemmed unigram/bigram to weight
+        """
+        _, profile = text_features(text)
+        return {term: self.term_weight(term, count) for term, count in profile.terms.items()}
+
+    def keyword_match(self, resume_text: str, job_description: str) -> Dict[str, Any]:
+        """
+        Compute the keyword overlap between a resume and a job description
+
+        Skill aliases are mapped to canonical names first, so "k8s" in the
+        resume matches "Kubernetes" in the job description. Taxonomy skills
+        the resume lacks lead the missing keywords.
+
+        Args:
+            resume_text: Full text of the resume
+            job_description: Job description
+
+        Returns:
+            Dictionary with keyword_match (0-100), ranked missing_keywords,
+            matched_keywords and missing_skills
+        """
+        resume_skills, resume_profile = text_features(resume_text)
+        job_skills, job_profile = text_features(job_description)
+
+        result = self.match_profiles(resume_profile, job_profile)
+
+        present = set(resume_skills)
+        missing_skills = [skill for skill in job_skills if skill not in present]
+        listed = {skill.lower() for skill in missing_skills}
+        skill_words = {word for skill in listed for word in skill.split(" ")}
+        result["missing_keywords"] = (missing_skills + [
+            keyword for keyword in result["missing_keywords"]
+            if keyword not in listed and keyword not in skill_words
+        ])[:MAX_MISSING_KEYWORDS]
+        result["missing_skills"] = missing_skills
+        return result
+
+    def match_profiles(self, resume: TextProfile, job: TextProfile) -> Dict[str, Any]:
+        """
+        Compute keyword overlap from prepared text profiles
+
+        Args:
+            resume: Profile of the resume
+            job: Profile of the job description
+
+        Returns:
+            Dictionary with keyword_match (0-100), ranked missing_keywords
+            and matched_keywords
+        """
+        # Stable sort, so equally weighted terms keep their order of appearance
+        weighted = sorted(
+            ((self.term_weight(term, count), term) for term, count in job.terms.items()
+             # Bigrams seen once are usually incidental word pairs
+             if " " not in term or count > 1),
+            key=lambda item: item[0],
+            reverse=True
+        )[:TOP_TERMS]
+
+        total = sum(weight for weight, _ in weighted)
+        if total == 0:
+            return {"keyword_match": 0, "missing_keywords": [], "matched_keywords": []}
+
+        matched_weight = 0.0
+        matched: List[str] = []
+        missing: List[str] = []
+        for weight, term in weighted:
+            if term in resume:
+                matched_weight += weight
+                matched.append(job.surface[term])
+            elif weight >= 1.0:
+                missing.append(job.surface[term])
+
+        # Drop single words already covered by a listed missing phrase
+        phrases = [keyword for keyword in missing if " " in keyword]
+        missing = [
+            keyword for keyword in missing
+            if " " in keyword or not any(keyword in phrase.split(" ") for phrase in phrases)
+        ]
+
+        return {
+            "keyword_match": round(100 * matched_weight / total),
+            "missing_keywords": missing[:MAX_MISSING_KEYWORDS],
+            "matched_keywords": matched,
+        }
+
+    @staticmethod
+    def formatting_checks(resume_text: str) -> Tuple[List[str], List[str]]:
+        """
+        Run local ATS formatting heuristics
+
+        Args:
+            resume_text: Full text of the resume
+
+        Returns:
+            Tuple of (formatting issues, formatting strengths)
+        """
+        issues: List[str] = []
+        strengths: List[str] = []
+        lowered = resume_text.lower()
+        word_count = len(resume_text.split())
+
+        if re.search(r"[\w.+-]+@[\w-]+\.[\w.]+", resume_text):
+            strengths.append("Email address is present and machine-readable")
+        else:
+            issues.append("No email address detected in the extracted text")
+
+        if re.search(r"\+?\d[\d\s().-]{7,}\d", resume_text):
+            strengths.append("Phone number is present and machine-readable")
+        else:
+            issues.append("No phone number detected in the extracted text")
+
+        sections = {
+            "experience": ("experience", "employment", "work history"),
+            "education": ("education", "academic"),
+            "skills": ("skills", "technologies", "competencies"),
+        }
+        found = [name for name, labels in sections.items() if any(label in lowered for label in labels)]
+        missing_sections = [name for name in sections if name not in found]
+        if missing_sections:
+            issues.append(f"No clearly labelled section for: {', '.join(missing_sections)}")
+        else:
+            strengths.append("Uses standard section headings (experience, education, skills)")
+
+        if word_count < 150:
+            issues.append("Very little text was extracted; the resume may be image-based or too brief")
+        elif word_count > 1200:
+            issues.append("Resume is long; consider trimming to the most relevant content")
+        else:
+            strengths.append("Resume length is within a typical range")
+
+        if resume_text.count("|") > 10 or resume_text.count("\t") > 10:
+            issues.append("Table or multi-column layout detected; ATS parsers may scramble it")
+
+        return issues, strengths
+
+    def local_report(self, resume_text: str, job_description: str = None) -> Dict[str, Any]:
+        """
+        Build a complete ATS report without calling the LLM
+
+        Args:
+            resume_text: Full text of the resume
+            job_description: Optional job description
+
+        Returns:
+            Dictionary matching ATSScoreResponse
+        """
+        issues, strengths = self.formatting_checks(resume_text)
+        formatting_score = max(0, 100 - 15 * len(issues))
+        recommendations: List[str] = []
+
+        if job_description:
+            match = self.keyword_match(resume_text, job_description)
+            ats_score = round(0.6 * match["keyword_match"] + 0.4 * formatting_score)
+            if match["missing_keywords"]:
+                recommendations.append(
+                    f"Add the most relevant missing keywords where truthful: {', '.join(match['missing_keywords'][:5])}"
+                )
+            if match["matched_keywords"]:
+                strengths.append(f"Matches key job terms: {', '.join(match['matched_keywords'][:5])}")
+        else:
+            match = {"keyword_match": 0, "missing_keywords": []}
+            ats_score = formatting_score
+            recommendations.append("Provide a job description to get keyword matching results")
+
+        recommendations.extend(f"Fix: {issue}" for issue in issues)
+
+        return {
+            "ats_score": ats_score,
+            "keyword_match": match["keyword_match"],
+            "formatting_issues": issues,
+            "missing_keywords": match["missing_keywords"],
+            "strengths": strengths,
+            "recommendations": recommendations,
+        }
+
+
+# Create singleton instance
+ats_scorer = ATSScorer()
@@ -0,0 +1,191 @@
+"""
+Company Research Store
+Caches company research by normalized company name
+"""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+from core.config import settings
+from models.schemas import CompanyResearchResponse
+from services.singleflight import SingleFlight
+
+
+# Legal-entity suffixes that do not change which company is meant
+COMPANY_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "llc", "llp",
+    "ltd", "limited", "plc", "gmbh", "ag", "sa", "bv", "nv", "pvt", "pty", "group",
+}
+
+
+def normalize_company_name(company_name: str) -> str:
+    """
+    Normalize a company name into a cache key
+
+    Args:
+        company_name: Company name as entered by the user
+
+    Returns:
+        Lowercased name without punctuation, legal suffixes or extra whitespace
+    """
+    name = company_name.lower().replace("&", " and ")
+    words = re.sub(r"[^\w\s]", " ", name).split()
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    if len(words) > 1 and words[0] == "the":
+        words.pop(0)
+    return " ".join(words)
+
+
+# Called with fresh=True when a stored entry has expired, so the fetch must
+# bypass any response cache that could hand back the same outdated payload
+FetchFn = Callable[[bool], Awaitable[Dict[str, Any]]]
+
+
+class CompanyResearchStore:
+    """Stale-while-revalidate store for company research payloads"""
+
+    def __init__(
+        self,
+        ttl_seconds: int = settings.COMPANY_CACHE_TTL_SECONDS,
+        stale_ttl_seconds: int = settings.COMPANY_CACHE_STALE_TTL_SECONDS,
+        max_entries: int = settings.COMPANY_CACHE_MAX_ENTRIES
+    ):
+        """
+        Initialize the store
+
+        Args:
+            ttl_seconds: Age after which an entry is refreshed
+            stale_ttl_seconds: Extra time a stale entry may still be served
+            max_entries: Maximum number of companies kept
+        """
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_failures = 0
+
+    async def get_or_fetch(self, company_name: str, fetch: FetchFn) -> Dict[str, Any]:
+        """
+        Return research for a company, fetching it only when needed
+
+        Fresh entries are returned directly. Stale entries are returned
+        immediately while a background refresh runs. Refreshes and misses on
+        an expired entry fetch fresh research; concurrent misses for the
+        same company share one upstream call.
+
+        Args:
+            company_name: Company name as entered by the user
+            fetch: Coroutine factory that researches the company upstream
+
+        Returns:
+            Company research payload
+        """
+        key = normalize_company_name(company_name)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            age = time.time() - entry[0]
+            if age < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if age < self.ttl_seconds + self.stale_ttl_seconds:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                self._refresh_in_background(key, fetch)
+                return entry[1]
+
+        self.misses += 1
+        # Only a company not stored at all may be served from the response cache
+        return await self._flight.do(key, lambda: self._load(key, fetch, entry is not None))
+
+    async def refresh(self, company_name: str, fetch: FetchFn) -> Dict[str, Any]:
+        """
+        Fetch research upstream and replace any stored entry
+
+        Args:
+            company_name: Company name as entered by the user
+            fetch: Coroutine factory that researches the company upstream
+
+        Returns:
+            Company research payload
+        """
+        key = normalize_company_name(company_name)
+        return await self._flight.do(key, lambda: self._load(key, fetch, True))
+
+    def get(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Peek at a stored entry without fetching
+
+        Args:
+            company_name: Company name as entered by the user
+
+        Returns:
+            Stored payload (fresh or stale), or None
+        """
+        entry = self._entries.get(normalize_company_name(company_name))
+        return entry[1] if entry else None
+
+    async def _load(self, key: str, fetch: FetchFn, fresh: bool) -> Dict[str, Any]:
+        """Fetch, validate and store one company's research"""
+        data = await fetch(fresh)
+        payload = CompanyResearchResponse(**data).model_dump()
+        self._entries[key] = (time.time(), payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return payload
+
+    def _refresh_in_background(self, key: str, fetch: FetchFn):
+        """Start a refresh for a stale entry unless one is already running"""
+        if self._flight.in_flight(key):
+            return
+        task = asyncio.create_task(self._background_refresh(key, fetch))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _background_refresh(self, key: str, fetch: FetchFn):
+        try:
+            await self._flight.do(key, lambda: self._load(key, fetch, True))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Keep serving the stale entry; the next request retries
+            self.refresh_failures += 1
+
+    def clear(self):
+        """Remove all stored entries"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics
+
+        Returns:
+            Dictionary with hit, stale-hit, miss and coalescing counters
+        """
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_ttl_seconds": self.stale_ttl_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refresh_failures": self.refresh_failures,
+            "upstream": self._flight.get_stats(),
+        }
+
+
+# Create singleton instance
+company_research_store = CompanyResearchStore()
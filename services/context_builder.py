@@ -0,0 +1,235 @@
+"""
+Prompt Context Builder
+Compact, prioritized summaries of earlier stage results for later prompts
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from core.config import settings
+from services.text_service import estimate_tokens
+
+
+# Most list items of one field rendered into a prompt
+MAX_ITEMS = 5
+# Longest rendering of one item, in characters
+MAX_ITEM_CHARS = 220
+
+# (section, label, source, key, priority); lower priority numbers are kept first.
+# Fields that rarely change a recommendation, such as ATS strengths and key
+# leadership, are not sent at all.
+Field = Tuple[str, str, str, str, int]
+
+RECOMMENDATIONS_FIELDS: Sequence[Field] = (
+    ("RESUME ANALYSIS", "Overall score (1-10)", "analysis", "overall_score", 1),
+    ("RESUME ANALYSIS", "Skills to emphasize", "analysis", "skills_to_emphasize", 1),
+    ("RESUME ANALYSIS", "Gaps", "analysis", "gaps_to_address", 1),
+    ("RESUME ANALYSIS", "Missing keywords", "analysis", "keywords_to_add", 2),
+    ("RESUME ANALYSIS", "Strengths", "analysis", "strengths", 2),
+    ("RESUME ANALYSIS", "Experience to highlight", "analysis", "experience_to_highlight", 3),
+    ("RESUME ANALYSIS", "Improvement areas", "analysis", "improvement_areas", 3),
+    ("ATS ANALYSIS", "ATS score (0-100)", "ats_score", "ats_score", 1),
+    ("ATS ANALYSIS", "Keyword match (%)", "ats_score", "keyword_match", 1),
+    ("ATS ANALYSIS", "Recommendations", "ats_score", "recommendations", 2),
+    ("ATS ANALYSIS", "Missing keywords", "ats_score", "missing_keywords", 3),
+    ("ATS ANALYSIS", "Formatting issues", "ats_score", "formatting_issues", 4),
+    ("COMPANY RESEARCH", "Overview", "company_research", "company_overview", 1),
+    ("COMPANY RESEARCH", "Mission and values", "company_research", "mission_and_values", 1),
+    ("COMPANY RESEARCH", "Culture", "company_research", "culture", 2),
+    ("COMPANY RESEARCH", "Opportunities", "company_research", "opportunities", 3),
+    ("COMPANY RESEARCH", "Challenges", "company_research", "challenges", 3),
+    ("COMPANY RESEARCH", "Industry position", "company_research", "industry_position", 4),
+    ("COMPANY RESEARCH", "Recent news", "company_research", "recent_news", 4),
+)
+
+RESUME_INSIGHTS_FIELDS: Sequence[Field] = (
+    ("ANALYSIS INSIGHTS", "Skills to emphasize", "analysis", "skills_to_emphasize", 1),
+    ("ANALYSIS INSIGHTS", "Keywords to add", "analysis", "keywords_to_add", 1),
+    ("ANALYSIS INSIGHTS", "ATS recommendations", "ats_score", "recommendations", 2),
+)
+
+COVER_LETTER_FIELDS: Sequence[Field] = (
+    ("KEY INFORMATION", "Company values", "company_research", "mission_and_values", 1),
+    ("KEY INFORMATION", "Talking points", "recommendations", "cover_letter_talking_points", 1),
+    ("KEY INFORMATION", "Cultural fit", "recommendations", "cultural_fit", 2),
+)
+
+# Findings of one chunk of a long resume; the section is set per chunk
+CHUNK_FINDINGS_FIELDS: Sequence[Field] = (
+    ("", "Part score (1-10)", "findings", "overall_score", 1),
+    ("", "Experience to highlight", "findings", "experience_to_highlight", 1),
+    ("", "Skills to emphasize", "findings", "skills_to_emphasize", 1),
+    ("", "Strengths", "findings", "strengths", 2),
+    ("", "Gaps", "findings", "gaps_to_address", 2),
+    ("", "Improvement areas", "findings", "improvement_areas", 3),
+)
+
+
+def _clip(value: Any) -> str:
+    """Render one value on a single line, clipped at a word boundary"""
+    text = " ".join(str(value).split())
+    if len(text) <= MAX_ITEM_CHARS:
+        return text
+    return text[:MAX_ITEM_CHARS].rsplit(" ", 1)[0] + "..."
+
+
+def _list_items(value: Sequence[Any], seen: set) -> List[str]:
+    """Clipped list items, without blanks and items already rendered"""
+    items = []
+    for item in value:
+        text = _clip(item)
+        if text and text.lower() not in seen:
+            seen = seen | {text.lower()}
+            items.append(text)
+    return items
+
+
+def _render(label: str, value: Any, items: int, seen: set) -> Optional[str]:
+    """Render a field as "- Label: a; b; c" with at most `items` new list items"""
+    if isinstance(value, (list, tuple)):
+        values = _list_items(value, seen)[:items]
+        if not values:
+            return None
+        return f"- {label}: {'; '.join(values)}"
+    if value is None or str(value).strip() == "":
+        return None
+    return f"- {label}: {_clip(value)}"
+
+
+class ContextBuilder:
+    """Summarizes stage outputs into prompt context under a token budget"""
+
+    def build(self, fields: Sequence[Field], sources: Dict[str, Dict[str, Any]], max_tokens: int) -> str:
+        """
+        Render the most important fields of the sources within a token budget
+
+        Fields are admitted in priority order, each with up to MAX_ITEMS
+        list items and fewer when the budget runs short; fields that do not
+        fit even with one item are left out, as are items an earlier field
+        already listed. Admitted fields keep their declared order, grouped
+        under their section headings.
+
+        Args:
+            fields: Field declarations (section, label, source, key, priority)
+            sources: Stage outputs by source name; missing sources are skipped
+            max_tokens: Token budget for the rendered context
+
+        Returns:
+            Context text
+        """
+        remaining = max_tokens
+        admitted: Dict[int, str] = {}
+        sections_used = set()
+        # Items already rendered; stages often repeat each other's list items
+        seen: set = set()
+
+        order = sorted(range(len(fields)), key=lambda index: fields[index][4])
+        for index in order:
+            section, label, source, key, _ = fields[index]
+            value = (sources.get(source) or {}).get(key)
+            heading_cost = 0 if section in sections_used else estimate_tokens(section) + 2
+
+            for items in range(MAX_ITEMS, 0, -1):
+                line = _render(label, value, items, seen)
+                if line is None:
+                    break
+                cost = estimate_tokens(line) + 1 + heading_cost
+                if cost <= remaining:
+                    admitted[index] = line
+                    sections_used.add(section)
+                    remaining -= cost
+                    if isinstance(value, (list, tuple)):
+                        seen.update(item.lower() for item in _list_items(value, seen)[:items])
+                    break
+                if not isinstance(value, (list, tuple)):
+                    break
+
+        blocks: List[str] = []
+        current = None
+        for index in sorted(admitted):
+            section = fields[index][0]
+            if section != current:
+                if blocks:
+                    blocks.append("")
+                blocks.append(f"{section}:")
+                current = section
+            blocks.append(admitted[index])
+        return "\n".join(blocks)
+
+    def recommendations_context(
+        self,
+        analysis: Dict[str, Any],
+        ats_score: Dict[str, Any],
+        company_research: Dict[str, Any]
+    ) -> str:
+        """
+        Summarize the analysis stages for the recommendations prompt
+
+        Args:
+            analysis: Resume analysis data
+            ats_score: ATS score data
+            company_research: Company research data
+
+        Returns:
+            Context text within PROMPT_CONTEXT_TOKEN_BUDGET
+        """
+        return self.build(
+            RECOMMENDATIONS_FIELDS,
+            {"analysis": analysis, "ats_score": ats_score, "company_research": company_research},
+            settings.PROMPT_CONTEXT_TOKEN_BUDGET
+        )
+
+    def resume_insights(self, analysis: Dict[str, Any], ats_score: Dict[str, Any]) -> str:
+        """
+        Summarize the analysis for the resume rewriting prompt
+
+        Args:
+            analysis: Resume analysis data
+            ats_score: ATS score data
+
+        Returns:
+            Context text within PROMPT_INSIGHTS_TOKEN_BUDGET
+        """
+        return self.build(
+            RESUME_INSIGHTS_FIELDS,
+            {"analysis": analysis, "ats_score": ats_score},
+            settings.PROMPT_INSIGHTS_TOKEN_BUDGET
+        )
+
+    def cover_letter_context(self, company_research: Dict[str, Any], recommendations: Dict[str, Any]) -> str:
+        """
+        Summarize company research and recommendations for the cover letter prompt
+
+        Args:
+            company_research: Company research data
+            recommendations: Recommendations data
+
+        Returns:
+            Context text within PROMPT_INSIGHTS_TOKEN_BUDGET
+        """
+        return self.build(
+            COVER_LETTER_FIELDS,
+            {"company_research": company_research, "recommendations": recommendations},
+            settings.PROMPT_INSIGHTS_TOKEN_BUDGET
+        )
+
+    def chunk_findings(self, findings: Dict[str, Any], part: int, parts: int, max_tokens: int) -> str:
+        """
+        Summarize the analysis of one chunk of a long resume for the merge prompt
+
+        Args:
+            findings: Analysis data of the chunk
+            part: 1-based position of the chunk
+            parts: Number of chunks
+            max_tokens: Token budget for this chunk's findings
+
+        Returns:
+            Context text under a "PART i OF n" heading
+        """
+        fields = tuple(
+            (f"PART {part} OF {parts}", label, source, key, priority)
+            for _, label, source, key, priority in CHUNK_FINDINGS_FIELDS
+        )
+        return self.build(fields, {"findings": findings}, max_tokens)
+
+
+# Create singleton instance
+context_builder = ContextBuilder()
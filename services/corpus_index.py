@@ -0,0 +1,352 @@
+"""
+Corpus Index Service
+Memory-mapped sparse term vectors of stored resumes and job descriptions
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from core.config import settings
+from services.ats_scoring import ats_scorer
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within one process
+    fcntl = None
+
+
+KINDS = ("resume", "job")
+
+
+def job_id_for(job_description: str) -> str:
+    """
+    Derive a stable ID for a job description
+
+    Args:
+        job_description: Job description text
+
+    Returns:
+        Hex SHA-256 of the whitespace-normalized text
+    """
+    return hashlib.sha256(" ".join(job_description.split()).encode("utf-8")).hexdigest()
+
+
+def _public(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip storage bookkeeping from a stored document"""
+    return {key: value for key, value in doc.items() if not key.startswith("text_")}
+
+
+class _Shard:
+    """
+    Append-only CSR matrix of one document kind
+
+    Rows live in three flat files: indices (int32 hashed term columns), data
+    (float32 L2-normalized weights) and indptr (int64 row end offsets).
+    indptr is written last, so its length is the committed row count. Row
+    metadata is kept in docs.jsonl in the same order and document text in
+    texts.bin, read back only on demand.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._indices_path = os.path.join(directory, "indices.i32")
+        self._data_path = os.path.join(directory, "data.f32")
+        self._indptr_path = os.path.join(directory, "indptr.i64")
+        self._docs_path = os.path.join(directory, "docs.jsonl")
+        self._texts_path = os.path.join(directory, "texts.bin")
+        self._lock_path = os.path.join(directory, ".lock")
+
+        self._lock = threading.RLock()
+        self.docs: List[Dict[str, Any]] = []
+        self.positions: Dict[str, int] = {}
+        self._docs_offset = 0
+        self._mapped_rows = -1
+        self._indices: Optional[np.ndarray] = None
+        self._data: Optional[np.ndarray] = None
+        self._ends: Optional[np.ndarray] = None
+
+    def _committed_rows(self) -> int:
+        try:
+            return os.path.getsize(self._indptr_path) // 8
+        except FileNotFoundError:
+            return 0
+
+    def refresh(self):
+        """Pick up rows appended since the last call, including by other processes"""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        rows = self._committed_rows()
+        if rows == self._mapped_rows:
+            return
+
+        if rows > len(self.docs):
+            with open(self._docs_path, "rb") as file:
+                file.seek(self._docs_offset)
+                while len(self.docs) < rows:
+                    line = file.readline()
+                    doc = json.loads(line)
+                    self.positions[doc["id"]] = len(self.docs)
+                    self.docs.append(doc)
+                self._docs_offset = file.tell()
+
+        if rows == 0:
+            self._indices = np.zeros(0, dtype=np.int32)
+            self._data = np.zeros(0, dtype=np.float32)
+            self._ends = np.zeros(0, dtype=np.int64)
+        else:
+            self._ends = np.memmap(self._indptr_path, dtype=np.int64, mode="r", shape=(rows,))
+            nnz = int(self._ends[-1])
+            if nnz:
+                self._indices = np.memmap(self._indices_path, dtype=np.int32, mode="r", shape=(nnz,))
+                self._data = np.memmap(self._data_path, dtype=np.float32, mode="r", shape=(nnz,))
+            else:
+                self._indices = np.zeros(0, dtype=np.int32)
+                self._data = np.zeros(0, dtype=np.float32)
+        self._mapped_rows = rows
+
+    def read_text(self, doc: Dict[str, Any]) -> str:
+        """Read a document's text from texts.bin"""
+        with open(self._texts_path, "rb") as file:
+            file.seek(doc["text_offset"])
+            return file.read(doc["text_length"]).decode("utf-8")
+
+    def append(self, doc: Dict[str, Any], text: str, columns: np.ndarray, weights: np.ndarray) -> bool:
+        """
+        Append one row unless its ID is already stored
+
+        Returns:
+            True if the row was added
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self.refresh()
+            if doc["id"] in self.positions:
+                return False
+
+            end = int(self._ends[-1]) if len(self._ends) else 0
+            # Drop anything a writer that died before committing left behind
+            for path, size in ((self._indices_path, end * 4), (self._data_path, end * 4),
+                               (self._docs_path, self._docs_offset)):
+                if os.path.exists(path) and os.path.getsize(path) > size:
+                    os.truncate(path, size)
+
+            encoded = text.encode("utf-8")
+            with open(self._texts_path, "ab") as file:
+                doc = {**doc, "text_offset": file.tell(), "text_length": len(encoded)}
+                file.write(encoded)
+            with open(self._indices_path, "ab") as file:
+                columns.astype(np.int32).tofile(file)
+            with open(self._data_path, "ab") as file:
+                weights.astype(np.float32).tofile(file)
+            with open(self._docs_path, "ab") as file:
+                file.write((json.dumps(doc) + "\n").encode("utf-8"))
+            # Committing the row end offset last makes the row visible to readers
+            with open(self._indptr_path, "ab") as file:
+                np.array([end + len(columns)], dtype=np.int64).tofile(file)
+
+            self.refresh()
+            return True
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of every row against a dense query vector
+
+        Args:
+            query: Dense L2-normalized query vector
+
+        Returns:
+            One score per row
+        """
+        with self._lock:
+            self._refresh()
+            data, indices, ends = self._data, self._indices, np.asarray(self._ends)
+        if len(ends) == 0:
+            return np.zeros(0, dtype=np.float64)
+        products = np.cumsum(data * query[indices], dtype=np.float64)
+        totals = np.concatenate(([0.0], products))
+        starts = np.concatenate(([0], ends[:-1]))
+        return totals[ends] - totals[starts]
+
+
+class CorpusIndex:
+    """Ranks resumes against job descriptions and vice versa by vector similarity"""
+
+    def __init__(
+        self,
+        directory: str = settings.CORPUS_INDEX_DIR,
+        dimensions: int = settings.CORPUS_HASH_DIMENSIONS
+    ):
+        """
+        Initialize the index
+
+        Args:
+            directory: Directory holding one shard per document kind
+            dimensions: Size of the hashed feature space
+        """
+        self.directory = directory
+        self.dimensions = dimensions
+        self._shards = {kind: _Shard(os.path.join(directory, kind)) for kind in KINDS}
+        self.queries = 0
+
+    def _shard(self, kind: str) -> _Shard:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown document kind: {kind}")
+        return self._shards[kind]
+
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hash a text's weighted terms into a sparse, L2-normalized vector
+
+        Args:
+            text: Resume or job description text
+
+        Returns:
+            Tuple of (sorted column indices, weights)
+        """
+        buckets: Dict[int, float] = {}
+        for term, weight in ats_scorer.term_weights(text).items():
+            column = zlib.crc32(term.encode("utf-8")) % self.dimensions
+            buckets[column] = buckets.get(column, 0.0) + weight
+
+        columns = np.fromiter(sorted(buckets), dtype=np.int32, count=len(buckets))
+        weights = np.array([buckets[int(column)] for column in columns], dtype=np.float32)
+        norm = float(np.linalg.norm(weights))
+        if norm:
+            weights /= norm
+        return columns, weights
+
+    def _add(self, kind: str, doc_id: str, text: str, label: str, metadata: Dict[str, Any]) -> bool:
+        columns, weights = self.vectorize(text)
+        doc = {"id": doc_id, "label": label, "added_at": time.time(), **metadata}
+        return self._shard(kind).append(doc, text, columns, weights)
+
+    async def add(
+        self,
+        kind: str,
+        doc_id: str,
+        text: str,
+        label: str = "",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Index a document; documents already indexed under the same ID are skipped
+
+        Args:
+            kind: "resume" or "job"
+            doc_id: Stable document ID (resume content hash or job_id_for())
+            text: Document text
+            label: Display name such as a filename or job title
+            metadata: Extra fields stored with the document
+
+        Returns:
+            True if the document was added
+        """
+        return await asyncio.to_thread(self._add, kind, doc_id, text, label, metadata or {})
+
+    def _count(self, kind: str) -> int:
+        shard = self._shard(kind)
+        shard.refresh()
+        return len(shard.docs)
+
+    async def count(self, kind: str) -> int:
+        """
+        Count indexed documents of a kind, including those added by other processes
+
+        Args:
+            kind: "resume" or "job"
+
+        Returns:
+            Number of indexed documents
+        """
+        return await asyncio.to_thread(self._count, kind)
+
+    def _get(self, kind: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        shard = self._shard(kind)
+        shard.refresh()
+        position = shard.positions.get(doc_id)
+        if position is None:
+            return None
+        doc = shard.docs[position]
+        return {**_public(doc), "text": shard.read_text(doc)}
+
+    async def get(self, kind: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored document with its text
+
+        Args:
+            kind: "resume" or "job"
+            doc_id: Document ID
+
+        Returns:
+            Stored document, or None if it is not indexed
+        """
+        return await asyncio.to_thread(self._get, kind, doc_id)
+
+    def _rank(self, kind: str, text: str, top_k: int, exclude: Optional[str]) -> List[Dict[str, Any]]:
+        columns, weights = self.vectorize(text)
+        query = np.zeros(self.dimensions, dtype=np.float32)
+        query[columns] = weights
+
+        shard = self._shard(kind)
+        scores = shard.scores(query)
+        self.queries += 1
+        if len(scores) == 0:
+            return []
+
+        count = min(top_k + (1 if exclude else 0), len(scores))
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        matches = []
+        for row in top:
+            doc = shard.docs[int(row)]
+            if doc["id"] == exclude:
+                continue
+            match = _public(doc)
+            match["score"] = round(float(scores[row]), 4)
+            matches.append(match)
+        return matches[:top_k]
+
+    async def rank(self, kind: str, text: str, top_k: int = 10, exclude: str = None) -> List[Dict[str, Any]]:
+        """
+        Find the stored documents of a kind most similar to a text
+
+        Args:
+            kind: Kind of document to rank ("resume" or "job")
+            text: Query text, a job description or a resume
+            top_k: Number of matches to return
+            exclude: Document ID to leave out of the results
+
+        Returns:
+            Stored document metadata with a cosine similarity score, best first
+        """
+        return await asyncio.to_thread(self._rank, kind, text, top_k, exclude)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics
+
+        Counts are those of the last refresh (every add, rank and count
+        refreshes), so this never reads the index files.
+
+        Returns:
+            Dictionary with document counts per kind and query count
+        """
+        stats: Dict[str, Any] = {"dimensions": self.dimensions, "queries": self.queries}
+        for kind in KINDS:
+            stats[f"{kind}s"] = len(self._shard(kind).docs)
+        return stats
+
+
+# Create singleton instance
+corpus_index = CorpusIndex()
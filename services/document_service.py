@@ -6,13 +6,62 @@ Creates Word documents (.docx) for resume and cover letter
 from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from concurrent.futures import ThreadPoolExecutor
+from core.config import settings
+import asyncio
 import os
+import uuid
 from datetime import datetime
 
 
 class DocumentService:
     """Service for generating Word documents"""
     
+    def __init__(self):
+        """Initialize the worker pool used for rendering documents"""
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.DOCUMENT_RENDER_WORKERS,
+            thread_name_prefix="docx"
+        )
+    
+    def shutdown(self):
+        """Release the document rendering threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def render_resume_docx(self, content: str, company_name: str, output_dir: str = "outputs") -> str:
+        """
+        Create the resume Word document on the worker pool
+        
+        Args:
+            content: Resume text content
+            company_name: Name of the company
+            output_dir: Directory to save the file
+            
+        Returns:
+            Path to the generated file
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.create_resume_docx, content, company_name, output_dir
+        )
+    
+    async def render_cover_letter_docx(self, content: str, company_name: str, output_dir: str = "outputs") -> str:
+        """
+        Create the cover letter Word document on the worker pool
+        
+        Args:
+            content: Cover letter text content
+            company_name: Name of the company
+            output_dir: Directory to save the file
+            
+        Returns:
+            Path to the generated file
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.create_cover_letter_docx, content, company_name, output_dir
+        )
+    
     @staticmethod
     def create_resume_docx(content: str, company_name: str, output_dir: str = "outputs") -> str:
         """
@@ -65,8 +114,9 @@ class DocumentService:
                             run.font.size = Pt(11)
             
             # Generate filename
+            # The random suffix keeps concurrent generations for the same company apart
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{company_name.replace(' ', '_')}_Optimized_Resume_{timestamp}.docx"
+            filename = f"{company_name.replace(' ', '_')}_Optimized_Resume_{timestamp}_{uuid.uuid4().hex[:12]}.docx"
             filepath = os.path.join(output_dir, filename)
             
             # Ensure output directory exists
@@ -118,8 +168,9 @@ class DocumentService:
                         run.font.name = 'Calibri'
             
             # Generate filename
+            # The random suffix keeps concurrent generations for the same company apart
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{company_name.replace(' ', '_')}_Cover_Letter_{timestamp}.docx"
+            filename = f"{company_name.replace(' ', '_')}_Cover_Letter_{timestamp}_{uuid.uuid4().hex[:12]}.docx"
             filepath = os.path.join(output_dir, filename)
             
             # Ensure output directory exists
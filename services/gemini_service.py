@@ -4,10 +4,57 @@ Handles all AI model interactions
 """
 
 import google.generativeai as genai
-import json
-import re
-from typing import Dict, Any
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Any, Tuple, Type
+from pydantic import BaseModel, create_model
 from core.config import settings
+from models.schemas import (
+    ResumeAnalysisResponse,
+    ATSScoreResponse,
+    CompanyResearchResponse,
+    RecommendationsResponse
+)
+from services.llm_cache import llm_cache, prompt_fingerprint
+from services.company_research_store import company_research_store
+from services.singleflight import SingleFlight
+from services.ats_scoring import ats_scorer, text_features
+from services.text_service import estimate_tokens, text_preprocessor
+from services.context_builder import context_builder
+from services.structured_output import parse_response, partial_model, response_schema, schema_fingerprint
+from services.resilience import CircuitBreaker, backoff_delay, is_retryable, rate_limiter
+
+
+# Combined analyses whose ATS half is kept for a following ATS check, for up to LLM_CACHE_TTL_SECONDS
+COMBINED_MEMO_SIZE = 256
+
+# Fields of each response that are computed locally when a job description is given
+LOCAL_ANALYSIS_FIELDS = ("keywords_to_add",)
+LOCAL_ATS_FIELDS = ("keyword_match", "missing_keywords")
+
+
+class GeminiUnavailableError(Exception):
+    """Raised when Gemini calls are refused or keep failing; retry after `retry_after` seconds"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = max(math.ceil(retry_after), 1)
+
+
+@lru_cache(maxsize=None)
+def _combined_model(analysis_exclude: Tuple[str, ...], ats_exclude: Tuple[str, ...]) -> Type[BaseModel]:
+    """Response model of the combined analysis and ATS call"""
+    return create_model(
+        "AnalysisAndATS",
+        analysis=(partial_model(ResumeAnalysisResponse, analysis_exclude), ...),
+        ats=(partial_model(ATSScoreResponse, ats_exclude), ...)
+    )
 
 
 class GeminiService:
@@ -18,77 +65,495 @@ class GeminiService:
         genai.configure(api_key=settings.GEMINI_API_KEY)
         self.model = genai.GenerativeModel(settings.GEMINI_MODEL)
         
-    async def generate_content(self, prompt: str, temperature: float = None) -> str:
+        # The google-generativeai client is blocking, so calls run on a
+        # dedicated thread pool and are bounded by a process-wide semaphore
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.GEMINI_EXECUTOR_WORKERS,
+            thread_name_prefix="gemini"
+        )
+        self._semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+        # Identical prompts already in flight share one upstream call
+        self._inflight = SingleFlight()
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._retries = 0
+        # Fails fast while Gemini keeps rate limiting or erroring
+        self._breaker = CircuitBreaker()
+        self._json_repairs = 0
+        self._json_retries = 0
+        # Recent combined analyses: resume + job description key -> (started at, ATS half)
+        self._combined_ats: "OrderedDict[str, Tuple[float, asyncio.Future]]" = OrderedDict()
+        self._combined_calls = 0
+        self._combined_hits = 0
+        self._long_analyses = 0
+        self._long_chunks = 0
+        self._section_rewrites = 0
+        self._sections_rewritten = 0
+        self._section_retries = 0
+        
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get concurrency and queue-depth statistics
+        
+        Returns:
+            Dictionary with pool limits and current counters
+        """
+        return {
+            "max_concurrency": settings.GEMINI_MAX_CONCURRENCY,
+            "executor_workers": settings.GEMINI_EXECUTOR_WORKERS,
+            "request_timeout": settings.GEMINI_REQUEST_TIMEOUT,
+            "in_flight": self._in_flight,
+            "queue_depth": self._waiting,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "retries": self._retries,
+            "rate_limiter": rate_limiter.get_stats(),
+            "circuit_breaker": self._breaker.get_stats(),
+            "structured_output": {"repaired": self._json_repairs, "re_requested": self._json_retries},
+            "coalescing": self._inflight.get_stats(),
+            "combined_analysis": {"calls": self._combined_calls, "ats_served": self._combined_hits},
+            "long_resumes": {"analyses": self._long_analyses, "chunks": self._long_chunks},
+            "section_rewrites": {
+                "resumes": self._section_rewrites,
+                "sections": self._sections_rewritten,
+                "retried": self._section_retries,
+            },
+            "cache": llm_cache.get_stats(),
+            "company_research": company_research_store.get_stats(),
+        }
+    
+    def shutdown(self):
+        """Release the worker threads used for Gemini calls"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        
+    def _cache_key(self, prompt: str, temperature: float, response_model: Type[BaseModel] = None) -> str:
+        """Fingerprint a request, including any response schema, for the response cache"""
+        if response_model is not None and settings.GEMINI_STRUCTURED_OUTPUT:
+            prompt = f"{prompt}\0{schema_fingerprint(response_model)}"
+        return prompt_fingerprint(
+            settings.GEMINI_MODEL, temperature, settings.GEMINI_MAX_TOKENS, prompt
+        )
+        
+    async def generate_content(
+        self,
+        prompt: str,
+        temperature: float = None,
+        timeout: float = None,
+        use_cache: bool = True,
+        response_model: Type[BaseModel] = None
+    ) -> str:
         """
         Generate content using Gemini API
         
+        Concurrent calls with the same prompt fingerprint await one shared
+        request, which is cancelled only when all of its callers are. With
+        use_cache=False the call neither reads nor writes the cache and
+        always makes its own request.
+        
         Args:
             prompt: The prompt to send to Gemini
             temperature: Temperature for generation (0.0-1.0)
+            timeout: Per-call timeout in seconds (defaults to GEMINI_REQUEST_TIMEOUT)
+            use_cache: Serve from and store into the response cache
+            response_model: Constrain the output to JSON matching this model
             
         Returns:
             Generated text response
         """
+        temperature = temperature or settings.GEMINI_TEMPERATURE
+        cache_key = self._cache_key(prompt, temperature, response_model)
+        
+        if not use_cache:
+            llm_cache.record_bypass()
+            return await self._call_model(prompt, temperature, timeout, response_model)
+        
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        return await self._inflight.do(
+            cache_key,
+            lambda: self._generate_and_cache(cache_key, prompt, temperature, timeout, response_model)
+        )
+    
+    async def _generate_and_cache(
+        self,
+        cache_key: str,
+        prompt: str,
+        temperature: float,
+        timeout: float = None,
+        response_model: Type[BaseModel] = None
+    ) -> str:
+        """Call Gemini and store the response under its fingerprint"""
+        text = await self._call_model(prompt, temperature, timeout, response_model)
+        await llm_cache.set(cache_key, text)
+        return text
+    
+    async def _admit(self, prompt: str):
+        """
+        Wait until the circuit breaker and the shared rate limiter let a call through
+        
+        Args:
+            prompt: The prompt about to be sent, for the token quota
+        """
+        retry_after = self._breaker.retry_after()
+        if retry_after > 0:
+            raise GeminiUnavailableError("Gemini is temporarily unavailable, please retry shortly", retry_after)
+        
+        cost = estimate_tokens(prompt)
+        waited = 0.0
         try:
-            generation_config = genai.GenerationConfig(
-                temperature=temperature or settings.GEMINI_TEMPERATURE,
-                max_output_tokens=settings.GEMINI_MAX_TOKENS,
-            )
+            while True:
+                wait = await rate_limiter.reserve(cost)
+                if wait <= 0:
+                    return
+                if waited + wait > settings.GEMINI_RATE_LIMIT_MAX_WAIT:
+                    raise GeminiUnavailableError("Gemini rate limit reached, please retry shortly", wait)
+                await asyncio.sleep(wait)
+                waited += wait
+        except BaseException:
+            # The call never reached Gemini; a half-open breaker needs another trial
+            self._breaker.release_probe()
+            raise
+    
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """
+        Record a failed attempt and decide whether to retry it
+        
+        Args:
+            error: Exception raised by the client library
+            attempt: 0-based number of the failed attempt
+            
+        Returns:
+            Seconds to wait before retrying
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config
+        Raises:
+            Exception: The error is not retryable
+            GeminiUnavailableError: Retries are used up
+        """
+        if not is_retryable(error):
+            # Upstream answered; it refused this request
+            self._breaker.record_success()
+            self._failed += 1
+            raise Exception(f"Gemini API error: {str(error)}")
+        
+        self._breaker.record_failure()
+        if attempt >= settings.GEMINI_MAX_RETRIES:
+            self._failed += 1
+            raise GeminiUnavailableError(
+                f"Gemini API unavailable after {attempt + 1} attempts: {str(error)}",
+                settings.GEMINI_BACKOFF_MAX
             )
+        self._retries += 1
+        return backoff_delay(attempt)
+    
+    async def _call_model(
+        self,
+        prompt: str,
+        temperature: float,
+        timeout: float = None,
+        response_model: Type[BaseModel] = None
+    ) -> str:
+        """
+        Run one Gemini request on the worker pool
+        
+        Rate limited (429) and server-side (5xx) errors are retried with
+        exponential backoff and jitter. Every attempt first passes the
+        circuit breaker and the shared RPM/TPM limiter.
+        
+        Args:
+            prompt: The prompt to send to Gemini
+            temperature: Temperature for generation (0.0-1.0)
+            timeout: Per-attempt timeout in seconds (defaults to GEMINI_REQUEST_TIMEOUT)
+            response_model: Constrain the output to JSON matching this model
             
+        Returns:
+            Generated text response
+            
+        Raises:
+            GeminiUnavailableError: Gemini is unhealthy, out of quota or timed out
+        """
+        timeout = timeout or settings.GEMINI_REQUEST_TIMEOUT
+        structured = {}
+        if response_model is not None and settings.GEMINI_STRUCTURED_OUTPUT:
+            structured = {
+                "response_mime_type": "application/json",
+                "response_schema": response_schema(response_model),
+            }
+        generation_config = genai.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=settings.GEMINI_MAX_TOKENS,
+            **structured
+        )
+        
+        attempt = 0
+        while True:
+            await self._admit(prompt)
+            try:
+                text = await self._attempt(prompt, generation_config, timeout)
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                self._breaker.record_failure()
+                raise GeminiUnavailableError(
+                    f"Gemini API timed out after {timeout:g}s", settings.GEMINI_BACKOFF_MAX
+                )
+            except asyncio.CancelledError:
+                self._breaker.release_probe()
+                raise
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            
+            self._breaker.record_success()
+            self._completed += 1
+            return text
+    
+    async def _attempt(self, prompt: str, generation_config: genai.GenerationConfig, timeout: float) -> str:
+        """Make one Gemini call once a concurrency slot is free; errors are raised as is"""
+        self._waiting += 1
+        started = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        
+        self._in_flight += 1
+        try:
+            # Time spent queued for a slot counts against the call's budget
+            remaining = max(timeout - (time.monotonic() - started), 0.001)
+            loop = asyncio.get_running_loop()
+            response = await asyncio.wait_for(
+                loop.run_in_executor(
+                    self._executor,
+                    lambda: self.model.generate_content(
+                        prompt,
+                        generation_config=generation_config,
+                        request_options={"timeout": remaining}
+                    )
+                ),
+                timeout=remaining
+            )
             return response.text
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+    
+    async def stream_content(
+        self,
+        prompt: str,
+        temperature: float = None,
+        timeout: float = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Generate content using Gemini API, yielding text as it is produced
+        
+        The full text is stored in the response cache once the stream
+        completes, so a cached prompt is replayed as a single chunk.
+        Closing the generator stops reading from the upstream stream. A
+        stream that fails with a retryable error before its first chunk is
+        retried like generate_content; later failures are not.
+        
+        Args:
+            prompt: The prompt to send to Gemini
+            temperature: Temperature for generation (0.0-1.0)
+            timeout: Timeout in seconds for the whole stream (defaults to GEMINI_REQUEST_TIMEOUT)
+            use_cache: Serve from and store into the response cache
             
-        except Exception as e:
-            raise Exception(f"Gemini API error: {str(e)}")
+        Yields:
+            Text chunks in generation order
+        """
+        temperature = temperature or settings.GEMINI_TEMPERATURE
+        cache_key = self._cache_key(prompt, temperature)
+        
+        if use_cache:
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        else:
+            llm_cache.record_bypass()
+        
+        timeout = timeout or settings.GEMINI_REQUEST_TIMEOUT
+        generation_config = genai.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=settings.GEMINI_MAX_TOKENS,
+        )
+        
+        deadline = time.monotonic() + timeout
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        def produce():
+            # Runs on the worker pool; hands chunks back to the event loop
+            try:
+                response = self.model.generate_content(
+                    prompt,
+                    generation_config=generation_config,
+                    stream=True,
+                    request_options={"timeout": max(deadline - time.monotonic(), 0.001)}
+                )
+                for chunk in response:
+                    if stop.is_set():
+                        return
+                    text = chunk.text
+                    if text:
+                        loop.call_soon_threadsafe(queue.put_nowait, text)
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+        
+        parts = []
+        attempt = 0
+        while True:
+            await self._admit(prompt)
+            self._waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self._waiting -= 1
+            
+            self._in_flight += 1
+            stop = threading.Event()
+            loop.run_in_executor(self._executor, produce)
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    item = await asyncio.wait_for(queue.get(), timeout=remaining)
+                    if item is done:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    parts.append(item)
+                    yield item
+                
+                self._breaker.record_success()
+                self._completed += 1
+                if use_cache:
+                    await llm_cache.set(cache_key, "".join(parts))
+                return
+                
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                self._breaker.record_failure()
+                raise GeminiUnavailableError(
+                    f"Gemini API timed out after {timeout:g}s", settings.GEMINI_BACKOFF_MAX
+                )
+            except asyncio.CancelledError:
+                self._breaker.release_probe()
+                raise
+            except Exception as e:
+                if parts:
+                    # Text already sent cannot be taken back, so only a stream
+                    # that failed before its first chunk is retried
+                    self._failed += 1
+                    if is_retryable(e):
+                        self._breaker.record_failure()
+                    else:
+                        self._breaker.record_success()
+                    raise Exception(f"Gemini API error: {str(e)}")
+                delay = self._retry_delay(e, attempt)
+            finally:
+                stop.set()
+                self._in_flight -= 1
+                self._semaphore.release()
+            
+            attempt += 1
+            await asyncio.sleep(delay)
     
-    async def generate_json_response(self, prompt: str) -> Dict[str, Any]:
+    async def generate_json_response(
+        self,
+        prompt: str,
+        response_model: Type[BaseModel],
+        use_cache: bool = True
+    ) -> BaseModel:
         """
-        Generate JSON response from Gemini
+        Generate a JSON response from Gemini, validated into a Pydantic model
+        
+        The request carries a response schema derived from the model, and
+        the raw text is validated straight into it. Malformed output is
+        repaired locally first and the cached text replaced with the
+        repaired JSON; output that cannot be repaired (including output
+        missing required fields) is evicted from the cache and requested
+        once more.
         
         Args:
             prompt: The prompt requesting JSON output
+            response_model: Model the response must match
+            use_cache: Serve from and store into the response cache
             
         Returns:
-            Parsed JSON response as dictionary
+            Validated model instance
         """
-        response_text = await self.generate_content(prompt, temperature=0.3)
+        response_text = await self.generate_content(
+            prompt, temperature=0.3, use_cache=use_cache, response_model=response_model
+        )
+        result, repaired = parse_response(response_text, response_model)
+        retried = result is None
         
-        # Clean up response - remove markdown code blocks if present
-        cleaned_text = response_text.strip()
-        cleaned_text = re.sub(r'```json\s*', '', cleaned_text)
-        cleaned_text = re.sub(r'```\s*$', '', cleaned_text)
-        cleaned_text = cleaned_text.strip()
+        if retried:
+            # Never keep serving an unusable response from the cache
+            await llm_cache.delete(self._cache_key(prompt, 0.3, response_model))
+            self._json_retries += 1
+            response_text = await self.generate_content(
+                prompt, temperature=0.3, use_cache=False, response_model=response_model
+            )
+            result, repaired = parse_response(response_text, response_model)
+            if result is None:
+                raise Exception(f"Failed to parse JSON response: output does not match {response_model.__name__}")
         
-        try:
-            return json.loads(cleaned_text)
-        except json.JSONDecodeError as e:
-            # If JSON parsing fails, try to extract JSON from text
-            json_match = re.search(r'\{.*\}', cleaned_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(0))
-            raise Exception(f"Failed to parse JSON response: {str(e)}")
+        if repaired:
+            self._json_repairs += 1
+        if use_cache and (repaired or retried):
+            # Cache the validated document rather than the malformed or uncached text
+            await llm_cache.set(self._cache_key(prompt, 0.3, response_model), result.model_dump_json())
+        return result
     
     async def analyze_resume(
         self,
         resume_text: str,
         job_role: str,
-        job_description: str = None
+        job_description: str = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Analyze resume for a specific job role
         
+        Skills detected locally are offered to the model as candidates for
+        skills_to_emphasize. With a job description, keywords_to_add comes
+        from the local keyword scorer and is left out of the prompt. Resumes
+        longer than LONG_RESUME_TOKEN_THRESHOLD are analyzed in chunks.
+        
         Args:
             resume_text: Full text of the resume
             job_role: Target job role/title
             job_description: Optional job description
+            use_cache: Serve from and store into the response cache
             
         Returns:
             Dictionary with resume analysis
         """
+        resume_text = text_preprocessor.compact(resume_text)
+        if self._is_long(resume_text):
+            return await self._analyze_long(resume_text, job_role, job_description, use_cache)
+        
+        resume_text, job_description = text_preprocessor.prepare_inputs(resume_text, job_description)
+        candidates, keywords = self._local_signals(resume_text, job_description)
+        skills_hint = self._skills_hint(candidates)
+
+        keywords_field = ""
+        if keywords is None:
+            keywords_field = '\n  "keywords_to_add": ["keyword 1", "keyword 2", "keyword 3", "keyword 4", "keyword 5"],'
+
         prompt = f"""You are an expert resume analyst and career coach. Analyze this resume for a {job_role} position.
 
 RESUME CONTENT:
@@ -96,43 +561,367 @@ RESUME CONTENT:
 
 JOB DESCRIPTION:
 {job_description or 'No specific job description provided'}
-
+{skills_hint}
 Provide a comprehensive analysis in the following JSON format. YOUR ENTIRE RESPONSE MUST BE VALID JSON ONLY. DO NOT INCLUDE ANY TEXT OUTSIDE THE JSON STRUCTURE.
 
 {{
   "overall_score": 7.5,
   "strengths": ["strength 1", "strength 2", "strength 3", "strength 4"],
-  "skills_to_emphasize": ["skill 1 with reason", "skill 2 with reason", "skill 3 with reason", "skill 4 with reason"],
-  "keywords_to_add": ["keyword 1", "keyword 2", "keyword 3", "keyword 4", "keyword 5"],
+  "skills_to_emphasize": ["skill 1 with reason", "skill 2 with reason", "skill 3 with reason", "skill 4 with reason"],{keywords_field}
   "experience_to_highlight": ["experience point 1", "experience point 2", "experience point 3"],
   "gaps_to_address": ["gap 1 with suggestion", "gap 2 with suggestion"],
   "improvement_areas": ["area 1 with specific suggestion", "area 2 with specific suggestion", "area 3 with specific suggestion"]
 }}"""
 
-        return await self.generate_json_response(prompt)
-    
+        response_model = partial_model(ResumeAnalysisResponse, LOCAL_ANALYSIS_FIELDS if keywords is not None else ())
+        result = await self.generate_json_response(prompt, response_model, use_cache=use_cache)
+        return self._complete_analysis(result.model_dump(), candidates, keywords)
+
+    @staticmethod
+    def _is_long(resume_text: str) -> bool:
+        """Whether a compacted resume is analyzed in chunks"""
+        threshold = settings.LONG_RESUME_TOKEN_THRESHOLD
+        return threshold > 0 and estimate_tokens(resume_text) > threshold
+
+    async def _analyze_long(
+        self,
+        resume_text: str,
+        job_role: str,
+        job_description: str,
+        use_cache: bool
+    ) -> Dict[str, Any]:
+        """
+        Analyze a long resume with concurrent per-chunk calls and one merge call
+        
+        The text is split into chunks of whole sections, each analyzed on
+        its own. A final call sees only the compact findings of every chunk,
+        not the resume, and merges them into one analysis. Local signals
+        (detected skills, keyword match) come from the full text.
+        
+        Args:
+            resume_text: Compacted resume text
+            job_role: Target job role/title
+            job_description: Optional job description
+            use_cache: Serve from and store into the response cache
+            
+        Returns:
+            Dictionary with resume analysis
+        """
+        job_description = text_preprocessor.prepare(job_description, settings.PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET)
+        resume_text = text_preprocessor.fit_to_budget(
+            resume_text, settings.LONG_RESUME_CHUNK_TOKENS * settings.LONG_RESUME_MAX_CHUNKS
+        )
+        chunks = text_preprocessor.chunk(resume_text, settings.LONG_RESUME_CHUNK_TOKENS)
+        candidates, keywords = self._local_signals(resume_text, job_description)
+        
+        findings = await asyncio.gather(*(
+            self._analyze_chunk(chunk, part, len(chunks), job_role, job_description, candidates, use_cache)
+            for part, chunk in enumerate(chunks, start=1)
+        ))
+        
+        budget = max(settings.LONG_RESUME_REDUCE_TOKEN_BUDGET // len(chunks), 100)
+        parts = "\n\n".join(
+            context_builder.chunk_findings(chunk_findings, part, len(chunks), budget)
+            for part, chunk_findings in enumerate(findings, start=1)
+        )
+        skills_hint = self._skills_hint(candidates)
+        keywords_field = ""
+        if keywords is None:
+            keywords_field = '\n  "keywords_to_add": ["keyword 1", "keyword 2", "keyword 3", "keyword 4", "keyword 5"],'
+
+        prompt = f"""You are an expert resume analyst and career coach. A long CV for a {job_role} position was analyzed in {len(chunks)} parts. Merge the findings of all parts into one analysis of the whole CV.
+
+{parts}
+{skills_hint}
+Keep the most important items across all parts without repeating near-duplicates, and judge overall_score for the CV as a whole rather than averaging the part scores.
+
+Provide the merged analysis in the following JSON format. YOUR ENTIRE RESPONSE MUST BE VALID JSON ONLY. DO NOT INCLUDE ANY TEXT OUTSIDE THE JSON STRUCTURE.
+
+{{
+  "overall_score": 7.5,
+  "strengths": ["strength 1", "strength 2", "strength 3", "strength 4"],
+  "skills_to_emphasize": ["skill 1 with reason", "skill 2 with reason", "skill 3 with reason", "skill 4 with reason"],{keywords_field}
+  "experience_to_highlight": ["experience point 1", "experience point 2", "experience point 3"],
+  "gaps_to_address": ["gap 1 with suggestion", "gap 2 with suggestion"],
+  "improvement_areas": ["area 1 with specific suggestion", "area 2 with specific suggestion", "area 3 with specific suggestion"]
+}}"""
+
+        response_model = partial_model(ResumeAnalysisResponse, LOCAL_ANALYSIS_FIELDS if keywords is not None else ())
+        result = await self.generate_json_response(prompt, response_model, use_cache=use_cache)
+        self._long_analyses += 1
+        self._long_chunks += len(chunks)
+        return self._complete_analysis(result.model_dump(), candidates, keywords)
+
+    async def _analyze_chunk(
+        self,
+        chunk: str,
+        part: int,
+        parts: int,
+        job_role: str,
+        job_description: str,
+        candidates,
+        use_cache: bool
+    ) -> Dict[str, Any]:
+        """Analyze one chunk of a long resume on its own"""
+        present = set(text_features(chunk)[0])
+        skills_hint = self._skills_hint([skill for skill in candidates if skill in present])
+
+        prompt = f"""You are an expert resume analyst and career coach. This is part {part} of {parts} of a long CV for a {job_role} position. Analyze only what this part shows; the other parts are analyzed separately.
+
+RESUME CONTENT (PART {part} OF {parts}):
+{chunk}
+
+JOB DESCRIPTION:
+{job_description or 'No specific job description provided'}
+{skills_hint}
+Provide your findings for this part in the following JSON format, with overall_score rating how strongly this part supports the application. YOUR ENTIRE RESPONSE MUST BE VALID JSON ONLY. DO NOT INCLUDE ANY TEXT OUTSIDE THE JSON STRUCTURE.
+
+{{
+  "overall_score": 7.5,
+  "strengths": ["strength 1", "strength 2", "strength 3"],
+  "skills_to_emphasize": ["skill 1 with reason", "skill 2 with reason", "skill 3 with reason"],
+  "experience_to_highlight": ["experience point 1", "experience point 2", "experience point 3"],
+  "gaps_to_address": ["gap 1 with suggestion", "gap 2 with suggestion"],
+  "improvement_areas": ["area 1 with specific suggestion", "area 2 with specific suggestion"]
+}}"""
+
+        # Missing keywords only make sense for the whole CV, so chunks never report them
+        response_model = partial_model(ResumeAnalysisResponse, LOCAL_ANALYSIS_FIELDS)
+        result = await self.generate_json_response(prompt, response_model, use_cache=use_cache)
+        return result.model_dump()
+
+    @staticmethod
+    def _local_signals(resume_text: str, job_description: str = None):
+        """
+        Compute the locally derived inputs of a resume analysis
+
+        Args:
+            resume_text: Full text of the resume
+            job_description: Optional job description
+
+        Returns:
+            Tuple of (detected skills, job skills first; local keyword match
+            or None without a job description)
+        """
+        candidates = list(text_features(resume_text)[0])
+        keywords = None
+        if job_description:
+            # Skills the job asks for come first
+            wanted = set(text_features(job_description)[0])
+            candidates.sort(key=lambda skill: skill not in wanted)
+            keywords = ats_scorer.keyword_match(resume_text, job_description)
+        return candidates, keywords
+
+    @staticmethod
+    def _skills_hint(candidates) -> str:
+        """Prompt section offering detected skills as skills_to_emphasize candidates"""
+        if not candidates:
+            return ""
+        return f"""
+DETECTED SKILLS (pick skills_to_emphasize from these, most relevant first):
+{", ".join(candidates[:30])}
+"""
+
+    @staticmethod
+    def _complete_analysis(result: Dict[str, Any], candidates, keywords) -> Dict[str, Any]:
+        """Fill the analysis fields that come from local scoring"""
+        if keywords is not None:
+            result["keywords_to_add"] = keywords["missing_keywords"][:8]
+        if not result.get("skills_to_emphasize"):
+            result["skills_to_emphasize"] = candidates[:4]
+        return result
+
+    @staticmethod
+    def _combined_key(resume_text: str, job_description: str = None) -> str:
+        """Identify the resume and job description of a combined analysis"""
+        digest = hashlib.sha256(resume_text.encode("utf-8"))
+        digest.update(b"\0" + (job_description or "").encode("utf-8"))
+        return digest.hexdigest()
+
+    async def analyze_resume_and_ats(
+        self,
+        resume_text: str,
+        job_role: str,
+        job_description: str = None,
+        use_cache: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze a resume and its ATS compatibility in one Gemini call
+
+        The resume and job description are sent once for both results. The
+        ATS half is kept for the response cache TTL so an ATS check of the
+        same resume and job description, even one already waiting, is served
+        from this call.
+
+        Args:
+            resume_text: Full text of the resume
+            job_role: Target job role/title
+            job_description: Optional job description
+            use_cache: Serve from and store into the response cache
+
+        Returns:
+            Dictionary with the validated "analysis" and "ats_score" results
+        """
+        key = self._combined_key(resume_text, job_description)
+        shared = asyncio.get_running_loop().create_future()
+        self._combined_ats[key] = (time.monotonic(), shared)
+        self._combined_ats.move_to_end(key)
+        while len(self._combined_ats) > COMBINED_MEMO_SIZE:
+            self._combined_ats.popitem(last=False)
+
+        try:
+            result = await self._analyze_combined(resume_text, job_role, job_description, use_cache)
+        except BaseException:
+            # Waiting ATS checks fall back to their own call
+            if self._combined_ats.get(key, (0, None))[1] is shared:
+                del self._combined_ats[key]
+            if not shared.done():
+                shared.set_result(None)
+            raise
+
+        if not shared.done():
+            shared.set_result(result["ats_score"])
+        return result
+
+    async def _analyze_combined(
+        self,
+        resume_text: str,
+        job_role: str,
+        job_description: str,
+        use_cache: bool
+    ) -> Dict[str, Dict[str, Any]]:
+        """Build the combined prompt, then validate and split its response"""
+        resume_text = text_preprocessor.compact(resume_text)
+        if self._is_long(resume_text):
+            # A long resume is analyzed in chunks; the ATS check reads its first pages as usual
+            analysis, ats_score = await asyncio.gather(
+                self._analyze_long(resume_text, job_role, job_description, use_cache),
+                self._analyze_ats(resume_text, job_description, use_cache)
+            )
+            return {"analysis": analysis, "ats_score": ats_score}
+        
+        resume_text, job_description = text_preprocessor.prepare_inputs(resume_text, job_description)
+        candidates, keywords = self._local_signals(resume_text, job_description)
+        skills_hint = self._skills_hint(candidates)
+
+        keywords_hint = ""
+        keywords_field = ""
+        ats_keyword_fields = ""
+        if keywords is None:
+            keywords_field = '\n    "keywords_to_add": ["keyword 1", "keyword 2", "keyword 3", "keyword 4", "keyword 5"],'
+            ats_keyword_fields = (
+                '\n    "keyword_match": 65,'
+                '\n    "missing_keywords": ["keyword 1", "keyword 2", "keyword 3", "keyword 4"],'
+            )
+        else:
+            # Keyword overlap is computed locally; the model only judges what needs reading
+            keywords_hint = f"""
+KEYWORD ANALYSIS (already computed, do not repeat it):
+Keyword match: {keywords["keyword_match"]}%
+Missing keywords: {", ".join(keywords["missing_keywords"]) or "none"}
+"""
+
+        prompt = f"""You are an expert resume analyst, career coach and ATS (Applicant Tracking System) expert. Analyze this resume for a {job_role} position, including its ATS compatibility.
+
+RESUME CONTENT:
+{resume_text}
+
+JOB DESCRIPTION:
+{job_description or 'No specific job description provided'}
+{skills_hint}{keywords_hint}
+Provide both analyses in the following JSON format. YOUR ENTIRE RESPONSE MUST BE VALID JSON ONLY. DO NOT INCLUDE ANY TEXT OUTSIDE THE JSON STRUCTURE.
+
+{{
+  "analysis": {{
+    "overall_score": 7.5,
+    "strengths": ["strength 1", "strength 2", "strength 3", "strength 4"],
+    "skills_to_emphasize": ["skill 1 with reason", "skill 2 with reason", "skill 3 with reason", "skill 4 with reason"],{keywords_field}
+    "experience_to_highlight": ["experience point 1", "experience point 2", "experience point 3"],
+    "gaps_to_address": ["gap 1 with suggestion", "gap 2 with suggestion"],
+    "improvement_areas": ["area 1 with specific suggestion", "area 2 with specific suggestion", "area 3 with specific suggestion"]
+  }},
+  "ats": {{
+    "ats_score": 75,{ats_keyword_fields}
+    "formatting_issues": ["issue 1", "issue 2", "issue 3"],
+    "strengths": ["ATS strength 1", "ATS strength 2", "ATS strength 3"],
+    "recommendations": ["recommendation 1", "recommendation 2", "recommendation 3", "recommendation 4"]
+  }}
+}}"""
+
+        response_model = _combined_model(
+            LOCAL_ANALYSIS_FIELDS if keywords is not None else (),
+            LOCAL_ATS_FIELDS if keywords is not None else ()
+        )
+        result = await self.generate_json_response(prompt, response_model, use_cache=use_cache)
+        analysis = self._complete_analysis(result.analysis.model_dump(), candidates, keywords)
+        ats_score = result.ats.model_dump()
+        if keywords is not None:
+            ats_score["keyword_match"] = keywords["keyword_match"]
+            ats_score["missing_keywords"] = keywords["missing_keywords"]
+        
+        self._combined_calls += 1
+        return {"analysis": analysis, "ats_score": ats_score}
+
+    def _recent_combined_ats(self, key: str):
+        """The ATS half of a combined analysis for this key, unless it is older than the cache TTL"""
+        entry = self._combined_ats.get(key)
+        if entry is None:
+            return None
+        started_at, shared = entry
+        if time.monotonic() - started_at >= llm_cache.ttl_seconds:
+            del self._combined_ats[key]
+            return None
+        return shared
+
     async def analyze_ats_compatibility(
         self,
         resume_text: str,
-        job_description: str = None
+        job_description: str = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Analyze ATS (Applicant Tracking System) compatibility
         
+        When a job description is given, keyword_match and missing_keywords
+        come from the local keyword scorer instead of the model. A recent or
+        in-flight analyze_resume_and_ats call for the same resume and job
+        description is reused.
+        
         Args:
             resume_text: Full text of the resume
             job_description: Optional job description
+            use_cache: Serve from and store into the response cache
             
         Returns:
             Dictionary with ATS analysis
         """
-        prompt = f"""You are an ATS (Applicant Tracking System) expert. Analyze this resume for ATS compatibility.
+        if use_cache:
+            shared = self._recent_combined_ats(self._combined_key(resume_text, job_description))
+            if shared is not None:
+                ats_score = await asyncio.shield(shared)
+                if ats_score is not None:
+                    self._combined_hits += 1
+                    return dict(ats_score)
+        
+        return await self._analyze_ats(resume_text, job_description, use_cache)
+    
+    async def _analyze_ats(
+        self,
+        resume_text: str,
+        job_description: str,
+        use_cache: bool
+    ) -> Dict[str, Any]:
+        """Run the ATS analysis call itself"""
+        resume_text, job_description = text_preprocessor.prepare_inputs(resume_text, job_description)
+        
+        if not job_description:
+            prompt = f"""You are an ATS (Applicant Tracking System) expert. Analyze this resume for ATS compatibility.
 
 RESUME CONTENT:
 {resume_text}
 
 JOB DESCRIPTION:
-{job_description or 'General analysis'}
+General analysis
 
 Provide ATS analysis in the following JSON format. YOUR ENTIRE RESPONSE MUST BE VALID JSON ONLY.
 
@@ -144,15 +933,81 @@ Provide ATS analysis in the following JSON format. YOUR ENTIRE RESPONSE MUST BE
   "strengths": ["ATS strength 1", "ATS strength 2", "ATS strength 3"],
   "recommendations": ["recommendation 1", "recommendation 2", "recommendation 3", "recommendation 4"]
 }}"""
+            result = await self.generate_json_response(prompt, ATSScoreResponse, use_cache=use_cache)
+            return result.model_dump()
+
+        # Keyword overlap is computed locally; the model only judges what needs reading
+        keywords = ats_scorer.keyword_match(resume_text, job_description)
+
+        prompt = f"""You are an ATS (Applicant Tracking System) expert. Analyze this resume for ATS compatibility.
+
+RESUME CONTENT:
+{resume_text}
+
+JOB DESCRIPTION:
+{job_description}
+
+KEYWORD ANALYSIS (already computed, do not repeat it):
+Keyword match: {keywords["keyword_match"]}%
+Missing keywords: {", ".join(keywords["missing_keywords"]) or "none"}
+
+Provide ATS analysis in the following JSON format. YOUR ENTIRE RESPONSE MUST BE VALID JSON ONLY.
+
+{{
+  "ats_score": 75,
+  "formatting_issues": ["issue 1", "issue 2", "issue 3"],
+  "strengths": ["ATS strength 1", "ATS strength 2", "ATS strength 3"],
+  "recommendations": ["recommendation 1", "recommendation 2", "recommendation 3", "recommendation 4"]
+}}"""
 
-        return await self.generate_json_response(prompt)
+        response_model = partial_model(ATSScoreResponse, LOCAL_ATS_FIELDS)
+        result = (await self.generate_json_response(prompt, response_model, use_cache=use_cache)).model_dump()
+        result["keyword_match"] = keywords["keyword_match"]
+        result["missing_keywords"] = keywords["missing_keywords"]
+        return result
     
-    async def research_company(self, company_name: str) -> Dict[str, Any]:
+    async def research_company(
+        self,
+        company_name: str,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
         """
         Research company information
         
+        Results are served from the company research store, keyed by
+        normalized company name; use_cache=False forces a fresh lookup.
+        Refreshing an expired entry bypasses the response cache, so
+        COMPANY_CACHE_TTL_SECONDS bounds the age of what is served.
+        
         Args:
             company_name: Name of the company to research
+            use_cache: Serve from and store into the response caches
+            
+        Returns:
+            Dictionary with company research
+        """
+        if not use_cache:
+            return await company_research_store.refresh(
+                company_name,
+                lambda fresh: self._fetch_company_research(company_name, use_cache=False)
+            )
+        
+        return await company_research_store.get_or_fetch(
+            company_name,
+            lambda fresh: self._fetch_company_research(company_name, use_cache=not fresh)
+        )
+    
+    async def _fetch_company_research(
+        self,
+        company_name: str,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Research company information with Gemini
+        
+        Args:
+            company_name: Name of the company to research
+            use_cache: Serve from and store into the response cache
             
         Returns:
             Dictionary with company research
@@ -172,7 +1027,8 @@ Provide your research in the following JSON format. YOUR ENTIRE RESPONSE MUST BE
   "opportunities": ["opportunity 1", "opportunity 2", "opportunity 3"]
 }}"""
 
-        return await self.generate_json_response(prompt)
+        result = await self.generate_json_response(prompt, CompanyResearchResponse, use_cache=use_cache)
+        return result.model_dump()
     
     async def generate_recommendations(
         self,
@@ -180,7 +1036,8 @@ Provide your research in the following JSON format. YOUR ENTIRE RESPONSE MUST BE
         company_name: str,
         analysis: Dict[str, Any],
         ats_score: Dict[str, Any],
-        company_research: Dict[str, Any]
+        company_research: Dict[str, Any],
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Generate personalized recommendations
@@ -191,20 +1048,28 @@ Provide your research in the following JSON format. YOUR ENTIRE RESPONSE MUST BE
             analysis: Resume analysis data
             ats_score: ATS score data
             company_research: Company research data
+            use_cache: Serve from and store into the response cache
             
         Returns:
             Dictionary with recommendations
         """
-        prompt = f"""You are a career strategist. Based on the resume analysis and company research, provide personalized recommendations for applying to {company_name} for a {job_role} position.
-
-RESUME ANALYSIS:
-{json.dumps(analysis, indent=2)}
-
-ATS ANALYSIS:
-{json.dumps(ats_score, indent=2)}
+        prompt = self._recommendations_prompt(job_role, company_name, analysis, ats_score, company_research)
+        result = await self.generate_json_response(prompt, RecommendationsResponse, use_cache=use_cache)
+        return result.model_dump()
+    
+    @staticmethod
+    def _recommendations_prompt(
+        job_role: str,
+        company_name: str,
+        analysis: Dict[str, Any],
+        ats_score: Dict[str, Any],
+        company_research: Dict[str, Any]
+    ) -> str:
+        """Build the prompt for personalized recommendations"""
+        context = context_builder.recommendations_context(analysis, ats_score, company_research)
+        return f"""You are a career strategist. Based on the resume analysis and company research, provide personalized recommendations for applying to {company_name} for a {job_role} position.
 
-COMPANY RESEARCH:
-{json.dumps(company_research, indent=2)}
+{context}
 
 Provide actionable recommendations in the following JSON format. YOUR ENTIRE RESPONSE MUST BE VALID JSON ONLY.
 
@@ -216,8 +1081,109 @@ Provide actionable recommendations in the following JSON format. YOUR ENTIRE RES
   "preparation_tips": ["tip 1", "tip 2", "tip 3", "tip 4"],
   "next_steps": ["action 1", "action 2", "action 3"]
 }}"""
+    
+    @staticmethod
+    def _optimized_resume_prompt(
+        resume_text: str,
+        job_role: str,
+        company_name: str,
+        analysis: Dict[str, Any],
+        ats_score: Dict[str, Any]
+    ) -> str:
+        """Build the prompt for rewriting a resume"""
+        resume_text = text_preprocessor.prepare(resume_text, settings.PROMPT_RESUME_TOKEN_BUDGET)
+        return f"""Based on all the analysis, create an optimized version of this resume for the {job_role} position at {company_name}.
 
-        return await self.generate_json_response(prompt)
+ORIGINAL RESUME:
+{resume_text}
+
+{context_builder.resume_insights(analysis, ats_score)}
+
+Create a professional, ATS-friendly resume. Format it in a clean, structured way with clear sections. 
+Use proper formatting with section headers, bullet points, and clear structure.
+Return ONLY the resume text, no additional commentary or markdown formatting."""
+    
+    @staticmethod
+    def _resume_section_prompt(
+        section: str,
+        part: int,
+        parts: int,
+        job_role: str,
+        company_name: str,
+        insights: str
+    ) -> str:
+        """Build the prompt for rewriting one section of a resume"""
+        return f"""You are rewriting one section of a resume for the {job_role} position at {company_name}. The other sections are rewritten separately and joined in order, so work only with this one.
+
+RESUME SECTION ({part} OF {parts}):
+{section}
+
+{insights}
+
+Rewrite this section to be professional and ATS-friendly. Keep its heading, if it has one, as a capitalized section header. Use bullet points where they help, keep every fact, date and name, and do not add sections or content from elsewhere in the resume.
+Return ONLY the section text, no additional commentary or markdown formatting."""
+
+    def _resume_sections(self, resume_text: str):
+        """Segment a resume for section-parallel rewriting"""
+        resume_text = text_preprocessor.prepare(resume_text, settings.PROMPT_RESUME_TOKEN_BUDGET)
+        return text_preprocessor.segments(
+            resume_text, settings.RESUME_SECTION_MIN_TOKENS, settings.RESUME_SECTION_MAX_TOKENS
+        )
+
+    async def _rewrite_section(self, prompt: str, part: int, use_cache: bool) -> str:
+        """Rewrite one section, retrying only that section on failure"""
+        attempts = max(settings.RESUME_SECTION_ATTEMPTS, 1)
+        for attempt in range(1, attempts + 1):
+            try:
+                text = (await self.generate_content(prompt, temperature=0.5, use_cache=use_cache)).strip()
+                if text:
+                    self._sections_rewritten += 1
+                    return text
+                error = "empty response"
+            except GeminiUnavailableError:
+                raise
+            except Exception as e:
+                error = str(e)
+            if attempt < attempts:
+                self._section_retries += 1
+        raise Exception(f"Failed to rewrite resume section {part}: {error}")
+
+    def _start_section_rewrites(
+        self,
+        sections,
+        job_role: str,
+        company_name: str,
+        analysis: Dict[str, Any],
+        ats_score: Dict[str, Any],
+        use_cache: bool
+    ):
+        """Start rewriting every section concurrently, returning the tasks in document order"""
+        insights = context_builder.resume_insights(analysis, ats_score)
+        self._section_rewrites += 1
+        return [
+            asyncio.ensure_future(self._rewrite_section(
+                self._resume_section_prompt(section, part, len(sections), job_role, company_name, insights),
+                part,
+                use_cache
+            ))
+            for part, section in enumerate(sections, start=1)
+        ]
+    
+    @staticmethod
+    def _cover_letter_prompt(
+        job_role: str,
+        company_name: str,
+        company_research: Dict[str, Any],
+        recommendations: Dict[str, Any]
+    ) -> str:
+        """Build the prompt for writing a cover letter"""
+        return f"""Create a compelling cover letter for {job_role} position at {company_name}.
+
+{context_builder.cover_letter_context(company_research, recommendations)}
+
+Write a professional, engaging cover letter that demonstrates enthusiasm and fit. 
+Use a professional business letter format with proper greeting, body paragraphs, and closing.
+Return ONLY the cover letter text, no additional commentary."""
     
     async def generate_optimized_resume(
         self,
@@ -225,43 +1191,93 @@ Provide actionable recommendations in the following JSON format. YOUR ENTIRE RES
         job_role: str,
         company_name: str,
         analysis: Dict[str, Any],
-        ats_score: Dict[str, Any]
+        ats_score: Dict[str, Any],
+        use_cache: bool = True
     ) -> str:
         """
         Generate an optimized version of the resume
         
+        A resume with several sections is rewritten section by section,
+        all concurrently, and stitched back in the original order; a
+        failed section is retried on its own. Resumes without recognizable
+        sections are rewritten in one call.
+        
         Args:
             resume_text: Original resume text
             job_role: Target job role
             company_name: Company name
             analysis: Resume analysis data
             ats_score: ATS score data
+            use_cache: Serve from and store into the response cache
             
         Returns:
             Optimized resume text
         """
-        prompt = f"""Based on all the analysis, create an optimized version of this resume for the {job_role} position at {company_name}.
-
-ORIGINAL RESUME:
-{resume_text}
-
-ANALYSIS INSIGHTS:
-- Skills to emphasize: {', '.join(analysis.get('skills_to_emphasize', []))}
-- Keywords to add: {', '.join(analysis.get('keywords_to_add', []))}
-- ATS recommendations: {', '.join(ats_score.get('recommendations', []))}
-
-Create a professional, ATS-friendly resume. Format it in a clean, structured way with clear sections. 
-Use proper formatting with section headers, bullet points, and clear structure.
-Return ONLY the resume text, no additional commentary or markdown formatting."""
-
-        return await self.generate_content(prompt, temperature=0.5)
+        sections = self._resume_sections(resume_text)
+        if len(sections) < 2:
+            prompt = self._optimized_resume_prompt(resume_text, job_role, company_name, analysis, ats_score)
+            return await self.generate_content(prompt, temperature=0.5, use_cache=use_cache)
+        
+        tasks = self._start_section_rewrites(sections, job_role, company_name, analysis, ats_score, use_cache)
+        try:
+            return "\n\n".join(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def stream_optimized_resume(
+        self,
+        resume_text: str,
+        job_role: str,
+        company_name: str,
+        analysis: Dict[str, Any],
+        ats_score: Dict[str, Any],
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream an optimized version of the resume as it is generated
+        
+        Sections are rewritten concurrently as in generate_optimized_resume
+        and each is yielded, in order, as soon as it and every section
+        before it are done.
+        
+        Args:
+            resume_text: Original resume text
+            job_role: Target job role
+            company_name: Company name
+            analysis: Resume analysis data
+            ats_score: ATS score data
+            use_cache: Serve from and store into the response cache
+            
+        Yields:
+            Optimized resume text chunks
+        """
+        sections = self._resume_sections(resume_text)
+        if len(sections) < 2:
+            prompt = self._optimized_resume_prompt(resume_text, job_role, company_name, analysis, ats_score)
+            async for chunk in self.stream_content(prompt, temperature=0.5, use_cache=use_cache):
+                yield chunk
+            return
+        
+        tasks = self._start_section_rewrites(sections, job_role, company_name, analysis, ats_score, use_cache)
+        try:
+            for part, task in enumerate(tasks):
+                text = await task
+                yield text if part == 0 else f"\n\n{text}"
+        finally:
+            # Closing the stream early stops the sections still being written
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    task.exception()
+                task.cancel()
     
     async def generate_cover_letter(
         self,
         job_role: str,
         company_name: str,
         company_research: Dict[str, Any],
-        recommendations: Dict[str, Any]
+        recommendations: Dict[str, Any],
+        use_cache: bool = True
     ) -> str:
         """
         Generate a personalized cover letter
@@ -271,22 +1287,38 @@ Return ONLY the resume text, no additional commentary or markdown formatting."""
             company_name: Company name
             company_research: Company research data
             recommendations: Recommendations data
+            use_cache: Serve from and store into the response cache
             
         Returns:
             Cover letter text
         """
-        prompt = f"""Create a compelling cover letter for {job_role} position at {company_name}.
-
-KEY INFORMATION:
-- Company values: {', '.join(company_research.get('mission_and_values', []))}
-- Talking points: {', '.join(recommendations.get('cover_letter_talking_points', []))}
-- Cultural fit: {', '.join(recommendations.get('cultural_fit', []))}
-
-Write a professional, engaging cover letter that demonstrates enthusiasm and fit. 
-Use a professional business letter format with proper greeting, body paragraphs, and closing.
-Return ONLY the cover letter text, no additional commentary."""
-
-        return await self.generate_content(prompt, temperature=0.7)
+        prompt = self._cover_letter_prompt(job_role, company_name, company_research, recommendations)
+        return await self.generate_content(prompt, temperature=0.7, use_cache=use_cache)
+    
+    async def stream_cover_letter(
+        self,
+        job_role: str,
+        company_name: str,
+        company_research: Dict[str, Any],
+        recommendations: Dict[str, Any],
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream a personalized cover letter as it is generated
+        
+        Args:
+            job_role: Target job role
+            company_name: Company name
+            company_research: Company research data
+            recommendations: Recommendations data
+            use_cache: Serve from and store into the response cache
+            
+        Yields:
+            Cover letter text chunks
+        """
+        prompt = self._cover_letter_prompt(job_role, company_name, company_research, recommendations)
+        async for chunk in self.stream_content(prompt, temperature=0.7, use_cache=use_cache):
+            yield chunk
 
 
 # Create a singleton instance
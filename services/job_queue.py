@@ -0,0 +1,338 @@
+"""
+Background Job Queue
+Durable SQLite-backed queue with lease-based, single-owner execution
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from core.config import settings
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class JobQueue:
+    """
+    Persistent queue of background jobs run by in-process async workers
+
+    A worker claims a job by taking a time-limited lease on it inside an
+    IMMEDIATE transaction, so only one worker in any process runs a job at a
+    time. Every claim gets its own lease token, and the lease is renewed
+    while the job runs. Results are only recorded by the lease holder; a
+    worker that loses its lease cancels the job and drops its result. A job
+    whose worker died (lease expired) is claimed again after a restart, up
+    to JOB_MAX_ATTEMPTS. A job failing with an error that carries a
+    `retry_after` (GeminiUnavailableError) is put back on the queue to run
+    no sooner than that, within the same attempt limit.
+    """
+
+    def __init__(
+        self,
+        db_path: str = settings.JOB_QUEUE_DB_PATH,
+        workers: int = settings.JOB_QUEUE_WORKERS,
+        lease_seconds: float = settings.JOB_LEASE_SECONDS,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        poll_interval: float = settings.JOB_POLL_INTERVAL
+    ):
+        """
+        Initialize the queue; the database is opened on first use
+
+        Args:
+            db_path: Path to the SQLite database
+            workers: Worker tasks started by start()
+            lease_seconds: How long a claim lasts without renewal
+            max_attempts: Claims before a job is marked failed
+            poll_interval: Idle seconds between checks for new jobs
+        """
+        self.db_path = db_path
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self._running = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._deferred = 0
+        self._leases_lost = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit mode; transactions are opened explicitly where needed
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, lease_owner TEXT, lease_expires_at REAL, "
+                "result TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+                "run_after REAL)"
+            )
+            columns = {row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            if "run_after" not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN run_after REAL")
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at)")
+        return self._db
+
+    def register(self, kind: str, handler: JobHandler):
+        """
+        Register the coroutine function that runs jobs of a kind
+
+        Args:
+            kind: Job kind
+            handler: Coroutine function taking the job payload and returning a JSON-serializable result
+        """
+        self._handlers[kind] = handler
+
+    def _insert(self, job_id: str, kind: str, payload: Dict[str, Any]):
+        with self._db_lock:
+            self._connection().execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), JOB_QUEUED, time.time())
+            )
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        Persist a job for background execution
+
+        Args:
+            kind: Registered job kind
+            payload: JSON-serializable job input
+
+        Returns:
+            Job ID
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self._insert, job_id, kind, payload)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    def _claim(self) -> Optional[Tuple[sqlite3.Row, str]]:
+        """Lease the oldest runnable job and return it with its lease token, or return None"""
+        now = time.time()
+        lease = uuid.uuid4().hex
+        with self._db_lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs out of attempts after a crash are failed rather than retried forever
+                db.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_owner = NULL "
+                    "WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                    (JOB_FAILED, "Job was interrupted too many times", now, JOB_RUNNING, now, self.max_attempts)
+                )
+                row = db.execute(
+                    "SELECT * FROM jobs WHERE (status = ? AND (run_after IS NULL OR run_after <= ?)) "
+                    "OR (status = ? AND lease_expires_at < ?) ORDER BY created_at LIMIT 1",
+                    (JOB_QUEUED, now, JOB_RUNNING, now)
+                ).fetchone()
+                if row is not None:
+                    db.execute(
+                        "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires_at = ?, "
+                        "attempts = attempts + 1, started_at = ? WHERE id = ?",
+                        (JOB_RUNNING, lease, now + self.lease_seconds, now, row["id"])
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return None if row is None else (row, lease)
+
+    def _renew(self, job_id: str, lease: str) -> bool:
+        with self._db_lock:
+            cursor = self._connection().execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                (time.time() + self.lease_seconds, job_id, lease, JOB_RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def _finish(
+        self, job_id: str, lease: str, status: str, result: Optional[Dict[str, Any]], error: Optional[str]
+    ) -> bool:
+        with self._db_lock:
+            cursor = self._connection().execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_owner = NULL "
+                "WHERE id = ? AND lease_owner = ? AND status = ?",
+                (status, None if result is None else json.dumps(result), error, time.time(),
+                 job_id, lease, JOB_RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def _release(self, job_id: str, lease: str):
+        """Hand an interrupted job back to the queue without counting the attempt"""
+        with self._db_lock:
+            self._connection().execute(
+                "UPDATE jobs SET status = ?, attempts = attempts - 1, lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND lease_owner = ? AND status = ?",
+                (JOB_QUEUED, job_id, lease, JOB_RUNNING)
+            )
+
+    def _defer(self, job_id: str, lease: str, delay: float, error: str) -> bool:
+        """Put a job back on the queue to run again after `delay` seconds"""
+        with self._db_lock:
+            cursor = self._connection().execute(
+                "UPDATE jobs SET status = ?, error = ?, run_after = ?, lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND lease_owner = ? AND status = ?",
+                (JOB_QUEUED, error, time.time() + delay, job_id, lease, JOB_RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    async def _keep_leased(self, job_id: str, lease: str, job: asyncio.Task) -> bool:
+        """
+        Renew the lease while the job runs; cancel the job once the lease is lost
+
+        A failed renewal (e.g. a locked database) is retried on the next beat
+        as long as the last successful renewal has not expired yet.
+
+        Returns:
+            True if the lease was lost and the job cancelled
+        """
+        expires_at = time.time() + self.lease_seconds
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            renewed_at = time.time()
+            try:
+                renewed = await asyncio.to_thread(self._renew, job_id, lease)
+            except sqlite3.Error:
+                renewed = None
+            if renewed:
+                expires_at = renewed_at + self.lease_seconds
+            elif renewed is False or time.time() >= expires_at:
+                job.cancel()
+                return True
+
+    async def _run_handler(self, row: sqlite3.Row) -> Dict[str, Any]:
+        handler = self._handlers.get(row["kind"])
+        if handler is None:
+            raise Exception(f"No handler registered for job kind: {row['kind']}")
+        return await handler(json.loads(row["payload"]))
+
+    async def _execute(self, row: sqlite3.Row, lease: str):
+        job_id = row["id"]
+        job = asyncio.ensure_future(self._run_handler(row))
+        heartbeat = asyncio.ensure_future(self._keep_leased(job_id, lease, job))
+        self._running += 1
+        try:
+            result = await job
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled() and heartbeat.result():
+                # Another worker may own the job now; drop whatever this run produced
+                self._leases_lost += 1
+                return
+            await asyncio.to_thread(self._release, job_id, lease)
+            raise
+        except Exception as e:
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after is not None and row["attempts"] + 1 < self.max_attempts:
+                # The upstream is unavailable for now, not the job broken; try again later
+                if await asyncio.to_thread(self._defer, job_id, lease, retry_after, str(e)):
+                    self._deferred += 1
+                else:
+                    self._leases_lost += 1
+            elif await asyncio.to_thread(self._finish, job_id, lease, JOB_FAILED, None, str(e)):
+                self._failed += 1
+            else:
+                self._leases_lost += 1
+        else:
+            if await asyncio.to_thread(self._finish, job_id, lease, JOB_SUCCEEDED, result, None):
+                self._succeeded += 1
+            else:
+                self._leases_lost += 1
+        finally:
+            self._running -= 1
+            heartbeat.cancel()
+
+    async def _worker(self):
+        while True:
+            claimed = await asyncio.to_thread(self._claim)
+            if claimed is not None:
+                await self._execute(*claimed)
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self):
+        """Start the worker tasks; queued and interrupted jobs are picked up"""
+        if self._worker_tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._worker_tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def shutdown(self):
+        """Stop the workers, returning their running jobs to the queue"""
+        tasks, self._worker_tasks = self._worker_tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._db_lock:
+            row = self._connection().execute(
+                "SELECT id, kind, status, attempts, result, error, created_at, started_at, finished_at, run_after "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status, and its result once it has succeeded
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job record, or None if it does not exist
+        """
+        return await asyncio.to_thread(self._get, job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get worker statistics for this process
+
+        Returns:
+            Dictionary with worker count, job counters (deferred: put back while
+            Gemini was unavailable) and runs dropped after a lost lease
+        """
+        return {
+            "workers": len(self._worker_tasks),
+            "running": self._running,
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+            "deferred": self._deferred,
+            "leases_lost": self._leases_lost,
+        }
+
+
+# Create singleton instance
+job_queue = JobQueue()
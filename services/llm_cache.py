@@ -0,0 +1,221 @@
+"""
+LLM Response Cache
+Two-tier cache for Gemini responses keyed by prompt fingerprint
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from core.config import settings
+
+
+def prompt_fingerprint(model: str, temperature: float, max_tokens: int, prompt: str) -> str:
+    """
+    Compute a stable fingerprint for a generation request
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        max_tokens: Maximum output tokens
+        prompt: Full prompt text
+
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    payload = json.dumps([model, float(temperature), int(max_tokens), prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """In-process LRU cache backed by a persistent SQLite tier"""
+
+    def __init__(
+        self,
+        max_entries: int = settings.LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = settings.LLM_CACHE_TTL_SECONDS,
+        db_path: str = settings.LLM_CACHE_DB_PATH,
+        enabled: bool = settings.LLM_CACHE_ENABLED
+    ):
+        """
+        Initialize the cache tiers
+
+        Args:
+            max_entries: Maximum entries held in the in-memory tier
+            ttl_seconds: Time-to-live for entries in both tiers
+            db_path: Path to the SQLite database for the persistent tier
+            enabled: Whether caching is enabled at all
+        """
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the SQLite tier on first use"""
+        if self._db is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._db_lock:
+            row = self._connection().execute(
+                "SELECT created_at, value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _disk_set(self, key: str, value: str, created_at: float):
+        with self._db_lock:
+            db = self._connection()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, created_at)
+            )
+            db.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?",
+                (created_at - self.ttl_seconds,)
+            )
+            db.commit()
+
+    def _disk_delete(self, key: str):
+        with self._db_lock:
+            db = self._connection()
+            db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            db.commit()
+
+    def _memory_set(self, key: str, value: str, created_at: float):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _is_fresh(self, created_at: float) -> bool:
+        return time.time() - created_at < self.ttl_seconds
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Prompt fingerprint
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            if self._is_fresh(entry[0]):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+            del self._memory[key]
+
+        try:
+            entry = await asyncio.to_thread(self._disk_get, key)
+        except sqlite3.Error:
+            entry = None
+
+        if entry is not None and self._is_fresh(entry[0]):
+            self._memory_set(key, entry[1], entry[0])
+            self.disk_hits += 1
+            return entry[1]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str):
+        """
+        Store a response in both tiers
+
+        Args:
+            key: Prompt fingerprint
+            value: Response text
+        """
+        if not self.enabled:
+            return
+
+        created_at = time.time()
+        self._memory_set(key, value, created_at)
+        try:
+            await asyncio.to_thread(self._disk_set, key, value, created_at)
+        except sqlite3.Error:
+            # The persistent tier is best effort; the memory tier still serves hits
+            pass
+
+    async def delete(self, key: str):
+        """
+        Remove a single entry from both tiers
+
+        Args:
+            key: Prompt fingerprint
+        """
+        self._memory.pop(key, None)
+        try:
+            await asyncio.to_thread(self._disk_delete, key)
+        except sqlite3.Error:
+            pass
+
+    def record_bypass(self):
+        """Count a request that skipped the cache"""
+        self.bypassed += 1
+
+    def clear(self):
+        """Remove all entries from both tiers"""
+        self._memory.clear()
+        with self._db_lock:
+            db = self._connection()
+            db.execute("DELETE FROM llm_cache")
+            db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss statistics
+
+        Returns:
+            Dictionary with counters and tier sizes
+        """
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Create singleton instance
+llm_cache = LLMResponseCache()
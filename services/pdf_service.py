@@ -4,13 +4,269 @@ Handles PDF file operations
 """
 
 from PyPDF2 import PdfReader
-from typing import BinaryIO
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Deque, Dict, Any, List, Optional, Set, Tuple, Union
+from core.config import settings
+from services.text_service import PAGE_BREAK
+import pdf_worker
+import asyncio
 import io
+import subprocess
+import sys
+import threading
+
+
+# Run as a script, so workers never import the application
+WORKER_SCRIPT = pdf_worker.__file__
+
+
+class PDFServiceBusyError(Exception):
+    """Raised when the extraction queue is full"""
+
+
+class _WorkerCrashed(Exception):
+    """The worker process died while holding a task"""
+
+
+class _Worker:
+    """
+    One extraction process, driven over its stdin/stdout from a dedicated thread
+
+    The process is started on first use and again after it died or was
+    killed, so killing a worker only loses the task it was running.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._killed = False
+        self.restarts = 0
+
+    def _ensure_started(self) -> subprocess.Popen:
+        with self._lock:
+            if self._process is not None and not self._killed and self._process.poll() is None:
+                return self._process
+            if self._process is not None:
+                self._process.kill()
+                self._process.wait()
+                self.restarts += 1
+            self._process = subprocess.Popen(
+                [sys.executable, WORKER_SCRIPT],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE
+            )
+            self._killed = False
+            return self._process
+
+    def run(self, task: Tuple[Union[bytes, str], int, Optional[int]], on_start: Callable[[], None]):
+        """
+        Send a task and wait for its reply (blocking; runs on the worker's thread)
+
+        Args:
+            task: (source, start, end) for pdf_worker.extract_pages
+            on_start: Called once the task has been handed to a running process
+
+        Returns:
+            The worker's (status, result) reply
+        """
+        process = self._ensure_started()
+        try:
+            pdf_worker.send_message(process.stdin, task)
+            on_start()
+            return pdf_worker.receive_message(process.stdout)
+        except (EOFError, OSError) as e:
+            self.kill()
+            raise _WorkerCrashed(str(e) or "worker process exited") from None
+
+    def kill(self):
+        """Kill the process without waiting; a thread blocked in run() sees the pipe close"""
+        with self._lock:
+            self._killed = True
+            if self._process is not None and self._process.poll() is None:
+                self._process.kill()
+
+
+class _Document:
+    """Extraction state of one PDF"""
+
+    def __init__(self, source: Union[bytes, str], future: asyncio.Future):
+        self.source = source
+        self.future = future
+        self.pending: Deque[Tuple[int, Optional[int]]] = deque()
+        self.pages: Dict[int, List[str]] = {}
+        self.running: Set[_Worker] = set()
+        self.expected_chunks: Optional[int] = None
+        self.deadline: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.future.done()
 
 
 class PDFService:
     """Service for PDF processing operations"""
-    
+
+    def __init__(self):
+        """Initialize extraction worker settings; worker processes start on first use"""
+        self.workers = settings.PDF_POOL_WORKERS
+        self.pages_per_task = settings.PDF_PAGES_PER_TASK
+        self.timeout = settings.PDF_EXTRACTION_TIMEOUT
+        self.max_queue_depth = settings.PDF_MAX_QUEUE_DEPTH
+
+        self._idle: List[_Worker] = [_Worker() for _ in range(self.workers)]
+        self._all_workers = list(self._idle)
+        # Each worker's blocking pipe calls run on their own thread
+        self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pdf")
+        # Documents with chunks waiting, served round-robin
+        self._ready: Deque[_Document] = deque()
+        self._documents_in_flight = 0
+        self._completed = 0
+        self._timeouts = 0
+        self._crashes = 0
+
+    def shutdown(self):
+        """Stop the extraction worker processes"""
+        for worker in self._all_workers:
+            worker.kill()
+        self._threads.shutdown(wait=False, cancel_futures=True)
+
+    def _fail(self, document: _Document, message: str):
+        """Fail a document and abandon its remaining work"""
+        if document.finished:
+            return
+        document.future.set_exception(Exception(f"Failed to extract text from PDF: {message}"))
+        document.pending.clear()
+        if document.deadline is not None:
+            document.deadline.cancel()
+        # Only the workers still holding this document's tasks are stopped;
+        # they restart on their next task
+        for worker in document.running:
+            worker.kill()
+
+    def _expire(self, document: _Document):
+        if not document.finished:
+            self._timeouts += 1
+            self._fail(document, f"timed out after {self.timeout:g}s")
+
+    def _dispatch(self):
+        """Hand waiting chunks to idle workers, one document after another"""
+        while self._idle and self._ready:
+            document = self._ready.popleft()
+            if document.finished or not document.pending:
+                continue
+            start, end = document.pending.popleft()
+            if document.pending:
+                self._ready.append(document)
+            worker = self._idle.pop()
+            document.running.add(worker)
+            asyncio.ensure_future(self._run(worker, document, start, end))
+
+    def _start_deadline(self, document: _Document):
+        """Start the time limit when the document's first page task starts running"""
+        if document.deadline is None and not document.finished:
+            loop = asyncio.get_running_loop()
+            document.deadline = loop.call_later(self.timeout, self._expire, document)
+
+    async def _run(self, worker: _Worker, document: _Document, start: int, end: Optional[int]):
+        """Run one chunk on a worker and record its outcome"""
+        loop = asyncio.get_running_loop()
+        on_start = lambda: loop.call_soon_threadsafe(self._start_deadline, document)
+        try:
+            status, result = await loop.run_in_executor(
+                self._threads, worker.run, (document.source, start, end), on_start
+            )
+        except _WorkerCrashed as e:
+            if not document.finished:
+                # A worker died on its own, for example on a pathological PDF
+                self._crashes += 1
+                self._fail(document, f"extraction worker exited ({e})")
+            status, result = None, None
+        except Exception as e:
+            status, result = "error", str(e)
+        finally:
+            document.running.discard(worker)
+            self._idle.append(worker)
+
+        if status == "error":
+            self._fail(document, result)
+        elif status == "ok" and not document.finished:
+            page_count, pages = result
+            document.pages[start] = pages
+            if document.expected_chunks is None:
+                # The first chunk reports the page count; queue the rest
+                ranges = range(self.pages_per_task, page_count, self.pages_per_task)
+                document.pending.extend((first, first + self.pages_per_task) for first in ranges)
+                document.expected_chunks = 1 + len(ranges)
+                if document.pending:
+                    self._ready.append(document)
+            if len(document.pages) == document.expected_chunks:
+                if document.deadline is not None:
+                    document.deadline.cancel()
+                document.future.set_result([page for first in sorted(document.pages) for page in document.pages[first]])
+        self._dispatch()
+
+    async def extract_text(self, source: Union[bytes, str]) -> str:
+        """
+        Extract text from a PDF on the worker processes
+
+        The first task extracts the leading pages and reports the page
+        count; the remaining pages are split into tasks. Tasks of all
+        documents in flight are interleaved, so a long PDF does not hold
+        up short ones. PDF_EXTRACTION_TIMEOUT counts from when the
+        document's first task starts running; on expiry only the workers
+        running that document are killed and restarted.
+
+        Args:
+            source: PDF file as bytes, or a path that workers memory-map
+
+        Returns:
+            Extracted text content, pages separated by a form feed
+        """
+        if self._documents_in_flight >= self.max_queue_depth:
+            raise PDFServiceBusyError("PDF extraction queue is full, please retry shortly")
+
+        document = _Document(source, asyncio.get_running_loop().create_future())
+        document.pending.append((0, self.pages_per_task))
+        self._ready.append(document)
+        self._documents_in_flight += 1
+        try:
+            self._dispatch()
+            # Shielded so that only the caller's own cancellation abandons the document
+            pages = await asyncio.shield(document.future)
+            self._completed += 1
+        except asyncio.CancelledError:
+            self._fail(document, "cancelled")
+            document.future.exception()
+            raise
+        finally:
+            self._documents_in_flight -= 1
+
+        # Page breaks let text_service recognize running headers and footers
+        return PAGE_BREAK.join(pages).strip()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get extraction worker statistics
+
+        Returns:
+            Dictionary with worker count, queue depth and counters
+        """
+        running = self.workers - len(self._idle)
+        return {
+            "workers": self.workers,
+            "pages_per_task": self.pages_per_task,
+            "timeout": self.timeout,
+            "max_queue_depth": self.max_queue_depth,
+            "documents_in_flight": self._documents_in_flight,
+            "tasks_in_flight": running,
+            "queued_tasks": sum(len(document.pending) for document in self._ready),
+            "completed": self._completed,
+            "timeouts": self._timeouts,
+            "worker_crashes": self._crashes,
+            "worker_restarts": sum(worker.restarts for worker in self._all_workers),
+        }
+
     @staticmethod
     def extract_text_from_pdf(file: BinaryIO) -> str:
         """
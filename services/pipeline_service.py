@@ -0,0 +1,345 @@
+"""
+Analysis Pipeline Service
+Runs the full analysis flow with independent stages in parallel
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Any, List
+from models.schemas import (
+    ResumeAnalysisResponse,
+    ATSScoreResponse,
+    CompanyResearchResponse,
+    RecommendationsResponse
+)
+from services.gemini_service import gemini_service, GeminiUnavailableError
+from core.config import settings
+
+
+# Schema each stage's output is validated against
+STAGE_MODELS = {
+    "analysis": ResumeAnalysisResponse,
+    "ats_score": ATSScoreResponse,
+    "company_research": CompanyResearchResponse,
+    "recommendations": RecommendationsResponse,
+}
+
+# Stage producing both the analysis and the ATS score in one LLM call
+COMBINED_STAGE = "analysis_and_ats"
+
+
+class PipelineService:
+    """Service orchestrating the analysis stages"""
+
+    @staticmethod
+    async def _timed(timings: Dict[str, float], stage: str, coro) -> Any:
+        """Await a stage and record its duration in milliseconds"""
+        started = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            timings[stage] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def run(
+        self,
+        resume_text: str,
+        job_role: str,
+        company_name: str,
+        job_description: str = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run resume analysis, ATS check, company research and recommendations
+
+        The analysis and ATS check share one combined LLM call, which runs
+        concurrently with company research; their results then feed the
+        recommendations stage.
+
+        Args:
+            resume_text: Full text of the resume
+            job_role: Target job role/title
+            company_name: Company name
+            job_description: Optional job description
+            use_cache: Serve from and store into the response caches
+
+        Returns:
+            Dictionary with every stage result and per-stage timings
+        """
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        combined, company_research = await asyncio.gather(
+            self._timed(timings, "analysis", gemini_service.analyze_resume_and_ats(
+                resume_text=resume_text,
+                job_role=job_role,
+                job_description=job_description,
+                use_cache=use_cache
+            )),
+            self._timed(timings, "company_research", gemini_service.research_company(
+                company_name,
+                use_cache=use_cache
+            ))
+        )
+        # Analysis and ATS check come from the same call
+        timings["ats_score"] = timings["analysis"]
+
+        analysis = combined["analysis"]
+        ats_score = combined["ats_score"]
+        company_research = CompanyResearchResponse(**company_research).model_dump()
+
+        recommendations = await self._timed(timings, "recommendations", gemini_service.generate_recommendations(
+            job_role=job_role,
+            company_name=company_name,
+            analysis=analysis,
+            ats_score=ats_score,
+            company_research=company_research,
+            use_cache=use_cache
+        ))
+        recommendations = RecommendationsResponse(**recommendations).model_dump()
+
+        timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+
+        return {
+            "analysis": analysis,
+            "ats_score": ats_score,
+            "company_research": company_research,
+            "recommendations": recommendations,
+            "timings_ms": timings
+        }
+
+    async def stream(
+        self,
+        resume_text: str,
+        job_role: str,
+        company_name: str,
+        job_description: str = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the pipeline, yielding each stage result as soon as it is ready
+
+        Closing the generator (for example when the client disconnects)
+        cancels every stage still running.
+
+        Args:
+            resume_text: Full text of the resume
+            job_role: Target job role/title
+            company_name: Company name
+            job_description: Optional job description
+            use_cache: Serve from and store into the response caches
+
+        Yields:
+            Events with the stage name, its elapsed time and its result or error
+        """
+        started = time.perf_counter()
+
+        def event(stage: str, data: Dict[str, Any] = None, error: str = None) -> Dict[str, Any]:
+            return {
+                "stage": stage,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "data": data,
+                "error": error,
+            }
+
+        stages = {
+            # Analysis and ATS check arrive together from one combined call
+            asyncio.ensure_future(gemini_service.analyze_resume_and_ats(
+                resume_text=resume_text,
+                job_role=job_role,
+                job_description=job_description,
+                use_cache=use_cache
+            )): COMBINED_STAGE,
+            asyncio.ensure_future(gemini_service.research_company(
+                company_name,
+                use_cache=use_cache
+            )): "company_research",
+        }
+        results: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            pending = set(stages)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = stages[task]
+                    if stage == COMBINED_STAGE:
+                        try:
+                            combined = task.result()
+                        except Exception as e:
+                            yield event("analysis", error=str(e))
+                            yield event("ats_score", error=str(e))
+                            continue
+                        results.update(combined)
+                        yield event("analysis", data=results["analysis"])
+                        yield event("ats_score", data=results["ats_score"])
+                        continue
+                    try:
+                        results[stage] = STAGE_MODELS[stage](**task.result()).model_dump()
+                    except Exception as e:
+                        yield event(stage, error=str(e))
+                        continue
+                    yield event(stage, data=results[stage])
+
+            if len(results) < 3:
+                yield event("done", error="Recommendations skipped because an earlier stage failed")
+                return
+
+            recommendations_task = asyncio.ensure_future(gemini_service.generate_recommendations(
+                job_role=job_role,
+                company_name=company_name,
+                analysis=results["analysis"],
+                ats_score=results["ats_score"],
+                company_research=results["company_research"],
+                use_cache=use_cache
+            ))
+            stages[recommendations_task] = "recommendations"
+            try:
+                recommendations = RecommendationsResponse(**await recommendations_task).model_dump()
+            except Exception as e:
+                yield event("recommendations", error=str(e))
+            else:
+                yield event("recommendations", data=recommendations)
+
+            yield event("done")
+
+        finally:
+            for task in stages:
+                if not task.done():
+                    task.cancel()
+
+    async def _run_target(
+        self,
+        index: int,
+        resume_text: str,
+        target: Dict[str, Any],
+        use_cache: bool
+    ) -> Dict[str, Any]:
+        """
+        Run the combined analysis and ATS check, and company research, for one batch target
+
+        Stage failures are reported in the result's errors instead of
+        failing the target. GeminiUnavailableError is raised instead, since
+        every other target would fail the same way.
+
+        Args:
+            index: Position of the target in the batch
+            resume_text: Full text of the resume
+            target: Dictionary with job_role, company_name and job_description
+            use_cache: Serve from and store into the response caches
+
+        Returns:
+            Dictionary with the stage results, errors and elapsed time
+        """
+        started = time.perf_counter()
+        job_role = target["job_role"]
+        company_name = target.get("company_name")
+        job_description = target.get("job_description")
+
+        stages = {
+            COMBINED_STAGE: gemini_service.analyze_resume_and_ats(
+                resume_text=resume_text,
+                job_role=job_role,
+                job_description=job_description,
+                use_cache=use_cache
+            ),
+        }
+        if company_name:
+            # Research is cached per company, so targets at the same company share one lookup
+            stages["company_research"] = gemini_service.research_company(company_name, use_cache=use_cache)
+
+        outcomes = await asyncio.gather(*stages.values(), return_exceptions=True)
+
+        result: Dict[str, Any] = {
+            "index": index,
+            "job_role": job_role,
+            "company_name": company_name,
+            "errors": {},
+        }
+        for outcome in outcomes:
+            if isinstance(outcome, GeminiUnavailableError):
+                raise outcome
+        for stage, outcome in zip(stages, outcomes):
+            if stage == COMBINED_STAGE:
+                if isinstance(outcome, Exception):
+                    result["errors"]["analysis"] = result["errors"]["ats_score"] = str(outcome)
+                elif isinstance(outcome, BaseException):
+                    raise outcome
+                else:
+                    result.update(outcome)
+                continue
+            try:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                result[stage] = STAGE_MODELS[stage](**outcome).model_dump()
+            except Exception as e:
+                result["errors"][stage] = str(e)
+
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    async def stream_batch(
+        self,
+        resume_text: str,
+        targets: List[Dict[str, Any]],
+        use_cache: bool = True,
+        concurrency: int = settings.BATCH_CONCURRENCY
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze one resume against many job postings, yielding each target as it finishes
+
+        At most `concurrency` targets run at once. The resume's extracted
+        features are memoized, so it is tokenized once for the whole batch.
+        Closing the generator cancels every target still running.
+
+        Args:
+            resume_text: Full text of the resume
+            targets: Dictionaries with job_role, company_name and job_description
+            use_cache: Serve from and store into the response caches
+            concurrency: Maximum targets in flight
+
+        Yields:
+            Per-target results in completion order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(index: int, target: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._run_target(index, resume_text, target, use_cache)
+
+        tasks = [asyncio.ensure_future(run(index, target)) for index, target in enumerate(targets)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def run_batch(
+        self,
+        resume_text: str,
+        targets: List[Dict[str, Any]],
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Analyze one resume against many job postings
+
+        Args:
+            resume_text: Full text of the resume
+            targets: Dictionaries with job_role, company_name and job_description
+            use_cache: Serve from and store into the response caches
+
+        Returns:
+            Dictionary with per-target results in request order and timings
+        """
+        started = time.perf_counter()
+        results = [result async for result in self.stream_batch(resume_text, targets, use_cache=use_cache)]
+        results.sort(key=lambda result: result["index"])
+        return {
+            "results": results,
+            "timings_ms": {"total": round((time.perf_counter() - started) * 1000, 1)}
+        }
+
+
+# Create singleton instance
+pipeline_service = PipelineService()
@@ -0,0 +1,295 @@
+"""
+Gemini Call Resilience
+Rate limiting shared across worker processes, retry backoff and a circuit breaker
+"""
+
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from core.config import settings
+
+
+# HTTP status codes of errors worth retrying: rate limited, or failing server-side
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether a failed Gemini call may succeed when repeated
+
+    Args:
+        error: Exception raised by the client library
+
+    Returns:
+        True for rate limiting (429) and server-side (5xx) errors
+    """
+    code = getattr(error, "code", None)
+    # google.api_core errors carry the HTTP status as an int; gRPC codes are enums
+    code = getattr(code, "value", code)
+    if isinstance(code, tuple):
+        code = None
+    if code in RETRYABLE_STATUS_CODES:
+        return True
+    return type(error).__name__ in (
+        "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+        "InternalServerError", "BadGateway", "GatewayTimeout", "DeadlineExceeded",
+    )
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Seconds to wait before a retry, with full jitter
+
+    Args:
+        attempt: 0-based number of the attempt that just failed
+
+    Returns:
+        Random delay between 0 and GEMINI_BACKOFF_BASE * 2**attempt, capped at GEMINI_BACKOFF_MAX
+    """
+    ceiling = min(settings.GEMINI_BACKOFF_MAX, settings.GEMINI_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+class RateLimiter:
+    """
+    Token buckets for requests and prompt tokens per minute
+
+    Bucket levels live in a small SQLite database, so every worker process
+    of a deployment draws from the same RPM and TPM quotas. A reservation
+    takes from both buckets at once or from neither.
+    """
+
+    def __init__(
+        self,
+        db_path: str = settings.GEMINI_RATE_LIMIT_DB_PATH,
+        rpm: int = settings.GEMINI_RPM_LIMIT,
+        tpm: int = settings.GEMINI_TPM_LIMIT
+    ):
+        """
+        Initialize the limiter; the database is opened on first use
+
+        Args:
+            db_path: Path to the SQLite database shared by worker processes
+            rpm: Requests per minute; 0 disables the request bucket
+            tpm: Estimated prompt tokens per minute; 0 disables the token bucket
+        """
+        self.db_path = db_path
+        self.rpm = rpm
+        self.tpm = tpm
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._granted = 0
+        self._throttled = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rpm > 0 or self.tpm > 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit mode; each reservation opens its own transaction
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+        return self._db
+
+    def _reserve(self, cost: int) -> float:
+        buckets = [
+            (name, capacity, min(amount, capacity))
+            for name, capacity, amount in (("requests", self.rpm, 1), ("tokens", self.tpm, cost))
+            if capacity > 0
+        ]
+        with self._db_lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                # Wall-clock time, since the levels are shared between processes
+                now = time.time()
+                levels = []
+                wait = 0.0
+                for name, capacity, amount in buckets:
+                    row = db.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (name,)).fetchone()
+                    tokens = capacity if row is None else row[0] + max(now - row[1], 0) * capacity / 60
+                    tokens = min(tokens, capacity)
+                    levels.append((name, tokens, amount))
+                    if tokens < amount:
+                        wait = max(wait, (amount - tokens) * 60 / capacity)
+
+                for name, tokens, amount in levels:
+                    remaining = tokens if wait > 0 else tokens - amount
+                    db.execute(
+                        "INSERT INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                        (name, remaining, now)
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return wait
+
+    async def reserve(self, cost: int) -> float:
+        """
+        Take one request and `cost` prompt tokens from the buckets if both have enough
+
+        Args:
+            cost: Estimated prompt tokens of the call
+
+        Returns:
+            0 when granted, otherwise seconds until the buckets will have
+            refilled enough (nothing is taken)
+        """
+        if not self.enabled:
+            return 0.0
+        wait = await asyncio.to_thread(self._reserve, cost)
+        if wait > 0:
+            self._throttled += 1
+        else:
+            self._granted += 1
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter settings and counters for this process
+
+        Returns:
+            Dictionary with limits, granted reservations and throttled attempts
+        """
+        return {
+            "enabled": self.enabled,
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "granted": self._granted,
+            "throttled": self._throttled,
+        }
+
+
+class CircuitBreaker:
+    """
+    Stops calls to an unhealthy upstream for a while
+
+    After `failure_threshold` consecutive retryable failures the breaker
+    opens and calls are refused for `reset_seconds`. Then it lets a single
+    trial call through (half-open) while everyone else is still refused:
+    its success closes the breaker, its failure opens it for another
+    period. A trial that reports nothing within `probe_timeout` is given up
+    and the next caller becomes the trial.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = settings.GEMINI_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = settings.GEMINI_BREAKER_RESET_SECONDS,
+        probe_timeout: float = settings.GEMINI_REQUEST_TIMEOUT
+    ):
+        """
+        Initialize a closed breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker; 0 disables it
+            reset_seconds: How long the breaker stays open
+            probe_timeout: How long a half-open trial call may take before another is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._opened = 0
+        self._rejected = 0
+
+    def _refresh(self) -> Tuple[str, float]:
+        """Current state and seconds until it may change; caller holds the lock"""
+        if self._state == BREAKER_OPEN:
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0:
+                return self._state, remaining
+            self._state = BREAKER_HALF_OPEN
+        return self._state, 0.0
+
+    def retry_after(self) -> float:
+        """
+        Check whether a call may go ahead
+
+        While half-open, only the first caller is let through as the trial;
+        the others are refused for another reset period.
+
+        Returns:
+            0 if the call may go ahead, otherwise seconds until the breaker
+            lets calls through again
+        """
+        with self._lock:
+            state, remaining = self._refresh()
+            if state == BREAKER_HALF_OPEN:
+                now = time.monotonic()
+                if self._probe_started is not None and now - self._probe_started < self.probe_timeout:
+                    remaining = self.reset_seconds
+                else:
+                    self._probe_started = now
+            if remaining > 0:
+                self._rejected += 1
+            return remaining
+
+    def release_probe(self):
+        """Let another caller be the trial after an admitted call ended without reaching upstream"""
+        with self._lock:
+            self._probe_started = None
+
+    def record_success(self):
+        """Close the breaker after upstream answered"""
+        with self._lock:
+            self._state = BREAKER_CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def record_failure(self):
+        """Count a retryable failure, opening the breaker at the threshold or after a failed trial"""
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._probe_started = None
+            state, _ = self._refresh()
+            self._failures += 1
+            if state == BREAKER_HALF_OPEN or (state == BREAKER_CLOSED and self._failures >= self.failure_threshold):
+                self._state = BREAKER_OPEN
+                self._opened_at = time.monotonic()
+                self._opened += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get breaker state and counters
+
+        Returns:
+            Dictionary with state, consecutive failures, times opened and calls refused
+        """
+        with self._lock:
+            state, remaining = self._refresh()
+            return {
+                "state": state,
+                "probe_in_flight": self._probe_started is not None,
+                "consecutive_failures": self._failures,
+                "retry_after": round(remaining, 1),
+                "opened": self._opened,
+                "rejected": self._rejected,
+            }
+
+
+# Create singleton instance
+rate_limiter = RateLimiter()
@@ -0,0 +1,447 @@
+"""
+Bulk Screening Service
+Screens batches of resumes against one job description as background jobs
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+from core.config import settings
+from models.schemas import ResumeAnalysisResponse
+from services.ats_scoring import ats_scorer
+from services.corpus_index import corpus_index
+from services.gemini_service import gemini_service
+from services.pdf_service import pdf_service, PDFServiceBusyError
+from services.text_cache import text_cache
+from services.text_service import text_preprocessor
+
+
+# Job states, in order
+JOB_QUEUED = "queued"
+JOB_EXTRACTING = "extracting"
+JOB_ANALYZING = "analyzing"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Resume states
+ITEM_PENDING = "pending"
+ITEM_SCORED = "scored"
+ITEM_ANALYZED = "analyzed"
+ITEM_FAILED = "failed"
+
+# Bytes copied per chunk when unpacking archives
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+class ScreeningStore:
+    """SQLite store of screening jobs and per-resume results"""
+
+    def __init__(self, db_path: str = settings.SCREENING_DB_PATH):
+        """
+        Initialize the store; the database is opened on first use
+
+        Args:
+            db_path: Path to the SQLite database
+        """
+        self.db_path = db_path
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(
+                "CREATE TABLE IF NOT EXISTS screening_jobs ("
+                "id TEXT PRIMARY KEY, job_role TEXT NOT NULL, job_description TEXT NOT NULL, "
+                "shortlist_size INTEGER NOT NULL, status TEXT NOT NULL, error TEXT, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS screening_results ("
+                "job_id TEXT NOT NULL, idx INTEGER NOT NULL, filename TEXT NOT NULL, path TEXT, "
+                "status TEXT NOT NULL, resume_id TEXT, keyword_match INTEGER, local_score REAL, "
+                "llm_score REAL, score REAL, analysis TEXT, error TEXT, "
+                "PRIMARY KEY (job_id, idx));"
+                "CREATE INDEX IF NOT EXISTS screening_results_by_score "
+                "ON screening_results (job_id, score DESC);"
+            )
+            self._db.commit()
+        return self._db
+
+    def create_job(self, job_id: str, job_role: str, job_description: str, shortlist_size: int,
+                   items: List[Tuple[str, Optional[str], Optional[str]]]):
+        """Insert a job with its (filename, path, error) items"""
+        now = time.time()
+        with self._db_lock:
+            db = self._connection()
+            db.execute(
+                "INSERT INTO screening_jobs VALUES (?, ?, ?, ?, ?, NULL, ?, ?)",
+                (job_id, job_role, job_description, shortlist_size, JOB_QUEUED, now, now)
+            )
+            db.executemany(
+                "INSERT INTO screening_results (job_id, idx, filename, path, status, error) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (job_id, idx, filename, path, ITEM_FAILED if error else ITEM_PENDING, error)
+                    for idx, (filename, path, error) in enumerate(items)
+                ]
+            )
+            db.commit()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job with its per-status item counts"""
+        with self._db_lock:
+            db = self._connection()
+            job = db.execute("SELECT * FROM screening_jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            counts = dict(db.execute(
+                "SELECT status, COUNT(*) FROM screening_results WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        job = dict(job)
+        job["counts"] = {status: counts.get(status, 0)
+                         for status in (ITEM_PENDING, ITEM_SCORED, ITEM_ANALYZED, ITEM_FAILED)}
+        job["total"] = sum(counts.values())
+        return job
+
+    def set_job_status(self, job_id: str, status: str, error: str = None):
+        with self._db_lock:
+            db = self._connection()
+            db.execute(
+                "UPDATE screening_jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id)
+            )
+            db.commit()
+
+    def update_item(self, job_id: str, idx: int, **fields: Any):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._db_lock:
+            db = self._connection()
+            db.execute(
+                f"UPDATE screening_results SET {columns} WHERE job_id = ? AND idx = ?",
+                (*fields.values(), job_id, idx)
+            )
+            db.commit()
+
+    def items(self, job_id: str, status: str, limit: int = -1) -> List[Dict[str, Any]]:
+        """Get a job's items in one status, best local score first"""
+        with self._db_lock:
+            rows = self._connection().execute(
+                "SELECT * FROM screening_results WHERE job_id = ? AND status = ? "
+                "ORDER BY local_score DESC, idx LIMIT ?",
+                (job_id, status, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def results_page(self, job_id: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Get one page of results, highest score first and unscored last"""
+        with self._db_lock:
+            rows = self._connection().execute(
+                "SELECT * FROM screening_results WHERE job_id = ? "
+                "ORDER BY score IS NULL, score DESC, idx LIMIT ? OFFSET ?",
+                (job_id, limit, offset)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def unfinished_jobs(self) -> List[str]:
+        with self._db_lock:
+            rows = self._connection().execute(
+                "SELECT id FROM screening_jobs WHERE status IN (?, ?, ?) ORDER BY created_at",
+                (JOB_QUEUED, JOB_EXTRACTING, JOB_ANALYZING)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+class ScreeningService:
+    """Runs bulk screening jobs in the background"""
+
+    def __init__(self, store: ScreeningStore = None):
+        """
+        Initialize the service
+
+        Args:
+            store: Job store (defaults to one at SCREENING_DB_PATH)
+        """
+        self.store = store or ScreeningStore()
+        self.directory = settings.SCREENING_DIR
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    def _unpack(job_dir: str, uploads: List[Tuple[str, str]]) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Move uploaded PDFs into the job directory and expand zip archives
+
+        Args:
+            job_dir: Directory holding the job's PDFs
+            uploads: (filename, temporary path) of each uploaded file
+
+        Returns:
+            (filename, path, error) per resume; path is None when error is set
+        """
+        os.makedirs(job_dir, exist_ok=True)
+        items: List[Tuple[str, Optional[str], Optional[str]]] = []
+
+        def next_path() -> str:
+            return os.path.join(job_dir, f"{len(items):05d}.pdf")
+
+        for filename, path in uploads:
+            if not filename.lower().endswith(".zip"):
+                destination = next_path()
+                shutil.move(path, destination)
+                items.append((filename, destination, None))
+                continue
+
+            try:
+                archive = zipfile.ZipFile(path)
+            except zipfile.BadZipFile:
+                raise ValueError(f"{filename} is not a valid zip archive")
+
+            with archive:
+                for member in archive.infolist():
+                    name = os.path.basename(member.filename)
+                    if member.is_dir() or not name.lower().endswith(".pdf") or member.filename.startswith("__MACOSX/"):
+                        continue
+                    if len(items) >= settings.SCREENING_MAX_FILES:
+                        raise ValueError(f"A screening job can contain at most {settings.SCREENING_MAX_FILES} resumes")
+                    if member.file_size > settings.MAX_UPLOAD_SIZE:
+                        items.append((name, None, "File exceeds the maximum upload size"))
+                        continue
+
+                    # Member names never become paths, and sizes are enforced while copying
+                    destination = next_path()
+                    size = 0
+                    with archive.open(member) as source, open(destination, "wb") as out:
+                        while True:
+                            chunk = source.read(COPY_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            size += len(chunk)
+                            if size > settings.MAX_UPLOAD_SIZE:
+                                break
+                            out.write(chunk)
+                    if size > settings.MAX_UPLOAD_SIZE:
+                        os.remove(destination)
+                        items.append((name, None, "File exceeds the maximum upload size"))
+                    else:
+                        items.append((name, destination, None))
+            os.remove(path)
+
+        if len(items) > settings.SCREENING_MAX_FILES:
+            raise ValueError(f"A screening job can contain at most {settings.SCREENING_MAX_FILES} resumes")
+        if not items:
+            raise ValueError("No PDF resumes were found in the upload")
+        return items
+
+    async def submit(
+        self,
+        job_role: str,
+        job_description: str,
+        uploads: List[Tuple[str, str]],
+        shortlist_size: int = settings.SCREENING_SHORTLIST_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Create a screening job and start it in the background
+
+        Args:
+            job_role: Target job role/title
+            job_description: Job description every resume is screened against
+            uploads: (filename, temporary path) of each uploaded PDF or zip;
+                the files are moved into the job's directory
+            shortlist_size: Number of best local scores that get an LLM analysis
+
+        Returns:
+            The created job with its item counts
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.directory, job_id)
+        try:
+            items = await asyncio.to_thread(self._unpack, job_dir, uploads)
+            await asyncio.to_thread(
+                self.store.create_job, job_id, job_role, job_description, shortlist_size, items
+            )
+        except BaseException:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+        self._start(job_id)
+        return await asyncio.to_thread(self.store.get_job, job_id)
+
+    def _start(self, job_id: str):
+        task = asyncio.ensure_future(self._process(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def start(self):
+        """Resume jobs left unfinished by a previous run"""
+        for job_id in await asyncio.to_thread(self.store.unfinished_jobs):
+            if job_id not in self._tasks:
+                self._start(job_id)
+
+    async def shutdown(self):
+        """Stop running jobs; they resume on the next start()"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status and progress
+
+        Args:
+            job_id: Screening job ID
+
+        Returns:
+            Job with item counts per status, or None if it does not exist
+        """
+        return await asyncio.to_thread(self.store.get_job, job_id)
+
+    async def get_results(self, job_id: str, page: int, page_size: int) -> List[Dict[str, Any]]:
+        """
+        Get one page of a job's results, best score first
+
+        Args:
+            job_id: Screening job ID
+            page: Page number, starting at 1
+            page_size: Results per page
+
+        Returns:
+            Result rows with parsed analyses
+        """
+        rows = await asyncio.to_thread(self.store.results_page, job_id, (page - 1) * page_size, page_size)
+        for row in rows:
+            row.pop("path", None)
+            row["analysis"] = json.loads(row["analysis"]) if row["analysis"] else None
+        return rows
+
+    async def _process(self, job_id: str):
+        """Extract and score every resume, then analyze the shortlist with the LLM"""
+        job = await asyncio.to_thread(self.store.get_job, job_id)
+        try:
+            await asyncio.to_thread(self.store.set_job_status, job_id, JOB_EXTRACTING)
+            pending = await asyncio.to_thread(self.store.items, job_id, ITEM_PENDING)
+            # Stay below the PDF pool's queue limit so interactive uploads are not rejected
+            extract_slots = asyncio.Semaphore(max(1, pdf_service.workers * 2))
+            await asyncio.gather(*[self._extract_and_score(job, item, extract_slots) for item in pending])
+
+            await asyncio.to_thread(self.store.set_job_status, job_id, JOB_ANALYZING)
+            analyzed = job["counts"][ITEM_ANALYZED]
+            shortlist = await asyncio.to_thread(
+                self.store.items, job_id, ITEM_SCORED, max(job["shortlist_size"] - analyzed, 0)
+            )
+            await asyncio.gather(*[self._analyze(job, item) for item in shortlist])
+
+            await asyncio.to_thread(self.store.set_job_status, job_id, JOB_COMPLETED)
+            shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await asyncio.to_thread(self.store.set_job_status, job_id, JOB_FAILED, str(e))
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(COPY_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    async def _resume_text(self, resume_id: str, path: str) -> str:
+        """Get compacted text, extracting it on the process pool on a cache miss"""
+        text = await text_cache.get(resume_id)
+        if text is not None:
+            return text_preprocessor.compact(text)
+        while True:
+            try:
+                text = await pdf_service.extract_text(path)
+                break
+            except PDFServiceBusyError:
+                await asyncio.sleep(1.0)
+        if text.strip():
+            await text_cache.put(resume_id, text)
+        return text_preprocessor.compact(text)
+
+    async def _extract_and_score(self, job: Dict[str, Any], item: Dict[str, Any], slots: asyncio.Semaphore):
+        """Extract one resume and give it a local ATS score"""
+        async with slots:
+            try:
+                resume_id = await asyncio.to_thread(self._hash_file, item["path"])
+                text = await self._resume_text(resume_id, item["path"])
+                if not text.strip():
+                    raise Exception("No text could be extracted from the PDF")
+
+                report = ats_scorer.local_report(text, job["job_description"])
+                await asyncio.to_thread(
+                    self.store.update_item, job["id"], item["idx"],
+                    status=ITEM_SCORED, resume_id=resume_id, keyword_match=report["keyword_match"],
+                    local_score=report["ats_score"], score=report["ats_score"]
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await asyncio.to_thread(
+                    self.store.update_item, job["id"], item["idx"], status=ITEM_FAILED, error=str(e)
+                )
+                return
+
+        # Screened resumes become rankable against other job descriptions; indexing is best effort
+        try:
+            await corpus_index.add("resume", resume_id, text, label=item["filename"])
+        except OSError:
+            pass
+
+    async def _analyze(self, job: Dict[str, Any], item: Dict[str, Any]):
+        """Run the LLM analysis of one shortlisted resume; calls draw on the shared Gemini rate limit"""
+        if self._llm_semaphore is None:
+            self._llm_semaphore = asyncio.Semaphore(settings.SCREENING_LLM_CONCURRENCY)
+
+        async with self._llm_semaphore:
+            try:
+                text = await self._resume_text(item["resume_id"], item["path"])
+                analysis = ResumeAnalysisResponse(**await gemini_service.analyze_resume(
+                    resume_text=text,
+                    job_role=job["job_role"],
+                    job_description=job["job_description"]
+                ))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # The resume keeps its local score
+                await asyncio.to_thread(
+                    self.store.update_item, job["id"], item["idx"], error=f"Analysis failed: {str(e)}"
+                )
+                return
+
+        llm_score = analysis.overall_score * 10
+        await asyncio.to_thread(
+            self.store.update_item, job["id"], item["idx"],
+            status=ITEM_ANALYZED, llm_score=llm_score,
+            score=round((item["local_score"] + llm_score) / 2, 1),
+            analysis=json.dumps(analysis.model_dump())
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get service statistics
+
+        Returns:
+            Dictionary with the number of jobs running in this process
+        """
+        return {"running_jobs": len(self._tasks)}
+
+
+# Create singleton instance
+screening_service = ScreeningService()
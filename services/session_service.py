@@ -0,0 +1,142 @@
+"""
+Session Service
+Server-side store for uploaded resumes and stage results
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from core.config import settings
+
+
+class _TTLStore:
+    """Size-bounded mapping whose entries expire after a sliding TTL"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] >= self.ttl_seconds:
+            del self._entries[key]
+            self.evictions += 1
+            return None
+        # Access extends the entry's lifetime
+        self._entries[key] = (time.time(), entry[1])
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: str, value: Any):
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        cutoff = time.time() - self.ttl_seconds
+        while self._entries:
+            key, (touched_at, _) = next(iter(self._entries.items()))
+            if touched_at >= cutoff and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[key]
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SessionStore:
+    """In-memory store of resumes and stage results referenced by ID"""
+
+    def __init__(
+        self,
+        ttl_seconds: int = settings.SESSION_TTL_SECONDS,
+        max_entries: int = settings.SESSION_MAX_ENTRIES
+    ):
+        """
+        Initialize the store
+
+        Args:
+            ttl_seconds: Idle time after which a resume or result is evicted
+            max_entries: Maximum number of resumes (and, separately, results) kept
+        """
+        self._resumes = _TTLStore(ttl_seconds, max_entries)
+        self._results = _TTLStore(ttl_seconds, max_entries * 8)
+
+    def put_resume(self, resume_id: str, resume_text: str, filename: str = None):
+        """
+        Store extracted resume text under its content-addressed ID
+
+        Args:
+            resume_id: SHA-256 of the uploaded PDF bytes
+            resume_text: Extracted resume text
+            filename: Original file name
+        """
+        self._resumes.put(resume_id, {"resume_text": resume_text, "filename": filename})
+
+    def get_resume_text(self, resume_id: str) -> Optional[str]:
+        """
+        Look up the resume text for an ID
+
+        Args:
+            resume_id: Resume ID returned by the upload endpoint
+
+        Returns:
+            Resume text, or None if unknown or expired
+        """
+        session = self._resumes.get(resume_id)
+        return session["resume_text"] if session else None
+
+    def put_result(self, stage: str, data: Dict[str, Any]) -> str:
+        """
+        Store a stage result and return its ID
+
+        Args:
+            stage: Stage name (analysis, ats_score, company_research, recommendations)
+            data: Validated stage result
+
+        Returns:
+            Result ID
+        """
+        result_id = f"{stage}_{uuid.uuid4().hex}"
+        self._results.put(result_id, (stage, data))
+        return result_id
+
+    def get_result(self, result_id: str, stage: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a stored stage result
+
+        Args:
+            result_id: Result ID returned by an earlier stage
+            stage: Expected stage name
+
+        Returns:
+            Stage result, or None if unknown, expired or of another stage
+        """
+        entry = self._results.get(result_id)
+        if entry is None or entry[0] != stage:
+            return None
+        return entry[1]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics
+
+        Returns:
+            Dictionary with entry counts and evictions
+        """
+        return {
+            "resumes": len(self._resumes),
+            "results": len(self._results),
+            "ttl_seconds": self._resumes.ttl_seconds,
+            "evictions": self._resumes.evictions + self._results.evictions,
+        }
+
+
+# Create singleton instance
+session_store = SessionStore()
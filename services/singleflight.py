@@ -0,0 +1,89 @@
+"""
+Single-Flight Coordination
+Collapses concurrent calls for the same key into one shared task
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """A shared in-flight task and the number of callers awaiting it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Run at most one task per key; concurrent callers share its result"""
+
+    def __init__(self):
+        """Initialize the in-flight call registry"""
+        self._calls: Dict[Hashable, _Call] = {}
+        self.started = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await the in-flight call for a key, starting it if needed
+
+        The shared task is cancelled only once every caller awaiting it
+        has been cancelled; a single caller going away leaves it running
+        for the others. A caller arriving after that starts a new call
+        rather than joining the cancelled one.
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument coroutine factory producing the result
+
+        Returns:
+            Result of the shared call
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._finish(key, call))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Unregister first so a caller arriving before the task unwinds starts a fresh call
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+                self.cancelled += 1
+
+    def _finish(self, key: Hashable, call: _Call):
+        """Drop a completed call from the registry"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception as retrieved when nobody is left to observe it
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for the key is currently running"""
+        return key in self._calls
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dictionary with started, coalesced, cancelled and in-flight counts
+        """
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+        }
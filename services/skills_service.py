@@ -0,0 +1,193 @@
+"""
+Skills Extraction Service
+Detects taxonomy skills in text with an Aho-Corasick automaton
+"""
+
+import os
+import re
+from collections import deque
+from typing import Dict, List, Tuple
+from core.config import settings
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+# The taxonomy ships with the code, so relative paths resolve against the project root
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase text and collapse whitespace runs to single spaces
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Normalized text
+    """
+    return _WHITESPACE.sub(" ", text.lower())
+
+
+class SkillsExtractor:
+    """Finds every taxonomy skill and alias in a single pass over the text"""
+
+    def __init__(self, taxonomy_path: str = settings.SKILLS_TAXONOMY_PATH):
+        """
+        Load the taxonomy and compile the automaton
+
+        Args:
+            taxonomy_path: File with one "canonical|alias|..." entry per line
+        """
+        self.taxonomy_path = taxonomy_path
+        self.skills: List[str] = []
+
+        # Automaton state: goto transitions, failure links and the patterns ending at each node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[Tuple[int, int], ...]] = [()]
+
+        self._build(self._load(taxonomy_path))
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, str]:
+        """
+        Read the taxonomy file
+
+        Args:
+            path: Taxonomy file path
+
+        Returns:
+            Mapping of normalized pattern to canonical skill name
+        """
+        patterns: Dict[str, str] = {}
+        path = os.path.join(_PROJECT_ROOT, path)
+        if not os.path.exists(path):
+            print(f"Warning: Skills taxonomy not found at {path}; skill extraction is disabled")
+            return patterns
+
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                names = [name.strip() for name in line.split("|") if name.strip()]
+                canonical = names[0]
+                for name in names:
+                    # The first entry wins when two skills share an alias
+                    patterns.setdefault(normalize_text(name), canonical)
+        return patterns
+
+    def _build(self, patterns: Dict[str, str]):
+        """Compile patterns into the goto/fail/output tables"""
+        skill_ids: Dict[str, int] = {}
+        outputs: List[List[Tuple[int, int]]] = [[]]
+
+        for pattern, canonical in patterns.items():
+            if canonical not in skill_ids:
+                skill_ids[canonical] = len(self.skills)
+                self.skills.append(canonical)
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    outputs.append([])
+                node = next_node
+            outputs[node].append((len(pattern), skill_ids[canonical]))
+
+        # Breadth-first pass setting failure links and merging outputs along them
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                outputs[child].extend(outputs[self._fail[child]])
+
+        self._output = [tuple(output) for output in outputs]
+
+    def _scan(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Find skill mentions in normalized text
+
+        Overlapping matches are resolved leftmost-longest, so "spring boot"
+        wins over "spring" and "c++" over "c". Matches must sit on word
+        boundaries.
+
+        Args:
+            text: Normalized text
+
+        Returns:
+            Non-overlapping (start, end, skill id) spans in text order
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        matches: List[Tuple[int, int, int]] = []
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, skill_id in output[node]:
+                start = index - length + 1
+                end = index + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < len(text) and text[end].isalnum():
+                    continue
+                matches.append((start, end, skill_id))
+
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+        spans: List[Tuple[int, int, int]] = []
+        position = 0
+        for start, end, skill_id in matches:
+            if start >= position:
+                spans.append((start, end, skill_id))
+                position = end
+        return spans
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Extract the skills mentioned in text
+
+        Args:
+            text: Resume or job description text
+
+        Returns:
+            Canonical skill names in order of first mention, without duplicates
+        """
+        return list(dict.fromkeys(self.skills[skill_id] for _, _, skill_id in self._scan(normalize_text(text))))
+
+    def canonicalize(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Replace skill aliases with their canonical names
+
+        Args:
+            text: Resume or job description text
+
+        Returns:
+            Tuple of (normalized text with canonical skill names, skills found)
+        """
+        normalized = normalize_text(text)
+        parts: List[str] = []
+        found: Dict[str, None] = {}
+        position = 0
+        for start, end, skill_id in self._scan(normalized):
+            canonical = self.skills[skill_id]
+            parts.append(normalized[position:start])
+            parts.append(canonical.lower())
+            found[canonical] = None
+            position = end
+        parts.append(normalized[position:])
+        return "".join(parts), list(found)
+
+
+# Create singleton instance
+skills_extractor = SkillsExtractor()
@@ -0,0 +1,246 @@
+"""
+Structured Output Helpers
+Gemini response schemas derived from Pydantic models, and local JSON repair
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Type
+from pydantic import BaseModel, ValidationError, create_model
+
+
+# Keys of the OpenAPI subset accepted by Gemini's response_schema
+SCHEMA_KEYS = ("type", "format", "description", "nullable", "enum", "items", "properties", "required")
+
+FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+DANGLING_MEMBER_PATTERN = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+
+
+@lru_cache(maxsize=None)
+def partial_model(model: Type[BaseModel], exclude: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Derive a model without the fields the caller fills in locally
+
+    Args:
+        model: Full response model
+        exclude: Names of fields left out of the LLM response
+
+    Returns:
+        Model class with the remaining fields and the same validation
+    """
+    fields = {
+        name: (field.annotation, field)
+        for name, field in model.model_fields.items()
+        if name not in exclude
+    }
+    return create_model(f"{model.__name__}Generated", __doc__=model.__doc__, **fields)
+
+
+def _convert(node: Dict[str, Any], definitions: Dict[str, Any]) -> Dict[str, Any]:
+    """Rewrite one JSON Schema node into the subset Gemini accepts"""
+    if "$ref" in node:
+        node = definitions[node["$ref"].rsplit("/", 1)[-1]]
+
+    variants = node.get("anyOf")
+    if variants:
+        # Optional[X] becomes a nullable X
+        concrete = [variant for variant in variants if variant.get("type") != "null"]
+        converted = _convert(concrete[0], definitions)
+        if len(concrete) < len(variants):
+            converted["nullable"] = True
+        if "description" in node:
+            converted["description"] = node["description"]
+        return converted
+
+    schema = {key: node[key] for key in SCHEMA_KEYS if key in node and key not in ("items", "properties")}
+    if "items" in node:
+        schema["items"] = _convert(node["items"], definitions)
+    if "properties" in node:
+        schema["properties"] = {
+            name: _convert(child, definitions) for name, child in node["properties"].items()
+        }
+    return schema
+
+
+@lru_cache(maxsize=None)
+def _response_schema_json(model: Type[BaseModel]) -> str:
+    source = model.model_json_schema()
+    return json.dumps(_convert(source, source.get("$defs", {})), sort_keys=True)
+
+
+def response_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Build a Gemini response_schema from a Pydantic model
+
+    Numeric bounds and other constraints Gemini does not accept are left
+    out; they are still enforced when the response is validated.
+
+    Args:
+        model: Response model
+
+    Returns:
+        Schema dictionary (a fresh copy, safe to modify)
+    """
+    return json.loads(_response_schema_json(model))
+
+
+def schema_fingerprint(model: Type[BaseModel]) -> str:
+    """
+    Stable text identifying a model's response schema, for cache keys
+
+    Args:
+        model: Response model
+
+    Returns:
+        Canonical JSON of the response schema
+    """
+    return _response_schema_json(model)
+
+
+def repair_json_text(text: str) -> str:
+    """
+    Fix the common ways model output fails to be a bare JSON document
+
+    Strips markdown fences and surrounding prose, drops trailing commas
+    outside strings, and closes strings, arrays and objects left open by a
+    truncated response (dropping an escape sequence cut off mid-way).
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        Text more likely to parse as JSON
+    """
+    text = FENCE_PATTERN.sub("", text.strip())
+    start = text.find("{")
+    if start < 0:
+        return text
+    text = text[start:]
+
+    # Scan to the end of the first top-level object, tracking what is still open
+    # and dropping trailing commas outside strings
+    output = []
+    closers = []
+    in_string = False
+    escape_start = None
+    unicode_digits = 0
+    comma = None
+    for char in text:
+        if in_string:
+            if unicode_digits:
+                unicode_digits -= 1
+                if not unicode_digits:
+                    escape_start = None
+            elif escape_start is not None:
+                if char == "u":
+                    unicode_digits = 4
+                else:
+                    escape_start = None
+            elif char == "\\":
+                escape_start = len(output)
+            elif char == '"':
+                in_string = False
+        elif char == ",":
+            comma = len(output)
+        elif not char.isspace():
+            if char in "}]" and comma is not None:
+                output[comma] = ""
+            comma = None
+            if char == '"':
+                in_string = True
+            elif char in "{[":
+                closers.append("}" if char == "{" else "]")
+            elif char in "}]":
+                if closers:
+                    closers.pop()
+                if not closers:
+                    output.append(char)
+                    break
+        output.append(char)
+
+    if in_string and escape_start is not None:
+        # Drop an escape sequence cut off by truncation
+        del output[escape_start:]
+    text = "".join(output)
+    if closers:
+        if in_string:
+            text += '"'
+        if closers[-1] == "}":
+            # Drop an object member cut off before its value
+            text = DANGLING_MEMBER_PATTERN.sub(r"\1", text.rstrip())
+        text = text.rstrip().rstrip(",") + "".join(reversed(closers))
+    return text
+
+
+def _is_complete(data: Dict[str, Any], model: Type[BaseModel]) -> bool:
+    """Check that every required field, including those of nested models, is present"""
+    for name, field in model.model_fields.items():
+        if name not in data:
+            if field.is_required():
+                return False
+            continue
+        annotation = field.annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            if not isinstance(data[name], dict) or not _is_complete(data[name], annotation):
+                return False
+    return True
+
+
+def _coerce(data: Dict[str, Any], model: Type[BaseModel]) -> Dict[str, Any]:
+    """Bring field values into the shapes and ranges the model requires"""
+    for name, field in model.model_fields.items():
+        value = data.get(name)
+        annotation = getattr(field.annotation, "__origin__", field.annotation)
+        if annotation is list:
+            if value is None:
+                data[name] = []
+            elif isinstance(value, str):
+                data[name] = [value]
+        elif annotation in (int, float) and isinstance(value, (int, float, str)):
+            try:
+                number = float(value)
+            except ValueError:
+                continue
+            for constraint in field.metadata:
+                if getattr(constraint, "ge", None) is not None:
+                    number = max(number, constraint.ge)
+                if getattr(constraint, "le", None) is not None:
+                    number = min(number, constraint.le)
+            data[name] = round(number) if annotation is int else number
+        elif isinstance(value, dict) and isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            data[name] = _coerce(value, annotation)
+    return data
+
+
+def parse_response(text: str, model: Type[BaseModel]) -> Tuple[Optional[BaseModel], bool]:
+    """
+    Validate model output into a Pydantic model, repairing it locally if needed
+
+    Well-formed output is validated straight from the JSON text in one
+    pass. Otherwise the text is repaired, single values are wrapped in
+    lists and out-of-range numbers clamped before validating again. A
+    repair that is missing any required field (e.g. output truncated
+    early) counts as unrepairable rather than being padded with empty
+    values.
+
+    Args:
+        text: Raw model output
+        model: Response model
+
+    Returns:
+        Tuple of (validated instance or None if unrepairable, whether a
+        repair was needed)
+    """
+    try:
+        return model.model_validate_json(text), False
+    except ValidationError:
+        pass
+
+    try:
+        data = json.loads(repair_json_text(text))
+        if not isinstance(data, dict) or not _is_complete(data, model):
+            return None, True
+        return model.model_validate(_coerce(data, model)), True
+    except (ValueError, ValidationError):
+        return None, True
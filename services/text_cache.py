@@ -0,0 +1,186 @@
+"""
+Extracted Text Cache
+Content-addressed cache of PDF text keyed by the file's SHA-256
+"""
+
+import asyncio
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from core.config import settings
+
+
+_SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+class ExtractedTextCache:
+    """In-memory LRU tier backed by size-bounded text files on disk"""
+
+    def __init__(
+        self,
+        directory: str = settings.TEXT_CACHE_DIR,
+        memory_entries: int = settings.TEXT_CACHE_MEMORY_ENTRIES,
+        disk_max_bytes: int = settings.TEXT_CACHE_DISK_MAX_BYTES
+    ):
+        """
+        Initialize the cache tiers
+
+        Args:
+            directory: Directory holding the on-disk tier
+            memory_entries: Maximum entries held in memory
+            disk_max_bytes: Maximum total size of the on-disk tier
+        """
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._disk_lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+
+    def _path(self, sha256: str) -> str:
+        return os.path.join(self.directory, f"{sha256}.txt")
+
+    def _memory_set(self, sha256: str, text: str):
+        self._memory[sha256] = text
+        self._memory.move_to_end(sha256)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, sha256: str) -> Optional[str]:
+        path = self._path(sha256)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                text = file.read()
+        except FileNotFoundError:
+            return None
+        # Refresh the modification time so eviction removes least recently used files first
+        os.utime(path)
+        return text
+
+    def _disk_set(self, sha256: str, text: str):
+        os.makedirs(self.directory, exist_ok=True)
+        data = text.encode("utf-8")
+        path = self._path(sha256)
+        # A unique temporary name, so concurrent writes of the same hash never share a file
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        with self._disk_lock:
+            try:
+                replaced = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_size()
+            else:
+                self._disk_bytes += len(data) - replaced
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith(".txt"))
+
+    def _evict_disk(self):
+        """Delete least recently used files until the tier fits its budget"""
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith(".txt")),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            self.disk_evictions += 1
+        self._disk_bytes = total
+
+    async def get(self, sha256: str) -> Optional[str]:
+        """
+        Look up extracted text by PDF content hash
+
+        Args:
+            sha256: Hex SHA-256 of the PDF bytes
+
+        Returns:
+            Extracted text, or None on a miss
+        """
+        if not _SHA256_HEX.match(sha256):
+            return None
+
+        text = self._memory.get(sha256)
+        if text is not None:
+            self._memory.move_to_end(sha256)
+            self.memory_hits += 1
+            return text
+
+        try:
+            text = await asyncio.to_thread(self._disk_get, sha256)
+        except OSError:
+            text = None
+
+        if text is not None:
+            self._memory_set(sha256, text)
+            self.disk_hits += 1
+            return text
+
+        self.misses += 1
+        return None
+
+    async def put(self, sha256: str, text: str):
+        """
+        Store extracted text in both tiers
+
+        Args:
+            sha256: Hex SHA-256 of the PDF bytes
+            text: Extracted text
+        """
+        if not _SHA256_HEX.match(sha256):
+            return
+
+        self._memory_set(sha256, text)
+        try:
+            await asyncio.to_thread(self._disk_set, sha256, text)
+        except OSError:
+            # The disk tier is best effort; the memory tier still serves hits
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hit/miss counters and tier sizes
+        """
+        return {
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "disk_evictions": self.disk_evictions,
+        }
+
+
+# Create singleton instance
+text_cache = ExtractedTextCache()
@@ -0,0 +1,404 @@
+"""
+Text Preprocessing Service
+Compacts extracted resume text and fits prompt inputs to token budgets
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+from core.config import settings
+
+
+# Separates pages in text extracted by pdf_service
+PAGE_BREAK = "\f"
+
+# Lines at each end of a page checked for repeated headers and footers
+PAGE_EDGE_LINES = 3
+TRUNCATION_MARKER = "[...]"
+
+HORIZONTAL_SPACE_PATTERN = re.compile(r"[ \u00a0\u2000-\u200a\u202f\u205f\u3000]+")
+ZERO_WIDTH_PATTERN = re.compile(r"[\u200b\u200c\u200d\ufeff]")
+HYPHENATION_PATTERN = re.compile(r"([A-Za-z]+)-\n([a-z]+)")
+# Word endings that mark a hyphen at a line end as a word broken by layout,
+# rather than a compound such as full-stack or cross-functional; words used
+# unbroken elsewhere in the text are rejoined too
+BROKEN_WORD_ENDINGS = (
+    "ment", "tion", "sion", "ing", "ed", "ance", "ence", "ity", "ness", "able", "ible",
+    "ally", "ure", "ive", "ous", "al", "er", "ly", "ist", "ism", "ize", "ise",
+)
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+PAGE_NUMBER_PATTERN = re.compile(
+    r"^(?:page\s*)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$|^[-–—]\s*\d{1,3}\s*[-–—]$",
+    re.IGNORECASE
+)
+EXPLICIT_PAGE_NUMBER_PATTERN = re.compile(r"^page\s*\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$", re.IGNORECASE)
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Section headings: a short all-caps line, or a common heading in any case
+UPPERCASE_HEADING_PATTERN = re.compile(r"^[A-Z][A-Z&/' -]{2,40}:?$")
+KNOWN_HEADING_PATTERN = re.compile(
+    r"^(?:professional |career |work |research |technical |key |core |selected )?"
+    r"(?:summary|profile|objective|about me|experience|employment(?: history)?|work history|"
+    r"education|skills|competencies|technologies|projects|publications|certifications|"
+    r"awards|honou?rs|teaching|research|grants|presentations|talks|patents|languages|"
+    r"interests|references|volunteering|volunteer experience|leadership|activities|"
+    r"affiliations|memberships)(?: and [a-z ]+)?:?$",
+    re.IGNORECASE
+)
+
+
+def _rejoin(text: str) -> str:
+    """Rejoin words split across lines, keeping the hyphen of compounds"""
+    vocabulary = set(re.findall(r"[a-z]+", text.lower()))
+
+    def rejoin(match: re.Match) -> str:
+        head, tail = match.groups()
+        if tail.startswith(BROKEN_WORD_ENDINGS) or (head + tail).lower() in vocabulary:
+            return head + tail
+        return f"{head}-{tail}"
+
+    return HYPHENATION_PATTERN.sub(rejoin, text)
+
+
+def _edge_key(line: str) -> str:
+    """Normalize a page-edge line so running headers with page numbers compare equal"""
+    return re.sub(r"\d+", "#", line.lower())
+
+
+@lru_cache(maxsize=1024)
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the LLM token count of a text, memoized
+
+    Counts words and punctuation, scaled for sub-word splitting, and never
+    goes below the common four-characters-per-token rule.
+
+    Args:
+        text: Any text
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    return max(math.ceil(len(TOKEN_PATTERN.findall(text)) * 1.3), math.ceil(len(text) / 4))
+
+
+class TextPreprocessor:
+    """Removes extraction noise from text and trims it to token budgets"""
+
+    def __init__(self):
+        """Initialize savings counters"""
+        self._lock = threading.Lock()
+        self._compacted = 0
+        self._tokens_before = 0
+        self._tokens_after = 0
+        self._trimmed = 0
+
+    def _record(self, before: str, after: str):
+        with self._lock:
+            self._compacted += 1
+            self._tokens_before += estimate_tokens(before)
+            self._tokens_after += estimate_tokens(after)
+
+    @staticmethod
+    def _strip_page_furniture(pages: List[List[str]]) -> List[List[str]]:
+        """Drop page numbers, and running headers and footers after their first page"""
+        def edge_positions(lines: List[str]) -> List[int]:
+            filled = [position for position, line in enumerate(lines) if line]
+            return filled[:PAGE_EDGE_LINES] + filled[-PAGE_EDGE_LINES:]
+
+        repeated = set()
+        if len(pages) > 1:
+            seen = Counter(
+                key for lines in pages
+                for key in {_edge_key(lines[position]) for position in edge_positions(lines)}
+            )
+            repeated = {key for key, count in seen.items() if count > 1}
+
+        kept_once = set()
+        cleaned = []
+        for lines in pages:
+            edges = set(edge_positions(lines))
+            page = []
+            for position, line in enumerate(lines):
+                if position in edges:
+                    if PAGE_NUMBER_PATTERN.match(line):
+                        continue
+                    key = _edge_key(line)
+                    if key in repeated:
+                        if key in kept_once:
+                            continue
+                        kept_once.add(key)
+                elif EXPLICIT_PAGE_NUMBER_PATTERN.match(line):
+                    continue
+                page.append(line)
+            cleaned.append(page)
+        return cleaned
+
+    def compact(self, text: str) -> str:
+        """
+        Normalize extracted text without changing its content
+
+        Collapses repeated spaces and blank lines, rejoins words hyphenated
+        across line breaks, and removes page numbers and headers/footers
+        repeated on every page. Tabs are kept because they signal table
+        layouts to the ATS checks. Compacting compacted text is a no-op.
+
+        Args:
+            text: Text as extracted from a PDF, pages separated by PAGE_BREAK
+
+        Returns:
+            Compacted text
+        """
+        if not text:
+            return text
+        compacted = _compact(text)
+        if compacted != text:
+            self._record(text, compacted)
+        return compacted
+
+    def fit_to_budget(self, text: str, max_tokens: int) -> str:
+        """
+        Trim text to a token budget at line boundaries
+
+        The beginning of a resume or job description carries the most
+        weight, so whole lines are kept from the top and a marker shows
+        where text was cut.
+
+        Args:
+            text: Compacted text
+            max_tokens: Token budget; 0 or less disables trimming
+
+        Returns:
+            Text within the budget
+        """
+        if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+            return text
+
+        budget = max_tokens - estimate_tokens(TRUNCATION_MARKER)
+        kept = []
+        used = 0
+        for line in text.split("\n"):
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                break
+            kept.append(line)
+            used += cost
+        if not kept:
+            # A single overlong line: cut it at the character estimate instead
+            kept.append(text[: budget * 4])
+
+        with self._lock:
+            self._trimmed += 1
+        return "\n".join(kept + [TRUNCATION_MARKER])
+
+    def prepare(self, text: str, max_tokens: int) -> str:
+        """
+        Compact text and fit it to a prompt's token budget
+
+        Args:
+            text: Raw or already compacted text
+            max_tokens: Token budget for this text in the prompt
+
+        Returns:
+            Prompt-ready text
+        """
+        if not text:
+            return text
+        return self.fit_to_budget(self.compact(text), max_tokens)
+
+    def prepare_inputs(self, resume_text: str, job_description: str = None):
+        """
+        Prepare a resume and optional job description for an analysis prompt
+
+        Args:
+            resume_text: Resume text
+            job_description: Optional job description
+
+        Returns:
+            Tuple of (prepared resume text, prepared job description)
+        """
+        return (
+            self.prepare(resume_text, settings.PROMPT_RESUME_TOKEN_BUDGET),
+            self.prepare(job_description, settings.PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET),
+        )
+
+    @staticmethod
+    def is_heading(line: str) -> bool:
+        """Whether a line of compacted text looks like a section heading"""
+        line = line.strip()
+        return bool(line) and (
+            bool(UPPERCASE_HEADING_PATTERN.match(line)) or bool(KNOWN_HEADING_PATTERN.match(line))
+        )
+
+    def split_sections(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Split compacted text into its sections at heading lines
+
+        Args:
+            text: Compacted resume text
+
+        Returns:
+            List of (heading, section text including the heading) in document
+            order; text before the first heading has an empty heading
+        """
+        sections: List[Tuple[str, List[str]]] = [("", [])]
+        for line in text.split("\n"):
+            if self.is_heading(line):
+                sections.append((line.strip().rstrip(":"), [line]))
+            else:
+                sections[-1][1].append(line)
+        return [
+            (heading, "\n".join(lines).strip())
+            for heading, lines in sections
+            if "\n".join(lines).strip()
+        ]
+
+    @staticmethod
+    def _split_section(heading: str, section: str, max_tokens: int) -> List[str]:
+        """Split one section at line boundaries, repeating its heading on later pieces"""
+        if estimate_tokens(section) <= max_tokens:
+            return [section]
+        label = f"{heading} (continued)" if heading else ""
+        budget = max_tokens - estimate_tokens(label)
+        pieces, current, used = [], [], 0
+        for line in section.split("\n"):
+            cost = estimate_tokens(line) + 1
+            if current and used + cost > budget:
+                pieces.append("\n".join(current))
+                current, used = ([label] if label else []), estimate_tokens(label)
+            if cost > budget:
+                # A single overlong line: cut it at the character estimate
+                line = line[: budget * 4]
+            current.append(line)
+            used += cost
+        if current:
+            pieces.append("\n".join(current))
+        return pieces
+
+    def segments(self, text: str, min_tokens: int, max_tokens: int) -> List[str]:
+        """
+        Split compacted text into sections that can be processed on their own
+
+        Sections smaller than min_tokens, such as a bare heading or a short
+        contact block, are merged into the following section; sections
+        larger than max_tokens are split at line boundaries.
+
+        Args:
+            text: Compacted resume text
+            min_tokens: Smallest segment worth processing separately
+            max_tokens: Largest segment
+
+        Returns:
+            Segments in document order
+        """
+        segments: List[str] = []
+        pending = ""
+        for heading, section in self.split_sections(text):
+            if pending:
+                section = f"{pending}\n\n{section}"
+                pending = ""
+            if estimate_tokens(section) < min_tokens:
+                pending = section
+                continue
+            segments.extend(self._split_section(heading, section, max_tokens))
+        if pending:
+            if segments:
+                segments[-1] = f"{segments[-1]}\n\n{pending}"
+            else:
+                segments.append(pending)
+        return segments
+
+    def chunk(self, text: str, max_tokens: int) -> List[str]:
+        """
+        Split compacted text into chunks of whole sections within a token budget
+
+        Consecutive sections share a chunk while they fit. A section larger
+        than the budget is split at line boundaries, and each later piece
+        repeats its heading so it can be read on its own.
+
+        Args:
+            text: Compacted resume text
+            max_tokens: Token budget of one chunk
+
+        Returns:
+            Chunks in document order
+        """
+        pieces = [
+            piece
+            for heading, section in self.split_sections(text)
+            for piece in self._split_section(heading, section, max_tokens)
+        ]
+
+        chunks, current, used = [], [], 0
+        for piece in pieces:
+            cost = estimate_tokens(piece) + 2
+            if current and used + cost > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, used = [], 0
+            current.append(piece)
+            used += cost
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+
+    def report(self, raw_text: str, compacted_text: str) -> Dict[str, int]:
+        """
+        Describe what compaction saved on one text
+
+        Args:
+            raw_text: Text before compaction
+            compacted_text: Text after compaction
+
+        Returns:
+            Dictionary with character and estimated token counts before and after
+        """
+        return {
+            "chars_before": len(raw_text),
+            "chars_after": len(compacted_text),
+            "tokens_before": estimate_tokens(raw_text),
+            "tokens_after": estimate_tokens(compacted_text),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get compaction savings since startup
+
+        Returns:
+            Dictionary with texts compacted, estimated tokens before and
+            after, and texts trimmed to a budget
+        """
+        with self._lock:
+            saved = self._tokens_before - self._tokens_after
+            return {
+                "compacted": self._compacted,
+                "tokens_before": self._tokens_before,
+                "tokens_after": self._tokens_after,
+                "tokens_saved": saved,
+                "saved_ratio": round(saved / self._tokens_before, 3) if self._tokens_before else 0.0,
+                "trimmed": self._trimmed,
+                "estimator_cache": estimate_tokens.cache_info()._asdict(),
+            }
+
+
+@lru_cache(maxsize=256)
+def _compact(text: str) -> str:
+    """Compaction proper, memoized because the same resume is prepared for many prompts"""
+    text = ZERO_WIDTH_PATTERN.sub("", text.replace("\r\n", "\n").replace("\r", "\n"))
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        lines = [HORIZONTAL_SPACE_PATTERN.sub(" ", line).strip(" \t") for line in page.split("\n")]
+        pages.append(lines)
+
+    pages = TextPreprocessor._strip_page_furniture(pages)
+    text = "\n\n".join("\n".join(lines) for lines in pages)
+    text = _rejoin(text)
+    return BLANK_LINES_PATTERN.sub("\n\n", text).strip()
+
+
+# Create singleton instance
+text_preprocessor = TextPreprocessor()
@@ -0,0 +1,208 @@
+"""
+Upload Service
+Streams uploaded files to disk with a size cap and on-the-fly hashing
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import Optional
+from fastapi import Request, UploadFile
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from core.config import settings
+
+
+# Bytes read from the client per chunk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Allowance for multipart boundaries, part headers and small form fields
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_SIZE"""
+
+
+class InvalidUploadError(ValueError):
+    """Raised when a request body is not a multipart upload carrying the expected file"""
+
+
+class SpooledUpload:
+    """An uploaded file written to a temporary path"""
+
+    def __init__(self, path: str, sha256: str, size: int, filename: str = ""):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.filename = filename
+
+    def cleanup(self):
+        """Delete the temporary file"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class UploadService:
+    """Service for receiving file uploads"""
+
+    @staticmethod
+    async def spool(
+        file: UploadFile,
+        max_size: int = settings.MAX_UPLOAD_SIZE,
+        directory: Optional[str] = None
+    ) -> SpooledUpload:
+        """
+        Stream an upload to a temporary file, hashing it in the same pass
+
+        The upload is read in fixed-size chunks, so memory use stays bounded
+        regardless of file size, and it is rejected as soon as it grows past
+        max_size.
+
+        Args:
+            file: Incoming upload
+            max_size: Maximum accepted size in bytes
+            directory: Directory for the temporary file (defaults to UPLOAD_DIR)
+
+        Returns:
+            The spooled upload; callers must call cleanup() when done
+        """
+        directory = directory or settings.UPLOAD_DIR
+        os.makedirs(directory, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, path = tempfile.mkstemp(suffix=".pdf", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_size:
+                        raise UploadTooLargeError(
+                            f"File exceeds the maximum upload size of {max_size} bytes"
+                        )
+                    digest.update(chunk)
+                    out.write(chunk)
+        except BaseException:
+            os.remove(path)
+            raise
+
+        return SpooledUpload(path=path, sha256=digest.hexdigest(), size=size)
+
+    @staticmethod
+    async def spool_request(
+        request: Request,
+        field: str = "file",
+        max_size: int = settings.MAX_UPLOAD_SIZE,
+        directory: Optional[str] = None
+    ) -> SpooledUpload:
+        """
+        Stream one file field of a multipart/form-data body straight to a temporary file
+
+        The body is parsed as it arrives instead of being buffered by the
+        framework first, so the file is written to disk once and the request
+        is rejected as soon as the body grows past max_size, whether or not
+        a Content-Length was declared. Other form fields are ignored.
+
+        Args:
+            request: Incoming multipart/form-data request
+            field: Name of the file field to keep
+            max_size: Maximum accepted file size in bytes
+            directory: Directory for the temporary file (defaults to UPLOAD_DIR)
+
+        Returns:
+            The spooled upload with its client-side filename; callers must call cleanup() when done
+
+        Raises:
+            UploadTooLargeError: The file or the body exceeds the size limit
+            InvalidUploadError: The body is not multipart or has no such file field
+        """
+        content_type, options = parse_options_header(request.headers.get("content-type", ""))
+        boundary = options.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise InvalidUploadError("Expected a multipart/form-data upload")
+
+        directory = directory or settings.UPLOAD_DIR
+        os.makedirs(directory, exist_ok=True)
+
+        digest = hashlib.sha256()
+        state = {"size": 0, "filename": None, "headers": [], "header": b"", "value": b"", "writing": False}
+        fd, path = tempfile.mkstemp(suffix=".pdf", dir=directory)
+
+        with os.fdopen(fd, "wb") as out:
+            def on_part_begin():
+                state["headers"] = []
+                state["writing"] = False
+
+            def on_header_field(data: bytes, start: int, end: int):
+                state["header"] += data[start:end]
+
+            def on_header_value(data: bytes, start: int, end: int):
+                state["value"] += data[start:end]
+
+            def on_header_end():
+                state["headers"].append((state["header"].lower(), state["value"]))
+                state["header"] = state["value"] = b""
+
+            def on_headers_finished():
+                for name, value in state["headers"]:
+                    if name == b"content-disposition":
+                        _, params = parse_options_header(value)
+                        # Only the first matching file part is kept
+                        if params.get(b"name") == field.encode() and b"filename" in params \
+                                and state["filename"] is None:
+                            state["filename"] = params[b"filename"].decode("utf-8", "replace")
+                            state["writing"] = True
+
+            def on_part_data(data: bytes, start: int, end: int):
+                if not state["writing"]:
+                    return
+                chunk = data[start:end]
+                state["size"] += len(chunk)
+                if state["size"] > max_size:
+                    raise UploadTooLargeError(f"File exceeds the maximum upload size of {max_size} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+
+            def on_part_end():
+                state["writing"] = False
+
+            parser = MultipartParser(boundary, {
+                "on_part_begin": on_part_begin,
+                "on_header_field": on_header_field,
+                "on_header_value": on_header_value,
+                "on_header_end": on_header_end,
+                "on_headers_finished": on_headers_finished,
+                "on_part_data": on_part_data,
+                "on_part_end": on_part_end,
+            })
+
+            received = 0
+            try:
+                async for chunk in request.stream():
+                    received += len(chunk)
+                    if received > max_size + MULTIPART_OVERHEAD:
+                        raise UploadTooLargeError(f"File exceeds the maximum upload size of {max_size} bytes")
+                    parser.write(chunk)
+                parser.finalize()
+                if state["filename"] is None:
+                    raise InvalidUploadError(f"No file uploaded in field: {field}")
+            except MultipartParseError as e:
+                out.close()
+                os.remove(path)
+                raise InvalidUploadError(f"Malformed multipart body: {e}")
+            except BaseException:
+                out.close()
+                os.remove(path)
+                raise
+
+        return SpooledUpload(path=path, sha256=digest.hexdigest(), size=state["size"], filename=state["filename"])
+
+
+# Create singleton instance
+upload_service = UploadService()
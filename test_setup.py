@@ -29,7 +29,8 @@ def test_dependencies():
         'google.generativeai',
         'docx',
         'pydantic',
-        'aiofiles'
+        'aiofiles',
+        'numpy'
     ]
 
     missing = []
@@ -53,7 +54,7 @@ def test_imports():
         from core.config import settings
         print("✓ core.config")
 
-        from api import resume, company, documents, analysis
+        from api import resume, company, documents, analysis, pipeline, corpus, screening, jobs
         print("✓ api modules")
 
         from services import gemini_service, pdf_service, document_service